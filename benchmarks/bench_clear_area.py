@@ -0,0 +1,36 @@
+# Mikrobenchmark mazání a operací s oblastmi displeje.
+# Spuštění na zařízení: mpremote run benchmarks/bench_clear_area.py
+import time
+from oled_display import OledDisplay
+
+ROUNDS = 10
+
+
+def clear_area_pixels(oled, x, y, width, height):
+    """Původní implementace clear_area: jedno volání pixel() na bod."""
+    for i in range(x, x + width):
+        for j in range(y, y + height):
+            oled.pixel(i, j, 0)
+
+
+def measure(name, fn):
+    start = time.ticks_us()
+    for _ in range(ROUNDS):
+        fn()
+    elapsed = time.ticks_diff(time.ticks_us(), start) // ROUNDS
+    print(f"{name}: {elapsed} us")
+    return elapsed
+
+
+display = OledDisplay()
+oled = display.oled
+
+# Měří se jen práce ve framebufferu, bez přenosu na displej
+pixels = measure("clear_area 128x50 pixel()", lambda: clear_area_pixels(oled, 0, 20, 128, 50))
+rect = measure("clear_area 128x50 fill_rect()", lambda: oled.fill_rect(0, 20, 128, 50, 0))
+print(f"speedup: {pixels / max(rect, 1):.1f}x")
+
+measure("invert_rect 128x10", lambda: oled.invert_rect(0, 10, 128, 10))
+measure("copy_rect 64x20", lambda: oled.copy_rect(0, 0, 64, 20, 64, 20))
+measure("scroll_rect 128x40 by 8", lambda: oled.scroll_rect(0, 20, 128, 40, 0, -8))
+oled.pages_to_update = 0
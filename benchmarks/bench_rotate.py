@@ -0,0 +1,40 @@
+# Porovnání snímkové frekvence displeje při rotate=0 a rotate=90.
+# Spuštění na zařízení: mpremote run benchmarks/bench_rotate.py
+import time
+from machine import Pin, I2C
+from sh1106 import SH1106_I2C
+
+FRAMES = 50
+
+i2c = I2C(0, scl=Pin(22), sda=Pin(21))
+
+
+def fps(oled, draw, full_update=False):
+    start = time.ticks_us()
+    for frame in range(FRAMES):
+        draw(oled, frame)
+        oled.show(full_update)
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    return FRAMES * 1000000 / elapsed
+
+
+def draw_line(oled, frame):
+    # Změna jednoho řádku textu, jako počítadlo skóre
+    oled.fill_rect(0, 0, 64, 8, 0)
+    oled.text(str(frame), 0, 0)
+
+
+def draw_screen(oled, frame):
+    oled.fill(0)
+    for row in range(6):
+        oled.text(f"Row {row} {frame}", 0, row * 10)
+
+
+for rotate in (0, 90):
+    for diff in (False, True):
+        oled = SH1106_I2C(128, 64, i2c, rotate=rotate, diff=diff)
+        line = fps(oled, draw_line)
+        screen = fps(oled, draw_screen)
+        full = fps(oled, draw_screen, True)
+        print(f"rotate={rotate} diff={diff}: line {line:.1f} fps, "
+              f"screen {screen:.1f} fps, full {full:.1f} fps")
@@ -0,0 +1,75 @@
+# Porovnání snímkové frekvence SH1106_SPI: původní cesta (každý příkaz
+# s vlastním bufferem a cyklem CS) proti dávce adresy a dat v jednom
+# cyklu CS, při několika rychlostech sběrnice. Vypíše i alokace haldy
+# na snímek a nakonec plné snímky přes full_baudrate, kdy ovladač běží na
+# 4 MHz a jen celé snímky posílá nejvyšší rychlostí.
+# Pro displej připojený přes SPI (VSPI, piny níže).
+# Spuštění na zařízení: mpremote run benchmarks/bench_spi.py
+import gc
+import time
+from machine import Pin, SPI
+from sh1106 import SH1106, SH1106_SPI
+
+FRAMES = 50
+BAUDRATES = (1000000, 4000000, 10000000)  # 4 MHz je limit z datasheetu, moduly obvykle zvládnou víc
+
+
+class LegacySPI(SH1106_SPI):
+    """Cesta před dávkováním: write_cmd alokuje, adresa stránky jsou tři cykly CS."""
+
+    def write_cmd(self, cmd):
+        self.cs(1)
+        self.dc(0)
+        self.cs(0)
+        self.spi.write(bytearray([cmd]))
+        self.cs(1)
+        self.transactions += 1
+
+    write_window = SH1106.write_window
+
+
+def fps(oled, draw, full_update=False):
+    # Alokace se počítají jen v show(), kreslení textu alokuje samo
+    gc.collect()
+    allocated = 0
+    start = time.ticks_us()
+    for frame in range(FRAMES):
+        draw(oled, frame)
+        free = gc.mem_free()
+        oled.show(full_update)
+        allocated += free - gc.mem_free()
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    return FRAMES * 1000000 / elapsed, allocated // FRAMES
+
+
+def draw_line(oled, frame):
+    # Změna jednoho řádku textu, jako počítadlo skóre
+    oled.fill_rect(0, 0, 64, 8, 0)
+    oled.text(str(frame), 0, 0)
+
+
+def draw_screen(oled, frame):
+    oled.fill(0)
+    for row in range(6):
+        oled.text(f"Row {row} {frame}", 0, row * 10)
+
+
+dc = Pin(4)
+res = Pin(16)
+cs = Pin(5)
+
+for baudrate in BAUDRATES:
+    spi = SPI(2, baudrate=baudrate, sck=Pin(18), mosi=Pin(23))
+    for driver in (LegacySPI, SH1106_SPI):
+        oled = driver(128, 64, spi, dc, res, cs)
+        (line, line_alloc) = fps(oled, draw_line)
+        (full, full_alloc) = fps(oled, draw_screen, True)
+        print(f"{baudrate // 1000000} MHz {driver.__name__}: line {line:.1f} fps ({line_alloc} B/snímek), "
+              f"full {full:.1f} fps ({full_alloc} B/snímek)")
+    spi.deinit()
+
+spi = SPI(2, baudrate=4000000, sck=Pin(18), mosi=Pin(23))
+oled = SH1106_SPI(128, 64, spi, dc, res, cs, baudrate=4000000, full_baudrate=BAUDRATES[-1])
+(full, full_alloc) = fps(oled, draw_screen, True)
+print(f"4 MHz, celé snímky {BAUDRATES[-1] // 1000000} MHz: full {full:.1f} fps ({full_alloc} B/snímek)")
+spi.deinit()
@@ -0,0 +1,276 @@
+# Sada benchmarků horkých cest: obnova displeje, menu, klávesnice, kolo hry.
+# Spuštění na zařízení: mpremote run benchmarks/bench_suite.py > device.json
+# Na počítači v simulátoru: python benchmarks/run_sim.py (přidá i online kolo)
+#
+# Poslední řádek výstupu je JSON {"env": ..., "results": {jméno: {metrika: hodnota}}},
+# porovnání s uloženou referencí: python benchmarks/compare.py device.json baseline.json
+# Metriky: us = průměrná doba jedné operace, bytes a transactions = data
+# a přenosy na displej za operaci (počítadla driveru SH1106), frames = počet show().
+# Čím menší hodnota, tím lépe. V simulátoru běží virtuální čas, us proto
+# obsahuje jen modelovanou dobu přenosu po sběrnici, ne práci procesoru.
+import json
+import sys
+import time
+import uasyncio as asyncio
+from machine import I2C, Pin
+from sh1106 import SH1106_I2C
+from oled_display import OledDisplay
+from keypad import Keypad, KEY_PRESS
+from buzzer import Buzzer
+from runtime import Runtime
+from widgets import Menu
+from game import Game
+
+FRAMES = 20
+SCANS = 100
+PRESSES = 10
+MENU_ITEMS = ["New Game", "Online Game", "High Score"]
+
+
+class Counter:
+    """
+    Měří dobu a provoz na displej bloků with, součty ze všech bloků dělí
+    počtem operací count. Výsledek je v atributu result.
+    """
+
+    def __init__(self, oled, count=1):
+        self.oled = oled
+        self.count = count
+        self.us = self.bytes = self.transactions = 0
+
+    def __enter__(self):
+        self.start = (time.ticks_us(), self.oled.bytes_sent, self.oled.transactions)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        (start, sent, transactions) = self.start
+        self.us += time.ticks_diff(time.ticks_us(), start)
+        self.bytes += self.oled.bytes_sent - sent
+        self.transactions += self.oled.transactions - transactions
+
+    @property
+    def result(self):
+        n = self.count
+        return {
+            "us": self.us // n,
+            "bytes": self.bytes // n,
+            "transactions": round(self.transactions / n, 1),
+        }
+
+
+def draw_screen(oled, frame):
+    oled.fill(0)
+    for row in range(6):
+        oled.text(f"Row {row} {frame}", 0, row * 10)
+
+
+def draw_score(oled, frame):
+    # Změna jednoho řádku textu, jako počítadlo skóre. Pozice se vejde
+    # i na otočený displej široký 64 bodů.
+    oled.fill_rect(40, 0, 24, 8, 0)
+    oled.text(str(frame), 40, 0)
+
+
+def flush(oled, draw, full_update=False):
+    with Counter(oled, FRAMES) as counter:
+        for frame in range(FRAMES):
+            draw(oled, frame)
+            oled.show(full_update)
+    return counter.result
+
+
+def bench_flush(results, display):
+    oled = display.oled
+    results["flush_full"] = flush(oled, draw_screen, True)
+    draw_screen(oled, 0)
+    oled.show()
+    results["flush_partial"] = flush(oled, draw_score)
+
+    rotated = SH1106_I2C(128, 64, I2C(0, scl=Pin(22), sda=Pin(21)), rotate=90, diff=True)
+    results["flush_rotate90_full"] = flush(rotated, draw_screen, True)
+    results["flush_rotate90_partial"] = flush(rotated, draw_score)
+    del rotated
+    display.clear_screen()
+
+
+def bench_clear_area(results, display):
+    oled = display.oled
+    oled.fill(1)
+    oled.show()
+    with Counter(oled, FRAMES) as counter:
+        for _ in range(FRAMES):
+            oled.fill_rect(0, 20, 128, 50, 0)  # Jen framebuffer
+    results["clear_area"] = counter.result
+    counter = Counter(oled, FRAMES)
+    for frame in range(FRAMES):
+        draw_screen(oled, frame)
+        oled.show()
+        with counter:
+            display.clear_area(0, 20, 128, 50)  # Včetně obnovy displeje
+    results["clear_area_flush"] = counter.result
+    display.clear_screen()
+
+
+def bench_menu(results, display):
+    oled = display.oled
+    menu = Menu(display, 0, len(MENU_ITEMS))
+    menu.set(MENU_ITEMS, 0)
+    with Counter(oled, FRAMES) as counter:
+        for frame in range(FRAMES):
+            menu.set(MENU_ITEMS, (frame + 1) % len(MENU_ITEMS))
+    results["menu_redraw"] = counter.result
+    menu.set(MENU_ITEMS, 0)
+    with Counter(oled, FRAMES) as counter:
+        for _ in range(FRAMES):
+            menu.set(MENU_ITEMS, 0)  # Beze změny se nemá nic poslat
+    results["menu_idle"] = counter.result
+    display.clear_screen()
+
+
+def bench_scan(results, keypad):
+    start = time.ticks_us()
+    for _ in range(SCANS):
+        keypad.poll()
+    results["key_scan"] = {"us": time.ticks_diff(time.ticks_us(), start) // SCANS}
+
+
+def press(keypad, key):
+    """Vloží stisk do fronty klávesnice, jako by ho našel poll()."""
+    keypad.push(KEY_PRESS, keypad.keys.index(key), time.ticks_ms())
+
+
+class ShowLog:
+    """Zaznamenává časy dokončení show(), podle nich se měří odezva."""
+
+    def __init__(self, oled):
+        self.times = []
+        self.show = oled.show
+        oled.show = self.timed_show
+
+    def timed_show(self, full_update=False):
+        self.show(full_update)
+        self.times.append(time.ticks_us())
+
+
+async def bench_key_to_screen(results, runtime, keypad, shows):
+    # Stejná smyčka jako menu v main.py: klávesa -> Menu.set -> display_task
+    display = runtime.display
+    menu = Menu(display, 0, len(MENU_ITEMS))
+    state = {"selected": 0}
+
+    async def menu_loop():
+        while True:
+            menu.set(MENU_ITEMS, state["selected"])
+            key = await runtime.get_key()
+            if key == "S2":
+                state["selected"] = (state["selected"] + 1) % len(MENU_ITEMS)
+
+    task = asyncio.create_task(menu_loop())
+    await asyncio.sleep_ms(100)
+    total = worst = 0
+    for _ in range(PRESSES):
+        count = len(shows.times)
+        start = time.ticks_us()
+        press(keypad, "S2")
+        while len(shows.times) == count:
+            await asyncio.sleep_ms(1)
+        latency = time.ticks_diff(shows.times[-1], start)
+        total += latency
+        worst = max(worst, latency)
+        await asyncio.sleep_ms(100)
+    task.cancel()
+    results["key_to_screen"] = {"us": total // PRESSES, "max_us": worst}
+
+
+async def wait_for(condition, timeout_ms=30000):
+    start = time.ticks_ms()
+    while not condition():
+        if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+            raise OSError("benchmark: timeout")
+        await asyncio.sleep_ms(10)
+
+
+async def bench_game_round(results, runtime, keypad, shows):
+    # Jedno kolo Game: nová sekvence, přehrání, správné zadání, vyhodnocení
+    game = Game(runtime)
+    sequences = []
+    turns = []
+    rounds = []
+    generate = game.generate_sequence
+    get_user_input = game.get_user_input
+    evaluate = game.evaluate_sequence
+
+    def record_sequence():
+        sequence = generate()
+        sequences.append(sequence)
+        return sequence
+
+    async def record_input(length):
+        turns.append(length)
+        return await get_user_input(length)
+
+    async def record_round(correct, user):
+        await evaluate(correct, user)
+        rounds.append(user == correct)
+
+    game.generate_sequence = record_sequence
+    game.get_user_input = record_input
+    game.evaluate_sequence = record_round
+    task = asyncio.create_task(game.run())
+    await asyncio.sleep_ms(200)
+
+    oled = runtime.display.oled
+    frames = len(shows.times)
+    with Counter(oled) as counter:
+        press(keypad, "S1")
+        await wait_for(lambda: turns)  # Sekvence dohrála, hra čeká na vstup
+        for frequency in sequences[0]:
+            press(keypad, "S%d" % (5 + runtime.buzzer.tones.index(frequency)))
+            await asyncio.sleep_ms(200)
+        await wait_for(lambda: rounds)
+    if not rounds[0]:
+        raise OSError("benchmark: hra nepřijala správnou sekvenci")
+    result = counter.result
+    result["frames"] = len(shows.times) - frames
+    del result["us"]  # Doba kola je daná pauzami hry, ne výkonem
+    results["game_round"] = result
+    press(keypad, "S2")  # Konec hry
+    await task
+
+
+def run(extra=None):
+    """
+    Spustí všechny benchmarky a vrátí slovník výsledků. extra(results,
+    runtime) je volitelná korutina s dalšími benchmarky (simulátor).
+    """
+    results = {}
+    display = OledDisplay()
+    keypad = Keypad()
+    bench_flush(results, display)
+    bench_clear_area(results, display)
+    bench_menu(results, display)
+    bench_scan(results, keypad)
+
+    runtime = Runtime(display, keypad, Buzzer())
+    shows = ShowLog(display.oled)
+
+    async def main():
+        await bench_key_to_screen(results, runtime, keypad, shows)
+        await bench_game_round(results, runtime, keypad, shows)
+        if extra:
+            await extra(results, runtime)
+
+    runtime.run(main())
+    keypad.timer.deinit()
+    runtime.buzzer.timer.deinit()
+    return results
+
+
+def report(env, results):
+    for name in sorted(results):
+        print(name, results[name])
+    print(json.dumps({"env": env, "results": results}))
+
+
+if __name__ == "__main__":
+    report(sys.platform, run())
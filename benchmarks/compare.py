@@ -0,0 +1,77 @@
+"""
+Porovnání výsledků benchmarků s uloženou referencí.
+
+Spuštění: python benchmarks/compare.py results.json baseline.json [--tolerance 10]
+
+Soubory jsou JSON z bench_suite.py, stačí i celý výstup mpremote (bere
+se poslední řádek s JSON). Všechny metriky jsou "menší je lepší".
+Zhoršení o víc než tolerance procent je regrese a skript skončí
+s kódem 1, referenci pro zařízení vytvoří prosté zkopírování výsledků.
+
+V simulátoru jsou časy (us) jen modelovaná doba přenosu po sběrnici.
+Metriky čisté práce procesoru (clear_area.us, key_scan.us) by tam byly
+vždy 0, run_sim.py je proto vynechává a porovnávají se jen na zařízení.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load(path):
+    """Načte výsledky ze souboru, v textovém výstupu najde poslední řádek s JSON."""
+    for line in reversed(Path(path).read_text(encoding="utf-8").splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise SystemExit(f"{path}: nenalezen JSON s výsledky")
+
+
+def compare(results, baseline, tolerance=10.0):
+    """
+    Porovná dva slovníky {jméno: {metrika: hodnota}}. Vrátí (řádky
+    zprávy, počet regresí). Regrese je nárůst o víc než tolerance
+    procent a zároveň o víc než 1 (malá celočíselná počítadla).
+    """
+    lines = []
+    regressions = 0
+    for name in sorted(set(results) | set(baseline)):
+        new, old = results.get(name), baseline.get(name)
+        if new is None:
+            lines.append(f"{name}: chybí ve výsledcích")
+            continue
+        if old is None:
+            lines.append(f"{name}: nový {new}")
+            continue
+        for metric in sorted(set(new) | set(old)):
+            if metric not in new or metric not in old:
+                lines.append(f"{name}.{metric}: {old.get(metric)} -> {new.get(metric)}")
+                continue
+            a, b = old[metric], new[metric]
+            change = (b - a) * 100 / a if a else 0.0
+            mark = ""
+            if b > a + max(a * tolerance / 100, 1):
+                mark = "  REGRESE"
+                regressions += 1
+            elif b < a - max(a * tolerance / 100, 1):
+                mark = "  zlepšení"
+            lines.append(f"{name}.{metric}: {a} -> {b} ({change:+.1f} %){mark}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("results")
+    parser.add_argument("baseline")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="povolené zhoršení v procentech")
+    args = parser.parse_args()
+    results, baseline = load(args.results), load(args.baseline)
+    if results.get("env") != baseline.get("env"):
+        print(f"Pozor: výsledky z {results.get('env')}, reference z {baseline.get('env')}")
+    lines, regressions = compare(results["results"], baseline["results"], args.tolerance)
+    print("\n".join(lines))
+    print(f"Regresí: {regressions}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Sada benchmarků (bench_suite.py) v simulátoru, navíc celá online hra
+proti hernímu serveru v paměti. Výsledek porovná s uloženou referencí.
+
+Spuštění: python benchmarks/run_sim.py [--out results.json] [--update]
+
+Simulátor běží ve virtuálním čase a je deterministický, reference
+benchmarks/baseline_sim.json proto platí na každém počítači. --update
+ji přepíše aktuálními výsledky (po záměrné změně výkonu).
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sim import Board  # noqa: E402
+import compare  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baseline_sim.json"
+LIMIT_S = 600  # Pojistka proti zaseknutí, ve virtuálním čase
+# Metriky čistě práce procesoru: simulátor měří jen dobu sběrnice, byly
+# by vždy 0 a regresi by nezachytily, do výsledků se proto nedávají
+CPU_ONLY = (("clear_area", "us"), ("key_scan", "us"))
+
+
+async def bench_online_round(results, runtime, board):
+    """Online hra od výběru po konec: požadavky, spojení a data za kolo."""
+    import bench_suite
+    from http_client import HttpClient
+    from upload_queue import UploadQueue
+    from online_game import OnlineGame
+
+    client = HttpClient("http://sim")
+    game = OnlineGame(runtime, client, UploadQueue(client))
+    turns = []
+    get_user_input = game.get_user_input
+
+    async def record_input(length):
+        turns.append(length)
+        return await get_user_input(length)
+
+    game.get_user_input = record_input
+    server = board.server
+    bytes_out = server.bytes_out
+    task = asyncio.create_task(game.run())
+    bench_suite.press(runtime.keypad, "S3")  # První hra v seznamu
+    rounds = server.state.rounds
+    for turn in range(rounds):
+        await bench_suite.wait_for(lambda: len(turns) > turn)
+        for _ in range(turns[turn]):
+            bench_suite.press(runtime.keypad, "S5")
+            await asyncio.sleep(0.2)
+    await task
+    if len(turns) != rounds:
+        raise OSError("benchmark: online hra neodehrála všechna kola")
+    results["online_round"] = {
+        "requests": round(client.requests / rounds, 2),
+        "connects": round(client.connects / rounds, 2),
+        "bytes": (server.bytes_out - bytes_out) // rounds,
+    }
+
+
+def run():
+    log = io.StringIO()
+    with Board() as board, contextlib.redirect_stdout(log):
+        board.clock.limit_us = LIMIT_S * 1000000
+        import bench_suite  # Až po Board, potřebuje náhrady modulů zařízení
+
+        async def extra(results, runtime):
+            await bench_online_round(results, runtime, board)
+
+        results = bench_suite.run(extra)
+    for name, metric in CPU_ONLY:
+        results[name].pop(metric, None)
+        if not results[name]:
+            del results[name]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarky v simulátoru")
+    parser.add_argument("--out", help="kam uložit výsledky (JSON)")
+    parser.add_argument("--baseline", default=str(BASELINE), help="reference pro porovnání")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="povolené zhoršení v procentech")
+    parser.add_argument("--update", action="store_true", help="přepsat referenci výsledky")
+    args = parser.parse_args()
+
+    data = {"env": "sim", "results": run()}
+    text = json.dumps(data, sort_keys=True) + "\n"
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    if args.update or not Path(args.baseline).exists():
+        with open(args.baseline, "w", encoding="utf-8", newline="\r\n") as f:  # Jako ostatní soubory v repu
+            f.write(text)
+        print(f"Reference uložena: {args.baseline}")
+        return
+    lines, regressions = compare.compare(data["results"], compare.load(args.baseline)["results"],
+                                         args.tolerance)
+    print("\n".join(lines))
+    print(f"Regresí: {regressions}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
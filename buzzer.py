@@ -1,19 +1,126 @@
-from machine import Pin, PWM
+from machine import Pin, PWM, Timer
+from micropython import const
 import time
+import uasyncio as asyncio
+
+_DURATION_MS = const(500)  # Výchozí délka tónu
+_GAP_MS = const(300)  # Výchozí pauza po tónu
 
 class Buzzer:
-    def __init__(self):
+    def __init__(self, timer_id=1):
         self.buzzer = PWM(Pin(13))
         self.tones = [262, 294, 330, 349, 392, 440, 494]  # C4, D4, E4, F4, G4, A4, B4
         self.buzzer.duty(0)
 
-    def play_tone(self, frequency, duration=0.5):
+        # Sekvencer: fronta not (frekvence, délka ms, pauza ms), kterou
+        # na pozadí posouvá jednorázový časovač
+        self.timer = Timer(timer_id)
+        self.notes = []
+        self.playing = False
+        self.tone_on = False
+        self.gap_ms = 0
+        self.deadline = 0  # ticks_ms konce aktuálního tónu nebo pauzy
+        self.tempo = 1.0  # 2.0 = dvakrát rychleji
+        self.on_done = None
+        self.done = asyncio.ThreadSafeFlag()
+
+    def start_tone(self, frequency):
         self.buzzer.freq(frequency)
         self.buzzer.duty(100)
-        time.sleep(duration)
+
+    def stop_tone(self):
         self.buzzer.duty(0)
+
+    def play_tone(self, frequency, duration=0.5):
+        """Blokující přehrání jednoho tónu."""
+        self.start_tone(frequency)
+        time.sleep(duration)
+        self.stop_tone()
         time.sleep(0.3)
 
-    def play_sequence(self, sequence):
+    def queue(self, frequency, duration_ms=_DURATION_MS, gap_ms=_GAP_MS):
+        """Přidá notu na konec fronty, přehrávání se případně spustí."""
+        self.notes.append((frequency, duration_ms, gap_ms))
+        if not self.playing:
+            self.playing = True
+            self.done.clear()
+            self.deadline = time.ticks_ms()
+            self.advance()
+
+    def play_sequence(self, sequence, on_done=None, duration_ms=_DURATION_MS, gap_ms=_GAP_MS):
+        """
+        Spustí přehrávání sekvence frekvencí na pozadí a hned se vrátí.
+        on_done se zavolá po dohrání nebo zrušení, u prázdné sekvence
+        hned. Rozehranou sekvenci nejdřív zruší, její on_done se zavolá.
+        """
+        self.cancel()
+        if not sequence:
+            if on_done:
+                on_done()
+            return
+        self.on_done = on_done
         for frequency in sequence:
-            self.play_tone(frequency)
+            self.queue(frequency, duration_ms, gap_ms)
+
+    async def play(self, sequence):
+        """Přehraje sekvenci a počká na její dohrání (nebo zrušení)."""
+        self.play_sequence(sequence)
+        await self.wait()
+
+    async def wait(self):
+        """Počká, až sekvencer dohraje."""
+        if self.playing:
+            await self.done.wait()
+
+    def set_tempo(self, tempo):
+        """Změní tempo, platí od další noty (1.0 = původní rychlost)."""
+        self.tempo = tempo
+
+    def skip(self):
+        """Ukončí aktuální notu i s pauzou a pokračuje další."""
+        if self.playing:
+            self.timer.deinit()
+            self.stop_tone()
+            self.tone_on = False
+            self.deadline = time.ticks_ms()
+            self.advance()
+
+    def cancel(self):
+        """Zastaví přehrávání a zahodí zbytek fronty."""
+        self.timer.deinit()
+        self.notes.clear()
+        self.stop_tone()
+        self.tone_on = False
+        if self.playing:
+            self.finish()
+
+    def advance(self, timer=None):
+        """Krok sekvenceru, volá ho časovač na konci tónu nebo pauzy."""
+        if self.tone_on:
+            self.stop_tone()
+            self.tone_on = False
+            if self.gap_ms:
+                self.schedule(self.gap_ms)
+                return
+        if not self.notes:
+            self.finish()
+            return
+        frequency, duration_ms, self.gap_ms = self.notes.pop(0)
+        self.start_tone(frequency)
+        self.tone_on = True
+        self.schedule(duration_ms)
+
+    def schedule(self, ms):
+        # Termíny se počítají od plánovaného, ne skutečného konce
+        # předchozího kroku, aby se zpoždění časovače nesčítalo
+        self.deadline = time.ticks_add(self.deadline, int(ms / self.tempo))
+        delay = max(1, time.ticks_diff(self.deadline, time.ticks_ms()))
+        self.timer.init(mode=Timer.ONE_SHOT, period=delay, callback=self.advance)
+
+    def finish(self):
+        self.playing = False
+        self.done.set()
+        on_done = self.on_done
+        self.on_done = None
+        if on_done:
+            on_done()
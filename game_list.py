@@ -0,0 +1,129 @@
+import uasyncio as asyncio
+from micropython import const
+import time
+from http_client import HttpError
+import json_stream
+
+_PAGE_SIZE = const(8)  # Her na stránku, stejně jako řádků na displeji
+_RETRY_MS = const(2000)  # Čekání před dalším pokusem o stránku, zdvojuje se
+_MAX_ATTEMPTS = const(3)  # Pak se stránka sama nestahuje, jen na retry()
+
+class GameList:
+    """
+    Seznam probíhajících her stahovaný po stránkách
+    (GET /api/games/in-progress?offset=..&limit=..). Chová se jako
+    posloupnost textů pro ScrollList, ale v paměti drží jen stránky
+    viditelného okna a jednu další, kterou stahuje na pozadí, zatímco
+    hráč prohlíží aktuální. Paměť a čekání tak nerostou s počtem her.
+    Počet her bere z hlavičky X-Total-Count, bez ní ho zjistí až
+    z neúplné stránky. Stránka, která se nepovede stáhnout, se zkouší
+    znovu s rostoucím odstupem a po _MAX_ATTEMPTS pokusech jen na
+    retry(), její řádky mezitím ukazují chybu.
+    """
+
+    def __init__(self, client, page_size=_PAGE_SIZE):
+        self.client = client
+        self.page_size = page_size
+        self.pages = {}  # Číslo stránky -> seznam her
+        self.loading = {}  # Číslo stránky -> běžící stahování
+        self.total = None  # Počet her, pokud je známý
+        self.known = 0  # Kolik her zatím určitě existuje
+        self.changed = False  # Přišla stránka, zobrazení je třeba obnovit
+        self.error = None  # Poslední chyba stahování
+        self.failed = {}  # Číslo stránky -> (ticks_ms chyby, počet pokusů)
+
+    def __len__(self):
+        if self.total is not None:
+            return self.total
+        return self.known + 1  # Řádek navíc, jeho zobrazení stáhne další stránku
+
+    def __getitem__(self, index):
+        game = self.game(index)
+        if game is None:
+            if index // self.page_size in self.failed:
+                return "! Load error"
+            return "..."  # Stránka se teprve stahuje
+        return f"{index + 1}: {game['nickname']}"
+
+    def game(self, index):
+        """Vrátí hru index, nebo None, pokud její stránka ještě není stažená."""
+        page = self.pages.get(index // self.page_size)
+        if page is None:
+            self.request(index // self.page_size)
+            return None
+        index %= self.page_size
+        return page[index] if index < len(page) else None
+
+    def request(self, page):
+        """
+        Spustí stahování stránky na pozadí, pokud už neběží a po chybě
+        uplynul odstup před dalším pokusem.
+        """
+        if page in self.pages or page in self.loading:
+            return
+        failed = self.failed.get(page)
+        if failed is not None:
+            (at, attempts) = failed
+            if attempts >= _MAX_ATTEMPTS or \
+                    time.ticks_diff(time.ticks_ms(), at) < _RETRY_MS << (attempts - 1):
+                return
+        self.loading[page] = asyncio.create_task(self.fetch(page))
+
+    def retry(self, index):
+        """Stáhne znovu stránku položky index, pokud její stahování selhalo."""
+        page = index // self.page_size
+        if page in self.failed:
+            del self.failed[page]
+            self.request(page)
+
+    async def fetch(self, page):
+        size = self.page_size
+        try:
+            response = await self.client.get(
+                f"/api/games/in-progress?offset={page * size}&limit={size}",
+                stream=json_stream.items(("_id", "nickname"), size))
+            if response.status_code != 200:
+                raise HttpError(response.status_code)
+            games = response.data
+            if "x-total-count" in response.headers:
+                self.total = int(response.headers["x-total-count"])
+            elif len(games) < size:
+                self.total = page * size + len(games)  # Poslední stránka
+            self.known = max(self.known, page * size + len(games))
+            self.pages[page] = games
+            self.failed.pop(page, None)
+            self.changed = True
+        except Exception as e:
+            print("Stránku her nelze stáhnout:", page, e)
+            self.error = e
+            attempts = self.failed[page][1] if page in self.failed else 0
+            self.failed[page] = (time.ticks_ms(), attempts + 1)
+            self.changed = True  # Řádky stránky ukážou chybu
+        finally:
+            del self.loading[page]
+
+    async def load(self, page):
+        """Stáhne stránku a počká na ni, chybu vyhodí (HttpError, OSError)."""
+        self.error = None
+        self.failed.pop(page, None)
+        self.request(page)
+        task = self.loading.get(page)
+        if task is not None:
+            await task
+        if page not in self.pages:
+            raise self.error
+        return self.pages[page]
+
+    def window(self, top, rows):
+        """
+        Nastaví viditelné okno od položky top: stáhne jeho stránky a jednu
+        další napřed, ostatní stránky zapomene.
+        """
+        size = self.page_size
+        keep = range(top // size, (top + rows - 1) // size + 2)
+        for page in list(self.pages):
+            if page not in keep:
+                del self.pages[page]
+        for page in keep:
+            if page * size < len(self):
+                self.request(page)
@@ -0,0 +1,136 @@
+import uasyncio as asyncio
+from micropython import const
+import time
+from game_updates import GameUpdates
+from http_client import HttpError
+import tone_wire
+
+_FRESH_MS = const(1000)  # Dokument mladší než tohle se nenačítá znovu
+
+class GameSession:
+    """
+    Stav jedné online hry na straně klienta: poslední dokument hry s verzí
+    a časem načtení. Souběžná i rychle po sobě jdoucí čtení sdílí jeden
+    požadavek a sekvence nového kola, kterou přinese long-poll, se použije
+    bez dalšího dotazu. Kolo tak stojí jeden GET a jeden POST.
+
+    Sekvence se dekóduje do předem alokovaného bytearray indexů tónů.
+    Server, který zná tone_wire.CONTENT_TYPE, ji posílá zabalenou, jinak
+    jako JSON seznam frekvencí. Stejnou formou se posílá i výsledek.
+    """
+
+    def __init__(self, client, game_id, tones):
+        self.client = client
+        self.game_id = game_id
+        self.tones = tones  # Frekvence tónů, index do nich je tón sekvence
+        self.document = None
+        self.etag = None
+        self.sequence = bytearray(tone_wire.MAX_TONES)  # Indexy tónů aktuálního kola
+        self.length = 0
+        self.packed = False  # Server posílá a přijímá zabalené sekvence
+        self.sequence_error = None  # ToneError, pokud sekvenci dokumentu nejde použít
+        self.version = 0  # Zvýší se s každým novým dokumentem
+        self.updated_at = 0  # ticks_ms posledního ověření u serveru
+        self.played_version = 0  # Verze, jejíž sekvence už se hrála
+        self.pending = None  # Běžící načtení, na které čekají všichni čtenáři
+        self.updates = GameUpdates(client, game_id, accept=tone_wire.CONTENT_TYPE)
+
+        # Statistiky
+        self.gets = 0
+        self.posts = 0
+
+    def store(self, document, etag, content_type):
+        # Nepoužitelná sekvence neznamená chybu dokumentu (stav hry, ETag
+        # platí dál), ohlásí se až v take_sequence()
+        self.packed = (content_type or "").startswith(tone_wire.CONTENT_TYPE)
+        self.sequence_error = None
+        try:
+            if self.packed and "tones" in document:
+                self.length = tone_wire.unpack(document["tones"], self.sequence)
+            else:
+                self.length = tone_wire.from_frequencies(document.get("sequence", ()), self.tones, self.sequence)
+        except tone_wire.ToneError as e:
+            self.length = 0
+            self.sequence_error = e
+        self.document = document
+        self.etag = etag
+        self.version += 1
+        self.updated_at = time.ticks_ms()
+
+    def is_over(self):
+        return self.document is not None and self.document.get("gameState") == "game_over"
+
+    async def fetch(self):
+        """
+        Vrátí aktuální dokument hry. Pokud je čerstvý, nejde na server,
+        souběžná volání čekají na jeden společný požadavek.
+        """
+        if self.document is not None and time.ticks_diff(time.ticks_ms(), self.updated_at) < _FRESH_MS:
+            return self.document
+        if self.pending is None:
+            self.pending = asyncio.create_task(self.load())
+        task = self.pending
+        try:
+            return await task
+        finally:
+            if self.pending is task:
+                self.pending = None
+
+    async def load(self):
+        headers = {"Accept": tone_wire.CONTENT_TYPE}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        self.gets += 1
+        response = await self.client.get(f"/api/game?id={self.game_id}", headers=headers)
+        if response.status_code == 304 and self.document is not None:
+            self.updated_at = time.ticks_ms()
+        elif response.status_code == 200:
+            self.store(response.json(), response.headers.get("etag"), response.headers.get("content-type"))
+        else:
+            raise HttpError(response.status_code)
+        return self.document
+
+    async def take_sequence(self):
+        """
+        Vrátí indexy tónů kola, které se ještě nehrálo (pohled do
+        self.sequence). Pokud sekvenci už přinesl long-poll, použije ji
+        bez dotazu na server. Sekvenci s neznámým tónem nebo příliš
+        dlouhou vyhodí jako ToneError.
+        """
+        if self.document is None or self.played_version == self.version:
+            await self.fetch()
+        self.played_version = self.version
+        if self.sequence_error is not None:
+            raise self.sequence_error
+        return memoryview(self.sequence)[:self.length]
+
+    async def submit(self, indices):
+        """
+        Odešle výsledek kola (indexy tónů). Pokud server vrátí ETag nové
+        verze, long-poll na ni nebude zbytečně reagovat.
+        """
+        self.posts += 1
+        if self.packed:
+            response = await self.client.post(
+                "/api/game/update", json={"id": self.game_id, "tones": tone_wire.pack(indices, len(indices))},
+                headers={"Content-Type": tone_wire.CONTENT_TYPE})
+        else:
+            esp_data = [self.tones[i] for i in indices]
+            response = await self.client.post("/api/game/update", json={"id": self.game_id, "espData": esp_data})
+        if response.status_code != 200:
+            raise HttpError(response.status_code)
+        if response.headers.get("etag"):
+            self.etag = response.headers["etag"]
+            if self.document is not None:
+                self.document["completed"] = True
+
+    async def next_round(self):
+        """Počká, až server spustí nové kolo nebo hru ukončí, a vrátí dokument."""
+        while True:
+            self.updates.etag = self.etag
+            self.gets += 1
+            document = await self.updates.next()
+            self.store(document, self.updates.etag, self.updates.content_type)
+            if self.is_over() or not document.get("completed", False):
+                return document
+            await self.updates.pause()  # Kolo ještě nezačalo
@@ -0,0 +1,62 @@
+import uasyncio as asyncio
+from micropython import const
+
+_HOLD_S = const(25)  # Jak dlouho server drží long-poll bez změny
+_POLL_MS = const(3000)  # Interval náhradního dotazování
+
+class GameUpdates:
+    """
+    Odběr změn dokumentu hry. Primárně přes long-poll
+    GET /api/game/wait?id=...: server drží požadavek, dokud se ETag hry
+    neliší od If-None-Match (pak vrátí 200 s novým dokumentem), nebo do
+    vypršení (304). Pokud server endpoint nezná (404), dotazuje se
+    podmíněným GET /api/game, který při beze změny stojí jen 304,
+    nejvýše jednou za _POLL_MS.
+    """
+
+    def __init__(self, client, game_id, etag=None, accept=None):
+        self.client = client
+        self.game_id = game_id
+        self.etag = etag  # ETag naposledy viděné verze dokumentu
+        self.accept = accept  # Preferovaný typ obsahu dokumentu
+        self.content_type = None  # Typ obsahu poslední odpovědi 200
+        self.long_poll = True
+
+    def headers(self):
+        headers = {"Accept": self.accept} if self.accept else {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        return headers or None
+
+    async def next(self):
+        """Počká na další verzi dokumentu hry a vrátí ji."""
+        while True:
+            if self.long_poll:
+                response = await self.client.get(
+                    f"/api/game/wait?id={self.game_id}&timeout={_HOLD_S}",
+                    headers=self.headers(), timeout_ms=(_HOLD_S + 10) * 1000)
+                if response.status_code == 404:
+                    print("Server neumí long-poll, přecházím na dotazování")
+                    self.long_poll = False
+                    continue
+            else:
+                response = await self.client.get(f"/api/game?id={self.game_id}", headers=self.headers())
+
+            if response.status_code == 200:
+                etag = response.headers.get("etag")
+                # Server bez podpory If-None-Match vrací i nezměněný dokument
+                if self.long_poll or etag is None or etag != self.etag:
+                    self.etag = etag
+                    self.content_type = response.headers.get("content-type")
+                    return response.json()
+            elif response.status_code != 304:
+                raise OSError(f"HTTP {response.status_code}")
+            await self.pause()
+
+    async def pause(self):
+        """
+        Při dotazování počká interval před dalším GET, bez něj by se
+        dotazy točily bez přestávky. Long-poll čeká na serveru.
+        """
+        if not self.long_poll:
+            await asyncio.sleep_ms(_POLL_MS)
@@ -1,46 +1,54 @@
-import urequests
-import time
+import uasyncio as asyncio
+from micropython import const
+from http_client import HttpError
+import json_stream
+from widgets import ScrollList
+
+_MAX_SCORES = const(20)  # Kolik výsledků se stáhne, S1/S2 jimi posouvá
+_IDLE_MS = const(5000)  # Zpět do menu po této době bez stisku
 
 class HighScore:
-    def __init__(self, display, server_url):
-        self.display = display
-        self.server_url = server_url
+    def __init__(self, runtime, cache):
+        self.runtime = runtime
+        self.display = runtime.display
+        self.cache = cache  # ResponseCache nad sdíleným HttpClient
 
-    def fetch_high_scores(self):
+    async def fetch_high_scores(self):
         """Načte high score data z API."""
         try:
-            response = urequests.get(f"{self.server_url}/api/highscores")
-            if response.status_code == 200:
-                scores = response.json()
-                response.close()
-                return scores
-            else:
-                self.display.display_text("Server error", 0, 20)
-                time.sleep(2)
+            # Ze žebříčku se čte jen prvních _MAX_SCORES položek
+            return await self.cache.get("/api/highscores", stream=json_stream.items(("name", "points"), _MAX_SCORES))
+        except HttpError:
+            self.display.display_text("Server error", 0, 20)
+            await asyncio.sleep(2)
         except Exception as e:
             print("Chyba při připojení k serveru:", e)
             self.display.display_text("Connection Error", 0, 20)
-            time.sleep(2)
+            await asyncio.sleep(2)
         return []
 
-    def display_high_scores(self):
+    async def display_high_scores(self):
         """Zobrazí high scores na displeji."""
-        self.display.clear_screen()
-        self.display.display_text("Fetching scores...", 0, 0)
-        self.display.oled.show()
+        with self.display.frame():
+            self.display.clear_screen()
+            self.display.display_text("Fetching scores...", 0, 0)
 
-        scores = self.fetch_high_scores()
-        self.display.clear_screen()
+        scores = await self.fetch_high_scores()
 
         if not scores:
-            self.display.display_text("No results found", 0, 20)
-            self.display.oled.show()
-            time.sleep(2)
+            with self.display.frame():
+                self.display.clear_screen()
+                self.display.display_text("No results found", 0, 20)
+            await asyncio.sleep(2)
             return
 
-        self.display.display_text("High Scores:", 0, 0)
-        for i, score in enumerate(scores[:5]):  # Zobrazí maximálně 5 výsledků
-            self.display.display_text(f"{i+1}. {score['name']} - {score['points']}", 0, 10 + (i * 10))
-
-        self.display.oled.show()
-        time.sleep(5)
+        view = ScrollList(self.display)
+        view.set(["High Scores:"] + [f"{i+1}. {score['name']} - {score['points']}" for i, score in enumerate(scores)])
+        while True:
+            key = await self.runtime.get_key(_IDLE_MS)
+            if key == "S1":
+                view.move(-1)
+            elif key == "S2":
+                view.move(1)
+            else:
+                return  # Zpět po 5 s nebo stiskem jiné klávesy
@@ -0,0 +1,307 @@
+import uasyncio as asyncio
+from micropython import const
+import json as jsonlib
+import random
+import time
+
+_TIMEOUT_MS = const(8000)  # Limit na jeden pokus včetně navázání spojení
+_RETRIES = const(2)  # Kolikrát se zopakuje idempotentní požadavek
+_BACKOFF_MS = const(250)  # Základ exponenciálního čekání mezi pokusy
+_DRAIN_LIMIT = const(1024)  # Nepřečtený zbytek těla do této délky se dočte, delší zavře spojení
+
+class HttpError(Exception):
+    """Server odpověděl jiným stavem než 200."""
+
+    def __init__(self, status_code):
+        super().__init__(status_code)
+        self.status_code = status_code
+
+
+class ConnectionClosed(OSError):
+    """Server zavřel spojení dřív, než poslal odpověď."""
+    pass
+
+
+class Response:
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers  # Názvy hlaviček malými písmeny
+        self.content = content
+        self.keep_alive = False  # Spojení lze použít pro další požadavek
+        self.data = None  # Výsledek stream funkce u streamovaných odpovědí
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+    def close(self):
+        """Kvůli kompatibilitě s urequests, tělo je už přečtené."""
+        pass
+
+
+class BodyReader:
+    """
+    Čte tělo odpovědi po částech přímo ze socketu (Content-Length,
+    chunked, nebo do konce spojení), takže ho není nutné držet celé v RAM.
+    """
+
+    def __init__(self, reader, length=None, chunked=False):
+        self.reader = reader
+        self.remaining = length  # None = délka neznámá
+        self.chunked = chunked
+        self.chunk_left = 0
+        self.done = length == 0
+
+    async def read(self, n):
+        """Vrátí až n bajtů těla, na konci b""."""
+        if self.done:
+            return b""
+        reader = self.reader
+        if self.chunked:
+            if self.chunk_left == 0:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b""):
+                        pass  # Trailer hlavičky
+                    self.done = True
+                    return b""
+                self.chunk_left = size
+            data = await reader.read(min(n, self.chunk_left))
+            self.chunk_left -= len(data)
+            if self.chunk_left == 0:
+                await reader.readline()  # CRLF za blokem
+        elif self.remaining is not None:
+            data = await reader.read(min(n, self.remaining))
+            self.remaining -= len(data)
+            self.done = self.remaining == 0
+        else:
+            data = await reader.read(n)
+            self.done = not data
+            return data
+        if not data:
+            raise ConnectionClosed()
+        return data
+
+    async def read_all(self):
+        if self.remaining is not None and not self.chunked:
+            data = await self.reader.readexactly(self.remaining) if self.remaining else b""
+            self.remaining = 0
+            self.done = True
+            return data
+        if self.remaining is None and not self.chunked:
+            self.done = True
+            return await self.reader.read(-1)
+        chunks = []
+        while True:
+            data = await self.read(512)
+            if not data:
+                return b"".join(chunks)
+            chunks.append(data)
+
+    async def drain(self):
+        while await self.read(256):
+            pass
+
+
+def parse_url(url):
+    """Rozloží URL na (ssl, host, port, path)."""
+    parts = url.split("/", 3)  # ["https:", "", "host:port", "cesta"]
+    ssl = parts[0] == "https:"
+    host = parts[2]
+    port = 443 if ssl else 80
+    if ":" in host:
+        host, port = host.split(":", 1)
+        port = int(port)
+    path = "/" + (parts[3] if len(parts) > 3 else "")
+    return ssl, host, port, path
+
+
+class HttpClient:
+    """
+    Sdílený HTTP/1.1 klient pro jeden server. Drží jedno keep-alive spojení,
+    takže se TLS handshake platí jen jednou, ne při každém požadavku.
+    Požadavky z více úloh se na spojení řadí za sebou.
+    """
+
+    def __init__(self, base_url, timeout_ms=_TIMEOUT_MS, retries=_RETRIES):
+        self.ssl, self.host, self.port, path = parse_url(base_url)
+        self.base_path = path.rstrip("/")
+        self.timeout_ms = timeout_ms
+        self.retries = retries
+        self.reader = None
+        self.writer = None
+        self.lock = asyncio.Lock()
+
+        # Statistiky
+        self.requests = 0
+        self.errors = 0
+        self.retried = 0
+        self.connects = 0
+        self.latency_last = 0
+        self.latency_max = 0
+        self.latency_total = 0
+
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+    async def request(self, method, path, json=None, headers=None, timeout_ms=None, stream=None):
+        """
+        Pošle požadavek a vrátí Response s celým tělem. GET se při chybě
+        spojení, vypršení limitu nebo odpovědi 5xx opakuje s náhodně
+        rozptýleným exponenciálním čekáním. timeout_ms přepíše výchozí
+        limit (např. pro long-poll).
+
+        Se stream (async funkce s parametrem BodyReader) se tělo odpovědi
+        200 nenačítá do paměti, ale předá se jí a její výsledek je v
+        Response.data. Pokud funkce skončí dřív, zbytek těla se dočte nebo
+        se spojení zavře.
+        """
+        body = None if json is None else jsonlib.dumps(json).encode()
+        retries = self.retries if method in ("GET", "HEAD") else 0
+        attempt = 0
+        async with self.lock:
+            while True:
+                start = time.ticks_ms()
+                try:
+                    response = await asyncio.wait_for_ms(
+                        self.exchange(method, path, body, headers, stream), timeout_ms or self.timeout_ms)
+                    if response.status_code < 500 or attempt >= retries:
+                        self.record(start)
+                        return response
+                except (OSError, asyncio.TimeoutError):
+                    # Spojení může být v půlce odpovědi, nejde znovu použít
+                    self.close()
+                    if attempt >= retries:
+                        self.errors += 1
+                        raise
+                except BaseException:
+                    # Zrušení úlohy (např. opuštěný long-poll) nebo chyba
+                    # při zpracování: odpověď zůstala v socketu nepřečtená
+                    # a další požadavek by ji dostal místo své
+                    self.close()
+                    raise
+                attempt += 1
+                self.retried += 1
+                await asyncio.sleep_ms(self.backoff(attempt))
+
+    def backoff(self, attempt):
+        """Čekání před pokusem attempt: polovina pevně, polovina náhodně."""
+        delay = _BACKOFF_MS << (attempt - 1)
+        return delay // 2 + random.randint(0, delay // 2)
+
+    def record(self, start):
+        latency = time.ticks_diff(time.ticks_ms(), start)
+        self.requests += 1
+        self.latency_last = latency
+        self.latency_total += latency
+        if latency > self.latency_max:
+            self.latency_max = latency
+
+    def stats(self):
+        """Vrátí statistiky požadavků a latence (ms)."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retried": self.retried,
+            "connects": self.connects,
+            "latency_last": self.latency_last,
+            "latency_max": self.latency_max,
+            "latency_avg": self.latency_total // self.requests if self.requests else 0,
+        }
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        self.connects += 1
+
+    def close(self):
+        """Zavře spojení, další požadavek otevře nové."""
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except OSError:
+                pass
+        self.reader = None
+        self.writer = None
+
+    async def exchange(self, method, path, body, headers, stream):
+        if self.writer is not None:
+            try:
+                return await self.send(method, path, body, headers, stream)
+            except OSError:
+                # Server mezitím nečinné spojení zavřel, zkus nové. POST
+                # mohl server už zpracovat, znovu se posílá jen GET a HEAD
+                self.close()
+                if method not in ("GET", "HEAD"):
+                    raise
+        await self.connect()
+        return await self.send(method, path, body, headers, stream)
+
+    async def send(self, method, path, body, headers, stream):
+        head = f"{method} {self.base_path}{path} HTTP/1.1\r\nHost: {self.host}\r\nConnection: keep-alive\r\n"
+        if headers:
+            for name in headers:
+                head += f"{name}: {headers[name]}\r\n"
+        if body is not None:
+            if not headers or "Content-Type" not in headers:
+                head += "Content-Type: application/json\r\n"
+            head += f"Content-Length: {len(body)}\r\n"
+        self.writer.write((head + "\r\n").encode())
+        if body is not None:
+            self.writer.write(body)
+        await self.writer.drain()
+        response = await self.read_response(method, stream)
+        if not response.keep_alive:
+            self.close()
+        return response
+
+    async def read_response(self, method, stream=None):
+        """Přečte stavový řádek, hlavičky a tělo odpovědi."""
+        reader = self.reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionClosed()
+        version, status_code = status_line.split(None, 2)[:2]
+        status_code = int(status_code)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line or line == b"\r\n":
+                break
+            name, value = line.decode().split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or status_code in (204, 304):
+            body = BodyReader(reader, 0)
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = BodyReader(reader, chunked=True)
+        elif "content-length" in headers:
+            body = BodyReader(reader, int(headers["content-length"]))
+        else:
+            # Délku určuje konec spojení
+            body = BodyReader(reader)
+            keep_alive = False
+
+        if stream is not None and status_code == 200:
+            response = Response(status_code, headers, b"")
+            try:
+                response.data = await stream(body)
+            except BaseException:
+                # Tělo zůstalo přečtené jen zčásti, spojení nejde znovu použít
+                self.close()
+                raise
+            if not body.done:
+                if body.remaining is not None and body.remaining <= _DRAIN_LIMIT:
+                    await body.drain()
+                else:
+                    keep_alive = False
+        else:
+            response = Response(status_code, headers, await body.read_all())
+        response.keep_alive = keep_alive
+        return response
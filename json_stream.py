@@ -0,0 +1,175 @@
+from micropython import const
+
+_CHUNK = const(128)  # Kolik bajtů se čte ze socketu najednou
+_MAX_STRING = const(64)  # Delší řetězce se zkrátí
+
+# Stavy tokenizéru
+_BETWEEN = const(0)  # Mezi tokeny
+_STRING = const(1)
+_ESCAPE = const(2)  # Po zpětném lomítku v řetězci
+_UNICODE = const(3)  # Uvnitř \uXXXX
+_SCALAR = const(4)  # Číslo, true, false nebo null
+
+_ESCAPES = {0x6e: 0x0a, 0x74: 0x09, 0x72: 0x0d, 0x62: 0x08, 0x66: 0x0c}
+
+
+def _decode(token):
+    try:
+        return token.decode()
+    except UnicodeError:
+        # Zkrácení mohlo rozdělit vícebajtový znak
+        for cut in (1, 2, 3):
+            try:
+                return token[:-cut].decode()
+            except UnicodeError:
+                pass
+        return ""
+
+
+def _scalar(token):
+    if token == b"true":
+        return True
+    if token == b"false":
+        return False
+    if token == b"null":
+        return None
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+class ItemExtractor:
+    """
+    Proudový JSON parser, který z odpovědi vybere jen požadovaná pole.
+    Odpověď je buď pole objektů (vrátí seznam slovníků, nejvýše limit
+    položek), nebo jeden objekt (seznam s jedním slovníkem). Vnořené
+    hodnoty přeskakuje, řetězce zkracuje na max_string bajtů. Paměť tak
+    nezávisí na velikosti odpovědi, jen na počtu položek a polí.
+    """
+
+    def __init__(self, fields, limit=None, max_string=_MAX_STRING):
+        self.fields = fields
+        self.limit = limit
+        self.max_string = max_string
+        self.items = []
+        self.item = None  # Rozpracovaná položka
+        self.key = None  # Požadované pole, jehož hodnota přijde
+        self.depth = 0
+        self.item_depth = 0  # Hloubka objektů položek, určí ji první znak
+        self.expect_key = False
+        self.state = _BETWEEN
+        self.token = None
+        self.code = 0  # Rozpracovaný \uXXXX
+        self.code_left = 0
+        self.finished = False
+
+    async def parse(self, body):
+        """Čte tělo (BodyReader) po částech, dokud nemá vše potřebné."""
+        while not self.finished:
+            chunk = await body.read(_CHUNK)
+            if not chunk:
+                break
+            self.feed(chunk)
+        return self.items
+
+    def feed(self, chunk):
+        for c in chunk:
+            if self.finished:
+                return
+            state = self.state
+            if state == _STRING:
+                if c == 0x22:  # "
+                    self.state = _BETWEEN
+                    self.string_done()
+                elif c == 0x5c:  # \
+                    self.state = _ESCAPE
+                elif len(self.token) < self.max_string:
+                    self.token.append(c)
+                continue
+            if state == _ESCAPE:
+                if c == 0x75:  # u
+                    self.state = _UNICODE
+                    self.code = 0
+                    self.code_left = 4
+                else:
+                    self.state = _STRING
+                    if len(self.token) < self.max_string:
+                        self.token.append(_ESCAPES.get(c, c))
+                continue
+            if state == _UNICODE:
+                self.code = self.code * 16 + int(chr(c), 16)
+                self.code_left -= 1
+                if self.code_left == 0:
+                    self.state = _STRING
+                    if len(self.token) < self.max_string:
+                        self.token.extend(chr(self.code).encode())
+                continue
+            if state == _SCALAR:
+                if c not in (0x2c, 0x7d, 0x5d, 0x20, 0x0a, 0x0d, 0x09):
+                    self.token.append(c)
+                    continue
+                self.state = _BETWEEN
+                self.scalar_done()
+
+            # Mezi tokeny
+            if c == 0x22:
+                self.state = _STRING
+                self.token = bytearray()
+            elif c == 0x7b or c == 0x5b:  # { [
+                self.open(c)
+            elif c == 0x7d or c == 0x5d:  # } ]
+                self.close()
+            elif c == 0x3a:  # :
+                self.expect_key = False
+            elif c == 0x2c:  # ,
+                self.expect_key = self.depth == self.item_depth
+            elif c not in (0x20, 0x0a, 0x0d, 0x09):
+                self.state = _SCALAR
+                self.token = bytearray()
+                self.token.append(c)
+
+    def open(self, c):
+        self.depth += 1
+        if self.item_depth == 0:
+            self.item_depth = 2 if c == 0x5b else 1
+        if self.depth == self.item_depth and c == 0x7b:
+            self.item = {}
+            self.expect_key = True
+        elif self.depth == self.item_depth + 1:
+            self.key = None  # Vnořená hodnota se přeskočí
+
+    def close(self):
+        if self.depth == self.item_depth and self.item is not None:
+            self.items.append(self.item)
+            self.item = None
+            if self.limit and len(self.items) >= self.limit:
+                self.finished = True
+        self.depth -= 1
+        if self.depth <= 0:
+            self.finished = True
+
+    def string_done(self):
+        if self.depth != self.item_depth or self.item is None:
+            return
+        if self.expect_key:
+            key = _decode(self.token)
+            self.key = key if key in self.fields else None
+        elif self.key is not None:
+            self.item[self.key] = _decode(self.token)
+            self.key = None
+
+    def scalar_done(self):
+        if self.depth == self.item_depth and self.item is not None and self.key is not None:
+            self.item[self.key] = _scalar(self.token)
+            self.key = None
+
+
+def items(fields, limit=None):
+    """
+    Vrátí stream funkci pro HttpClient.request(), která z odpovědi vybere
+    pole fields z nejvýše limit položek.
+    """
+    async def parse(body):
+        return await ItemExtractor(fields, limit).parse(body)
+    return parse
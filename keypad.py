@@ -1,9 +1,26 @@
-from machine import Pin
+from machine import Pin, Timer
+from micropython import const
+import array
 import time
 
+# Druhy událostí ve frontě
+KEY_PRESS = const(1)
+KEY_RELEASE = const(2)
+KEY_HOLD = const(3)
+
+# Stavy automatu jedné klávesy
+_UP = const(0)
+_PRESSING = const(1)
+_DOWN = const(2)
+_RELEASING = const(3)
+
+_DEBOUNCE_SCANS = const(3)  # Počet shodných vzorků, než se změna uzná
+_HOLD_MS = const(800)  # Po jak dlouhé době držení přijde KEY_HOLD
+_QUEUE_SIZE = const(16)
+
 class Keypad:
-    def __init__(self):
-        self.rows = [Pin(26, Pin.OUT), Pin(27, Pin.OUT), Pin(14, Pin.OUT), Pin(12, Pin.OUT)]
+    def __init__(self, timer_id=0, period=5):
+        self.rows = [Pin(26, Pin.OUT, value=0), Pin(27, Pin.OUT, value=0), Pin(14, Pin.OUT, value=0), Pin(12, Pin.OUT, value=0)]
         self.cols = [Pin(25, Pin.IN, Pin.PULL_DOWN), Pin(33, Pin.IN, Pin.PULL_DOWN), Pin(32, Pin.IN, Pin.PULL_DOWN), Pin(15, Pin.IN, Pin.PULL_DOWN)]
 
         self.key_map = [
@@ -12,16 +29,111 @@ class Keypad:
             ['S9', 'S10', 'S11', 'S12'],
             ['S13', 'S14', 'S15', 'S16'],
         ]
+        self.keys = [key for row in self.key_map for key in row]
 
-    def scan(self):
+        # Stav každé klávesy (index = řádek * 4 + sloupec)
+        count = len(self.keys)
+        self.state = bytearray(count)
+        self.samples = bytearray(count)  # Počet shodných vzorků v přechodu
+        self.held = bytearray(count)  # Už byl pro stisk hlášen KEY_HOLD
+        self.pressed_at = array.array('L', [0] * count)
+
+        # Kruhová fronta událostí, plní ji poll() z přerušení časovače
+        self.event_kind = bytearray(_QUEUE_SIZE)
+        self.event_key = bytearray(_QUEUE_SIZE)
+        self.event_time = array.array('L', [0] * _QUEUE_SIZE)
+        self.head = 0  # Sem zapisuje poll()
+        self.tail = 0  # Odsud čte get_event()
+        self.dropped = 0  # Události zahozené kvůli plné frontě
+
+        self.timer = Timer(timer_id)
+        self.timer.init(period=period, mode=Timer.PERIODIC, callback=self.poll)
+
+    def poll(self, timer=None):
         """
-        Prohledává klávesnici a vrací stisknutou klávesu.
+        Jednou projde matici a posune automaty kláves. Volá ho časovač,
+        nesmí proto alokovat paměť.
         """
-        for row_idx, row_pin in enumerate(self.rows):
+        now = time.ticks_ms()
+        for row_idx in range(len(self.rows)):
+            row_pin = self.rows[row_idx]
             row_pin.value(1)  # Activate row
-            for col_idx, col_pin in enumerate(self.cols):
-                if col_pin.value() == 1:  # Detect press
-                    time.sleep(0.3)  # Debounce
-                    return self.key_map[row_idx][col_idx]
+            for col_idx in range(len(self.cols)):
+                self.update_key(row_idx * 4 + col_idx, self.cols[col_idx].value() == 1, now)
             row_pin.value(0)  # Deactivate row
-        return None
+
+    def update_key(self, index, down, now):
+        """Debounce automat jedné klávesy."""
+        state = self.state[index]
+        if state == _UP:
+            if down:
+                self.state[index] = _PRESSING
+                self.samples[index] = 1
+        elif state == _PRESSING:
+            if not down:
+                self.state[index] = _UP  # Zákmit, stisk se nekoná
+            elif self.samples[index] + 1 >= _DEBOUNCE_SCANS:
+                self.state[index] = _DOWN
+                self.held[index] = 0
+                self.pressed_at[index] = now
+                self.push(KEY_PRESS, index, now)
+            else:
+                self.samples[index] += 1
+        elif state == _DOWN:
+            if not down:
+                self.state[index] = _RELEASING
+                self.samples[index] = 1
+            elif not self.held[index] and time.ticks_diff(now, self.pressed_at[index]) >= _HOLD_MS:
+                self.held[index] = 1
+                self.push(KEY_HOLD, index, now)
+        elif state == _RELEASING:
+            if down:
+                self.state[index] = _DOWN  # Zákmit, klávesa je stále držená
+            elif self.samples[index] + 1 >= _DEBOUNCE_SCANS:
+                self.state[index] = _UP
+                self.push(KEY_RELEASE, index, now)
+            else:
+                self.samples[index] += 1
+
+    def push(self, kind, index, now):
+        """Zapíše událost do fronty, při plné frontě ji zahodí."""
+        head = (self.head + 1) % _QUEUE_SIZE
+        if head == self.tail:
+            self.dropped += 1
+            return
+        self.event_kind[self.head] = kind
+        self.event_key[self.head] = index
+        self.event_time[self.head] = now
+        self.head = head
+
+    def get_event(self):
+        """
+        Vrátí nejstarší událost jako (druh, klávesa, ticks_ms), nebo None,
+        pokud je fronta prázdná.
+        """
+        if self.tail == self.head:
+            return None
+        tail = self.tail
+        event = (self.event_kind[tail], self.keys[self.event_key[tail]], self.event_time[tail])
+        self.tail = (tail + 1) % _QUEUE_SIZE
+        return event
+
+    def scan(self):
+        """
+        Vrátí další stisknutou klávesu z fronty, nebo None. Neblokuje,
+        uvolnění a držení kláves přeskakuje.
+        """
+        while True:
+            event = self.get_event()
+            if event is None:
+                return None
+            if event[0] == KEY_PRESS:
+                return event[1]
+
+    def clear(self):
+        """Zahodí všechny čekající události."""
+        self.tail = self.head
+
+    def is_pressed(self, key):
+        """Vrátí True, pokud je klávesa právě (po debounce) stisknutá."""
+        return self.state[self.keys.index(key)] in (_DOWN, _RELEASING)
@@ -0,0 +1,43 @@
+import gc
+import sys
+import time
+
+class Loader:
+    """
+    Importuje moduly a zaznamenává, kolik který stál času a paměti
+    (včetně modulů, které sám importuje). Části hry, které potřebují síť,
+    se tak načtou až při prvním výběru z menu a po startu jde vypsat,
+    co zdržuje první snímek menu.
+    """
+
+    def __init__(self):
+        self.start = time.ticks_ms()
+        self.records = []  # (jméno, ms, bajty haldy), u značek bajty None
+
+    def load(self, name):
+        """Vrátí modul name, při prvním použití ho importuje a změří."""
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        gc.collect()
+        free = gc.mem_free()
+        start = time.ticks_ms()
+        module = __import__(name)
+        ms = time.ticks_diff(time.ticks_ms(), start)
+        gc.collect()
+        self.records.append((name, ms, free - gc.mem_free()))
+        return module
+
+    def mark(self, label):
+        """Zaznamená čas od vytvoření loaderu, např. první snímek menu."""
+        self.records.append((label, time.ticks_diff(time.ticks_ms(), self.start), None))
+
+    def report(self):
+        """Vypíše časy a paměť importů na sériovou linku."""
+        print("Start:")
+        for name, ms, used in self.records:
+            if used is None:
+                print(f"  {name}: {ms} ms od startu")
+            else:
+                print(f"  import {name}: {ms} ms, {used} B")
+        print("  volná halda:", gc.mem_free(), "B")
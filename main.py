@@ -1,59 +1,138 @@
-import network
-import time
-from keypad import Keypad
-from oled_display import OledDisplay
-from buzzer import Buzzer
-from game import Game
-from online_game import OnlineGame
-from high_score import HighScore
+from loader import Loader
+loader = Loader()  # Měří start od tohoto okamžiku
+
+from micropython import const
+Keypad = loader.load("keypad").Keypad
+OledDisplay = loader.load("oled_display").OledDisplay
+Buzzer = loader.load("buzzer").Buzzer
+Runtime = loader.load("runtime").Runtime
+WifiManager = loader.load("wifi_manager").WifiManager  # Připojuje se hned od startu
+Game = loader.load("game").Game
+Menu = loader.load("widgets").Menu
+# http_client a upload_queue se načtou po připojení Wi-Fi nebo při prvním
+# použití (get_network), online_game, high_score a response_cache až při
+# prvním výběru z menu
 
 # Config
 server_url = "https://zpi-server-cp4he1jgj-lukasbrylas-projects.vercel.app"
 ssid = "SigmaLigma"
 password = "lukas123"
+player_name = "ESP32"  # Jméno u skóre v žebříčku
+static_ip = None  # Např. ("192.168.1.50", "255.255.255.0", "192.168.1.1", "8.8.8.8")
+# Měření běhu, S13+S16 ukáže statistiky: None = vypnuto, 0 = zapnuto,
+# jiné číslo = navíc výpis na sériovou linku každých tolik ms
+metrics_dump_ms = None
+
+_MENU_POLL_MS = const(500)  # Jak často menu kontroluje stav Wi-Fi
 
 # Initialize components
 keypad = Keypad()
 display = OledDisplay()
 buzzer = Buzzer()
-high_score = HighScore(display, server_url)
+runtime = Runtime(display, keypad, buzzer)
+# Wi-Fi se připojuje na pozadí, menu je hned k dispozici
+wifi = WifiManager(ssid, password, static_ip)
+metrics = None
+if metrics_dump_ms is not None:
+    metrics = loader.load("metrics").Metrics(runtime, None, metrics_dump_ms).install()
 
+# Menu
+menu_items = ["New Game", "Online Game", "High Score"]
+online_items = ("Online Game", "High Score")  # Bez Wi-Fi nejdou vybrat
+menu = Menu(display, 0, len(menu_items))
 
-wlan = network.WLAN(network.STA_IF)
-wlan.active(True)
-wlan.connect(ssid, password)
+client = None
+uploads = None
+cache = None
+high_score = None
 
-# Čekání na připojení
-while not wlan.isconnected():
-    print("Připojuji k Wi-Fi...")
-    time.sleep(1)
-print("Připojeno!")
-print("IP adresa:", wlan.ifconfig()[0])
 
-# Menu
-menu_items = ["New Game", "Online Game", "High Score"]
-selected_index = 0
-wifi_connected = wlan.isconnected()
-
-# Hlavní smyčka
-while True:
-    # Zobraz menu
-    display.display_menu(menu_items, selected_index)
-
-    # Načti vstup z klávesnice
-    key = keypad.scan()
-    if key == "S1":  # Tlačítko pro posun nahoru
-        selected_index = (selected_index - 1) % len(menu_items)
-    elif key == "S2":  # Tlačítko pro posun dolů
-        selected_index = (selected_index + 1) % len(menu_items)
-    elif key == "S3":  # Tlačítko pro potvrzení
-        if menu_items[selected_index] == "New Game":
-            display.clear_screen()
-            game = Game(display, keypad, buzzer)  # Vytvoření nové instance hry
-            game.run()  # Spuštění hry
-        elif menu_items[selected_index] == "Online Game" and wifi_connected:
-            online_game_instance = OnlineGame(display, keypad, buzzer, server_url)
-            online_game_instance.run()
-        elif menu_items[selected_index] == "High Score":
-            high_score.display_high_scores()
-        
+def get_network():
+    """
+    Při prvním použití načte síťovou vrstvu: HTTP klienta a frontu
+    odesílání, kterou pak na pozadí posílá uploads.run(). Vrátí
+    (client, uploads).
+    """
+    global client, uploads
+    if uploads is None:
+        HttpClient = loader.load("http_client").HttpClient
+        UploadQueue = loader.load("upload_queue").UploadQueue
+        client = HttpClient(server_url)  # Jedno keep-alive spojení pro všechny požadavky
+        if metrics:
+            metrics.install_client(client)
+        # Výsledky a skóre čekají na flash, dokud je server nepřijme
+        uploads = UploadQueue(client, player=player_name)
+        runtime.spawn(uploads.run())
+    return client, uploads
+
+
+def get_uploads():
+    """Fronta odesílání, Game ji volá až pro skóre na konci hry."""
+    return get_network()[1]
+
+
+def get_cache():
+    """Vytvoří cache odpovědí při prvním použití."""
+    global cache
+    if cache is None:
+        ResponseCache = loader.load("response_cache").ResponseCache
+        # Žebříček se při opakovaném otevření bere z cache
+        (http, _) = get_network()
+        cache = ResponseCache(http, {"/api/highscores": 60000}, path="cache.json")
+    return cache
+
+
+def get_high_score():
+    global high_score
+    if high_score is None:
+        high_score = loader.load("high_score").HighScore(runtime, get_cache())
+    return high_score
+
+
+async def main():
+    runtime.spawn(wifi.run())
+    if metrics:
+        runtime.spawn(metrics.run())
+
+    selected_index = 0
+    display.clear_screen()
+    booted = False
+
+    # Hlavní smyčka
+    while True:
+        # Zobraz menu, překreslí se jen změněné řádky (výběr, stav spojení)
+        online = wifi.is_connected()
+        if online and uploads is None:
+            get_network()  # Odešle, co ve frontě zůstalo z minula
+        menu.set(menu_items, selected_index, () if online else online_items)
+        if not booted:
+            # První snímek menu, vypiš, co start stál
+            loader.mark("menu")
+            loader.report()
+            booted = True
+
+        # Počkej na vstup z klávesnice
+        key = await runtime.get_key(_MENU_POLL_MS)
+        if key is None:
+            continue
+        if key == "S1":  # Tlačítko pro posun nahoru
+            selected_index = (selected_index - 1) % len(menu_items)
+        elif key == "S2":  # Tlačítko pro posun dolů
+            selected_index = (selected_index + 1) % len(menu_items)
+        elif key == "S3":  # Tlačítko pro potvrzení
+            if menu_items[selected_index] == "New Game":
+                display.clear_screen()
+                # Síť se načte, až bude co odeslat (skóre na konci hry)
+                game = Game(runtime, get_uploads)  # Vytvoření nové instance hry
+                await game.run()  # Spuštění hry
+            elif menu_items[selected_index] == "Online Game" and online:
+                OnlineGame = loader.load("online_game").OnlineGame
+                (http, queue) = get_network()
+                online_game_instance = OnlineGame(runtime, http, queue)
+                await online_game_instance.run()
+            elif menu_items[selected_index] == "High Score" and online:
+                await get_high_score().display_high_scores()
+            display.clear_screen()  # Po návratu ze hry se menu nakreslí celé
+
+
+runtime.run(main())
@@ -0,0 +1,293 @@
+import array
+import gc
+import time
+import uasyncio as asyncio
+from micropython import const
+from keypad import KEY_PRESS, KEY_RELEASE
+
+_TICK_MS = const(10)  # Perioda vzorkovací úlohy, podle ní se měří zpoždění smyčky
+_OVERLAY_MS = const(500)  # Jak často se obnovuje stránka se statistikami
+_BUCKETS = const(12)  # Histogram po mocninách dvou: <=1, 2-3, 4-7 ... 2048+
+_CHORD = ("S13", "S16")  # Současný stisk otevře / zavře stránku se statistikami
+
+
+class Histogram:
+    """
+    Histogram hodnot (ms nebo us) v přihrádkách po mocninách dvou. Má
+    pevnou velikost a add() nealokuje, jde volat i v horkých cestách.
+    """
+
+    def __init__(self):
+        self.buckets = array.array('L', [0] * _BUCKETS)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        i = 0
+        v = value
+        while v > 1 and i < _BUCKETS - 1:
+            v >>= 1
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def avg(self):
+        return self.total // self.count if self.count else 0
+
+    def percentile(self, p):
+        """Horní mez přihrádky, do které spadá p procent hodnot."""
+        limit = self.count * p // 100
+        seen = 0
+        for i in range(_BUCKETS):
+            seen += self.buckets[i]
+            if seen > limit:
+                return min((1 << (i + 1)) - 1, self.max)
+        return self.max
+
+    def summary(self):
+        """Krátký zápis pro sériovou linku: počet/průměr/p95/max."""
+        return f"{self.count}/{self.avg()}/{self.percentile(95)}/{self.max}"
+
+
+class Metrics:
+    """
+    Volitelné měření běhu hry. install() obalí horké metody konkrétních
+    instancí (displej, klávesnice, bzučák, HTTP klient) počítadly, bez
+    něj nestojí měření nic. Úloha run() sleduje zpoždění smyčky a volnou
+    paměť, stiskem S13+S16 ukáže přes obrazovku stránku se statistikami
+    a každých dump_ms je vypíše na sériovou linku.
+    """
+
+    def __init__(self, runtime, client=None, dump_ms=0):
+        self.runtime = runtime
+        self.display = runtime.display
+        self.oled = runtime.display.oled
+        self.keypad = runtime.keypad
+        self.buzzer = runtime.buzzer
+        self.client = client
+        self.dump_ms = dump_ms  # 0 = výpis jen při otevření stránky
+
+        self.shows = 0
+        self.show_us = Histogram()  # Doba show() včetně přenosu
+        self.flushes = 0
+        self.texts = 0
+        self.scans = 0
+        self.tones = 0
+        self.key_ms = Histogram()  # Od stisku (poll) po vyzvednutí z fronty
+        self.http_ms = Histogram()
+        self.http_errors = 0
+        self.http_bytes = 0
+        self.lag_ms = Histogram()  # Zpoždění probuzení vzorkovací úlohy
+        self.mem_free = gc.mem_free()
+        self.mem_min = self.mem_free
+
+        # Hodnoty za poslední celou sekundu
+        self.fps = 0
+        self.loops = 0
+        self.bytes_per_s = 0
+        self.last = None  # (shows, probuzení, bytes_sent) na začátku sekundy
+
+        self.overlay = False
+        self.chord_press = None  # Odložený stisk první klávesy akordu
+        self.chord_down = False  # Akord je stisknutý, jeho události se zahazují
+        self.saved = bytearray(len(self.oled.renderbuf))
+
+    def install(self):
+        """Obalí měřené metody, vrátí self."""
+        oled = self.oled
+        show = oled.show
+
+        def timed_show(full_update=False):
+            start = time.ticks_us()
+            if self.overlay:
+                self.show_overlay(show)
+            else:
+                show(full_update)
+            self.shows += 1
+            self.show_us.add(time.ticks_diff(time.ticks_us(), start))
+
+        # Přenosy po sběrnici počítá ovladač sám (transactions), včetně
+        # write_window(), která jde přímo na writevto / spi.write
+        oled.show = timed_show
+
+        display = self.display
+        flush = display.flush
+        display_text = display.display_text
+
+        def counted_flush():
+            self.flushes += 1
+            flush()
+
+        def counted_text(text, x=0, y=0):
+            self.texts += 1
+            display_text(text, x, y)
+
+        display.flush = counted_flush
+        display.display_text = counted_text
+
+        keypad = self.keypad
+        get_event = keypad.get_event
+        scan = keypad.scan
+
+        def timed_event():
+            while True:
+                event = get_event()
+                if event is not None and event[1] in _CHORD:
+                    event = self.chord_event(event)
+                    if event is False:
+                        continue
+                if event is not None:
+                    self.key_ms.add(time.ticks_diff(time.ticks_ms(), event[2]))
+                return event
+
+        def counted_scan():
+            self.scans += 1
+            return scan()
+
+        keypad.get_event = timed_event
+        keypad.scan = counted_scan
+
+        # Přes start_tone jdou tóny sekvenceru i blokujícího play_tone()
+        buzzer = self.buzzer
+        start_tone = buzzer.start_tone
+
+        def counted_tone(frequency):
+            self.tones += 1
+            start_tone(frequency)
+
+        buzzer.start_tone = counted_tone
+
+        if self.client is not None:
+            self.install_client(self.client)
+        return self
+
+    def install_client(self, client):
+        """Obalí HttpClient.request, i klienta vytvořeného až po install()."""
+        self.client = client
+        request = client.request
+
+        async def timed_request(method, path, **kwargs):
+            start = time.ticks_ms()
+            try:
+                response = await request(method, path, **kwargs)
+            except Exception:
+                self.http_errors += 1
+                raise
+            finally:
+                self.http_ms.add(time.ticks_diff(time.ticks_ms(), start))
+            # Streamovaná těla se nenačítají, u nich platí Content-Length
+            content = response.content
+            self.http_bytes += len(content) if content else int(response.headers.get("content-length", 0))
+            return response
+
+        client.request = timed_request
+
+    async def run(self):
+        """Vzorkovací úloha, spouští se přes runtime.spawn()."""
+        keypad = self.keypad
+        wakeups = 0
+        second = dump = overlay_at = time.ticks_ms()
+        chord = False
+        self.last = (self.shows, 0, self.oled.bytes_sent)
+        while True:
+            expected = time.ticks_add(time.ticks_ms(), _TICK_MS)
+            await asyncio.sleep_ms(_TICK_MS)
+            now = time.ticks_ms()
+            self.lag_ms.add(max(0, time.ticks_diff(now, expected)))
+            wakeups += 1
+            free = gc.mem_free()
+            self.mem_free = free
+            if free < self.mem_min:
+                self.mem_min = free
+
+            if time.ticks_diff(now, second) >= 1000:
+                second = now
+                (shows, loops, sent) = self.last
+                self.fps = self.shows - shows
+                self.loops = wakeups - loops
+                self.bytes_per_s = self.oled.bytes_sent - sent
+                self.last = (self.shows, wakeups, self.oled.bytes_sent)
+
+            pressed = keypad.is_pressed(_CHORD[0]) and keypad.is_pressed(_CHORD[1])
+            if pressed and not chord:
+                self.toggle()
+                overlay_at = now
+            chord = pressed
+            if self.overlay and time.ticks_diff(now, overlay_at) >= _OVERLAY_MS:
+                overlay_at = now
+                self.display.flush()
+            if self.dump_ms and time.ticks_diff(now, dump) >= self.dump_ms:
+                dump = now
+                self.dump()
+
+    def chord_event(self, event):
+        """
+        Filtr událostí kláves akordu: stisk první klávesy se odloží, dokud
+        se nepustí (pak se předá hře), nebo nepřijde druhá klávesa (pak je
+        to akord a hra nedostane nic). Vrátí událost k předání, nebo False.
+        """
+        kind = event[0]
+        if kind == KEY_PRESS:
+            if self.chord_press is None and not self.chord_down:
+                self.chord_press = event
+            else:
+                self.chord_press = None
+                self.chord_down = True
+        elif kind == KEY_RELEASE:
+            if self.chord_down:
+                keypad = self.keypad
+                self.chord_down = keypad.is_pressed(_CHORD[0]) or keypad.is_pressed(_CHORD[1])
+            elif self.chord_press is not None:
+                event = self.chord_press
+                self.chord_press = None
+                return event
+        return False
+
+    def toggle(self):
+        """Otevře nebo zavře stránku se statistikami."""
+        self.overlay = not self.overlay
+        if self.overlay:
+            self.dump()
+            self.display.flush()
+        else:
+            self.oled.show(True)  # Vrátí na displej obsah hry
+
+    def show_overlay(self, show):
+        # Hra kreslí dál do bufferu, stránka se do něj nakreslí jen na
+        # dobu přenosu a pak se obsah hry vrátí
+        oled = self.oled
+        buf = oled.renderbuf
+        self.saved[:] = buf
+        oled.fill(0)
+        for i, line in enumerate(self.lines()):
+            oled.text(line, 0, i * 8)
+        show()
+        buf[:] = self.saved
+
+    def lines(self):
+        """Řádky stránky se statistikami, nejvýše 16 znaků."""
+        client = self.client
+        return (
+            f"fps {self.fps} lp {self.loops}",
+            f"show {self.show_us.avg() // 1000}/{self.show_us.max // 1000}ms",
+            f"bus {self.bytes_per_s}B/s",
+            f"key {self.key_ms.percentile(95)}/{self.key_ms.max}ms",
+            f"lag {self.lag_ms.percentile(95)}/{self.lag_ms.max}ms",
+            f"http {self.http_ms.count} e{self.http_errors}",
+            f"net {self.http_ms.avg()}/{self.http_ms.max}ms" if client else "net -",
+            f"mem {self.mem_free // 1024}/{self.mem_min // 1024}k",
+        )
+
+    def dump(self):
+        """Vypíše statistiky na sériovou linku jako krátké řádky klíč=hodnota."""
+        oled = self.oled
+        keypad = self.keypad
+        print(f"M disp fps={self.fps} show={self.show_us.summary()}us bytes={oled.bytes_sent} "
+              f"tx={oled.transactions} flush={self.flushes} text={self.texts}")
+        print(f"M key lat={self.key_ms.summary()}ms drop={keypad.dropped} scan={self.scans} tone={self.tones}")
+        print(f"M http lat={self.http_ms.summary()}ms err={self.http_errors} in={self.http_bytes}")
+        print(f"M sys loop={self.loops}/s lag={self.lag_ms.summary()}ms mem={self.mem_free} min={self.mem_min}")
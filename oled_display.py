@@ -1,69 +1,116 @@
 from machine import Pin, I2C
 from sh1106 import SH1106_I2C
+import sprites
 
 class OledDisplay:
     def __init__(self):
         self.i2c = I2C(0, scl=Pin(22), sda=Pin(21))
-        self.oled = SH1106_I2C(128, 64, self.i2c)
+        self.oled = SH1106_I2C(128, 64, self.i2c, diff=True)
+        self.frame_depth = 0  # Počet otevřených frame() bloků
+        self.flush_request = None  # Událost pro display_task běhového prostředí
+        self.clears = 0  # Počet vymazání displeje, podle něj widgety poznají cizí kreslení
+
+    def frame(self):
+        """
+        Dávka vykreslování: uvnitř `with display.frame():` se displej
+        neobnovuje, show() proběhne jen jednou na konci bloku.
+        """
+        return self
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.commit()
+
+    def begin(self):
+        """Zahájí dávku, další volání flush() se odloží."""
+        self.frame_depth += 1
+
+    def commit(self):
+        """Ukončí dávku a po uzavření poslední obnoví displej."""
+        self.frame_depth -= 1
+        self.flush()
+
+    def flush(self):
+        """
+        Pošle změny na displej, pokud neběží žádná dávka. Pod běhovým
+        prostředím jen požádá display_task o obnovu.
+        """
+        if self.frame_depth == 0:
+            if self.flush_request is not None:
+                self.flush_request.set()
+            else:
+                self.oled.show()
 
     def display_text(self, text, x=0, y=0):
         self.oled.text(text, x, y)
-        self.oled.show()
+        self.flush()
 
     def clear_screen(self):
         self.oled.fill(0)
-        self.oled.show()
+        self.oled.set_start_line(0)  # Zruší posun ScrollList
+        self.clears += 1
+        self.flush()
         
     def clear_area(self, x, y, width, height):
-        for i in range(x, x + width):
-            for j in range(y, y + height):
-                self.oled.pixel(i, j, 0)  # Nastav pixel na černou
-        self.oled.show()
-        
+        self.oled.fill_rect(x, y, width, height, 0)  # Vyplň oblast černou
+        self.flush()
+
+    def invert_area(self, x, y, width, height):
+        """Invertuje barvy v oblasti (např. zvýraznění vybrané položky)."""
+        self.oled.invert_rect(x, y, width, height)
+        self.flush()
+
+    def copy_area(self, x, y, width, height, dst_x, dst_y):
+        """Zkopíruje obsah oblasti na pozici (dst_x, dst_y)."""
+        self.oled.copy_rect(x, y, width, height, dst_x, dst_y)
+        self.flush()
+
+    def scroll_area(self, x, y, width, height, dx, dy):
+        """Posune obsah oblasti o (dx, dy), uvolněné místo vymaže."""
+        self.oled.scroll_rect(x, y, width, height, dx, dy)
+        self.flush()
+
 
     def text(self, text, x, y, color=1):
         """Zobrazí text s danou barvou (1 = svítí, 0 = nesvítí)."""
         if color == 0:
             self.oled.fill_rect(x, y, len(text) * 8, 10, 0)  # Vymaž místo pro text
         self.oled.text(text, x, y, color)
-        self.oled.show()
-        
-    def display_menu(self, menu_items, selected_index):
-        """
-        Zobrazuje menu na OLED displeji.
-        """
-        self.oled.fill(0)  # Vyčistí obrazovku
-        for i, item in enumerate(menu_items):
-            if i == selected_index:
-                self.oled.text("> " + item, 0, i * 10)  # Označení vybraného
-            else:
-                self.oled.text(item, 10, i * 10)
-        self.oled.show()
+        self.flush()
         
+    def hline(self, x, y, width, color=1):
+        self.oled.hline(x, y, width, color)
+        self.flush()
+
     def highlight_sequence(self, user_sequence, correct_sequence, color):
         """
         Zvýrazní sekvenci na displeji. Správné zeleně, špatné červeně.
         """
         x_pos = 0
         y_pos = 20
-        for i, user_key in enumerate(user_sequence):
-            correct = (user_key == correct_sequence[i])
-            self.text(f"S{user_key}", x_pos, y_pos, color=1 if correct else 0)  # Zelená nebo červená
-            x_pos += 16
-            if x_pos > 128:
-                x_pos = 0
-                y_pos += 10
+        with self.frame():
+            for i, user_key in enumerate(user_sequence):
+                correct = (user_key == correct_sequence[i])
+                self.text(f"S{user_key}", x_pos, y_pos, color=1 if correct else 0)  # Zelená nebo červená
+                x_pos += 16
+                if x_pos > 128:
+                    x_pos = 0
+                    y_pos += 10
         
+    def sprite(self, sprite, x, y, invert=False):
+        """
+        Nakreslí sprite z modulu sprites jedním blitem, s invert=True
+        s prohozenými barvami.
+        """
+        self.oled.blit(sprite, x, y, -1, self.oled.invert_palette if invert else None)
+        self.flush()
+
     def draw_heart(self, x, y):
         """
         Nakreslí jednoduché srdíčko na displej.
         """
-        self.oled.pixel(x, y, 1)
-        self.oled.pixel(x + 1, y - 1, 1)
-        self.oled.pixel(x + 2, y - 1, 1)
-        self.oled.pixel(x + 3, y, 1)
-        self.oled.pixel(x + 3, y + 1, 1)
-        self.oled.pixel(x + 2, y + 2, 1)
-        self.oled.pixel(x + 1, y + 2, 1)
-        self.oled.pixel(x, y + 1, 1)
+        self.sprite(sprites.HEART, x, y - 1)
 
@@ -1,171 +1,192 @@
-import urequests  # Import pro HTTP požadavky (MicroPython knihovna)
-import time
+import uasyncio as asyncio
+from micropython import const
+from http_client import HttpError
+from tone_wire import ToneError
+from game_session import GameSession
+from game_list import GameList
+from upload_queue import RESULT
+from widgets import ScrollList
+import sprites
+
+_KEY_POLL_MS = const(200)  # Jak často se při čekání na kolo nebo stránku her kontroluje klávesnice
 
 
 class OnlineGame:
-    def __init__(self, display, keypad, buzzer, server_url):
-        self.display = display
-        self.keypad = keypad
-        self.buzzer = buzzer
-        self.server_url = server_url
+    def __init__(self, runtime, client, uploads):
+        self.runtime = runtime
+        self.display = runtime.display
+        self.buzzer = runtime.buzzer
+        self.client = client  # Sdílený HttpClient serveru
+        self.uploads = uploads  # UploadQueue, výsledek se neztratí ani bez spojení
         self.running = True
         self.selected_game_id = None
+        self.session = None  # GameSession vybrané hry
 
-    def handle_error(self, message):
+    async def handle_error(self, message):
         """Obecná metoda pro zobrazení chybového hlášení."""
-        self.display.clear_screen()
-        self.display.display_text(message, 0, 20)
-        time.sleep(2)
-
-    def get_in_progress_games(self):
-        """Načte seznam probíhajících her z API."""
+        with self.display.frame():
+            self.display.clear_screen()
+            self.display.display_text(message, 0, 20)
+        await asyncio.sleep(2)
+
+    async def select_game(self):
+        """
+        Zobrazí dostupné hry a umožní uživateli vybrat jednu z nich:
+        S1/S2 posouvá výběr, S3 vybere (na neúspěšně stažené stránce ji
+        zkusí stáhnout znovu), S4 zpět do menu. Seznam se stahuje
+        po stránkách podle toho, kam hráč posouvá.
+        """
+        games = GameList(self.client)
         try:
-            response = urequests.get(f"{self.server_url}/api/games/in-progress")
-            if response.status_code == 200:
-                games = response.json()
-                response.close()
-                return games
-            else:
-                self.handle_error("Server Error")
+            first_page = await games.load(0)
+        except HttpError:
+            await self.handle_error("Server Error")
+            return None
         except Exception as e:
             print("Chyba při připojení k serveru:", e)
-            self.handle_error("Connection Error")
-        return []
-
-    def select_game(self):
-        """Zobrazí dostupné hry a umožní uživateli vybrat jednu z nich."""
-        games = self.get_in_progress_games()
-        if not games:
-            self.handle_error("No games found")
+            await self.handle_error("Connection Error")
+            return None
+        if not first_page:
+            await self.handle_error("No games found")
             return None
 
-        self.display.clear_screen()
-        self.display.display_text("Select a game:", 0, 0)
-
-        for i, game in enumerate(games):
-            self.display.display_text(f"{i+1}: {game['nickname']}", 0, 10 + (i * 10))
-
-        self.display.display_text("Press key to select", 0, 50)
-        self.display.oled.show()
+        view = ScrollList(self.display)
+        view.set(games, 0)
 
         while True:
-            key = self.keypad.scan()  # Načte hodnotu z klávesnice
-            if key and key.startswith("S"):  # Zkontroluje, zda je to klávesa "Sx"
-                try:
-                    key_index = int(key[1:])  # Získá číslo za "S"
-                    if 1 <= key_index <= len(games):  # Ověří platnost
-                        selected_game = games[key_index - 1]
-                        self.selected_game_id = selected_game["_id"]
-                        self.display.clear_screen()
-                        self.display.display_text(f"Selected: {selected_game['nickname']}", 0, 40)
-                        time.sleep(2)
-                        return selected_game
-                    else:
-                        self.handle_error("Invalid key")  # Neplatná volba
-                except ValueError:
-                    self.handle_error("Invalid input")  # Nesprávný vstup
-            time.sleep(0.1)  # Zabraňuje zahlcení smyčky
-
-    def get_sequence_from_server(self):
-        """Načte sekvenci od serveru pro vybranou hru."""
-        if not self.selected_game_id:
+            games.window(view.top, view.rows)
+            key = await self.runtime.get_key(_KEY_POLL_MS)  # Mezitím může přijít stránka
+            if games.changed:
+                games.changed = False
+                view.refresh()
+            if key == "S1":
+                view.select(view.selected - 1)
+            elif key == "S2":
+                view.select(view.selected + 1)
+            elif key == "S3":
+                selected_game = games.game(view.selected)
+                if selected_game is None:
+                    games.retry(view.selected)  # Stránka se stahuje, nebo selhala
+                    continue
+                self.selected_game_id = selected_game["_id"]
+                self.session = GameSession(self.client, self.selected_game_id, self.buzzer.tones)
+                with self.display.frame():
+                    self.display.clear_screen()
+                    self.display.display_text(f"Selected: {selected_game['nickname']}", 0, 40)
+                await asyncio.sleep(2)
+                return selected_game
+            elif key == "S4":
+                return None
+
+    async def get_sequence_from_server(self):
+        """
+        Načte sekvenci (indexy tónů) od serveru pro vybranou hru. Sekvenci
+        nového kola obvykle už přinesl long-poll, pak se na server nechodí.
+        """
+        if not self.session:
             return []
 
         try:
-            response = urequests.get(f"{self.server_url}/api/game?id={self.selected_game_id}")
-            if response.status_code == 200:
-                data = response.json()
-                sequence = data.get("sequence", [])
-                response.close()
-                return sequence
-            else:
-                self.handle_error("Server Error")
+            return await self.session.take_sequence()
+        except HttpError:
+            await self.handle_error("Server Error")
+        except ToneError as e:
+            print("Sekvenci nejde zahrát:", e)
+            await self.handle_error("Bad sequence")
         except Exception as e:
             print("Chyba při připojení k serveru:", e)
-            self.handle_error("Connection Error")
+            await self.handle_error("Connection Error")
         return []
 
-    def send_result_to_server(self, user_input_frequencies):
-        """Odešle uživatelský vstup (frekvence) na server."""
-        if not self.selected_game_id:
+    async def send_result_to_server(self, user_input):
+        """
+        Odešle uživatelský vstup (indexy tónů) na server. Výsledek se nejdřív
+        zapíše do fronty (jako frekvence), při chybě spojení nebo serveru
+        (5xx) ho pošle fronta později, odmítnutý (4xx) odloží stranou.
+        """
+        if not self.session:
             return
 
+        frequencies = [self.buzzer.tones[i] for i in user_input]
+        seq = self.uploads.append(RESULT, [self.selected_game_id, frequencies], hold=True)
         try:
-            response = urequests.post(
-                f"{self.server_url}/api/game/update",
-                json={"id": self.selected_game_id, "espData": user_input_frequencies},
-            )
-            if response.status_code == 200:
-                self.display.display_text("Result sent!", 0, 40)
+            await self.session.submit(user_input)
+            self.uploads.ack(seq)
+            self.display.display_text("Result sent!", 0, 40)
+        except HttpError as e:
+            if e.status_code >= 500:
+                self.uploads.release(seq)  # Chyba serveru je dočasná, pošle se znovu
+                self.display.display_text("Saved, sending later", 0, 40)
             else:
+                self.uploads.reject(seq, e.status_code)  # Opakování nepomůže
                 self.display.display_text("Error sending result", 0, 40)
-            response.close()
         except Exception as e:
             print("Chyba při odesílání výsledků:", e)
-            self.display.display_text("Send Error", 0, 40)
-        time.sleep(2)
-
-    def play_sequence(self, sequence):
-        """Přehraje sekvenci tónů."""
-        self.display.clear_screen()
-        self.display.display_text("Playing...", 0, 0)
-        self.buzzer.play_sequence(sequence)
+            self.uploads.release(seq)
+            self.display.display_text("Saved, sending later", 0, 40)
+        await asyncio.sleep(2)
+
+    async def play_sequence(self, sequence):
+        """Přehraje sekvenci tónů zadanou indexy."""
+        with self.display.frame():
+            self.display.clear_screen()
+            self.display.display_text("Playing...", 0, 0)
+            self.display.sprite(sprites.NOTE, 120, 0)
+            self.display.display_text("S4: skip", 0, 10)
+        self.runtime.clear_keys()  # Staré stisky se nepočítají
+        tones = self.buzzer.tones
+        await self.runtime.play([tones[i] for i in sequence])  # Stisk klávesy přehrávání ukončí
         self.display.clear_screen()
 
-    def get_user_input(self, sequence_length):
-        """Získá vstup uživatele přes klávesnici."""
+    async def get_user_input(self, sequence_length):
+        """Získá vstup uživatele přes klávesnici jako indexy tónů."""
         user_input = []
         self.display.display_text("Enter sequence:", 0, 0)
 
         while len(user_input) < sequence_length:
-            key = self.keypad.scan()
+            key = await self.runtime.get_key()
             if key and key.startswith("S"):  # Ověří platnost klávesy
                 try:
                     key_index = int(key[1:])
                     if 5 <= key_index <= 11:  # Platné klávesy
-                        user_input.append(key_index - 4)  # Např. S5 → 1
+                        user_input.append(key_index - 5)  # Např. S5 → tón 0
                         self.display.display_text(f"{len(user_input)}/{sequence_length}", 0, 10)
                     else:
-                        self.handle_error("Invalid key")
+                        await self.handle_error("Invalid key")
                 except ValueError:
-                    self.handle_error("Invalid input")
+                    await self.handle_error("Invalid input")
         return user_input
     
-    def check_game_status(self):
-        """Kontroluje stav hry na serveru."""
+    async def wait_for_round(self):
+        """
+        Čeká, až server spustí nové kolo nebo ukončí hru, a vrátí dokument
+        hry. Vrátí None, pokud hráč čekání ukončí klávesou S2.
+        """
+        task = self.runtime.spawn(self.next_round())
         try:
-            response = urequests.get(f"{self.server_url}/api/game?id={self.selected_game_id}")
-            if response.status_code == 200:
-                data = response.json()
-                completed = data.get("completed", False)
-                game_state = data.get("gameState", "")
-                new_sequence = data.get("sequence", [])
-                return completed, game_state, new_sequence
-            else:
-                self.display.display_text("Server error", 0, 40)
-                time.sleep(2)
-        except Exception as e:
-            print("Chyba při připojení k serveru:", e)
-            self.display.display_text("Connection Error", 0, 40)
-            time.sleep(2)
-        return True, "game_over", []
-
-    def check_game_over(self):
-        """Zkontroluje, zda hra neskončila."""
-        try:
-            response = urequests.get(f"{self.server_url}/api/game/status?id={self.selected_game_id}")
-            if response.status_code == 200:
-                status = response.json().get("status", "in-progress")
-                return status == "finished"
-        except Exception as e:
-            self.handle_error("Connection Error")
-        return False
+            while not task.done():
+                key = await self.runtime.get_key(_KEY_POLL_MS)
+                if key == "S2":
+                    return None
+            return await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def next_round(self):
+        """Odebírá změny hry, dokud kolo neskončí."""
+        while True:
+            try:
+                return await self.session.next_round()
+            except Exception as e:
+                print("Chyba při čekání na kolo:", e)
+                await asyncio.sleep(2)
 
-    def run(self):
+    async def run(self):
         """Hlavní smyčka online hry."""
         self.display.clear_screen()
         print("Starting Online Game...")
-        selected_game = self.select_game()
+        selected_game = await self.select_game()
         if not selected_game:
             print("No game selected, exiting Online Game.")
             self.running = False
@@ -173,40 +194,35 @@ class OnlineGame:
 
         while self.running:
             print("Fetching sequence from server...")
-            sequence = self.get_sequence_from_server()
+            sequence = await self.get_sequence_from_server()
             if not sequence:
                 print("No sequence received, exiting Online Game.")
                 break
 
-            self.play_sequence(sequence)
+            await self.play_sequence(sequence)
             print("Playing sequence completed.")
 
             print("Getting user input...")
-            user_input_keys = self.get_user_input(len(sequence))
-            user_input_frequencies = [self.buzzer.tones[key - 5] for key in user_input_keys]
+            user_input = await self.get_user_input(len(sequence))
 
             print("Sending result to server...")
-            self.send_result_to_server(user_input_frequencies)
+            await self.send_result_to_server(user_input)
 
-            # Čekej na nové kolo nebo konec hry
-            while True:
+            # Čekej na nové kolo nebo konec hry, server se ozve sám
+            with self.display.frame():
                 self.display.clear_screen()
                 self.display.display_text("Waiting for new round", 0, 0)
-                self.display.display_text("Press 1 to check status", 0, 10)
-                self.display.oled.show()
-
-                key = self.keypad.scan()
-                if key == "S1":  # Kontrola stavu hry
-                    print("Checking game status...")
-                    completed, game_state, new_sequence = self.check_game_status()
-
-                    if game_state == "game_over":
-                        self.display.clear_screen()
-                        self.display.display_text("Game Over", 0, 0)
-                        time.sleep(2)
-                        self.running = False
-                        break
-                    elif not completed:  # Pokud server umožní nové kolo
-                        print("New round starts...")
-                        sequence = new_sequence
-                        break
+                self.display.display_text("S2: leave game", 0, 10)
+
+            data = await self.wait_for_round()
+            if data is None:
+                print("Player left the game.")
+                self.running = False
+            elif self.session.is_over():
+                with self.display.frame():
+                    self.display.clear_screen()
+                    self.display.display_text("Game Over", 0, 0)
+                await asyncio.sleep(2)
+                self.running = False
+            else:
+                print("New round starts...")
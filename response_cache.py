@@ -0,0 +1,142 @@
+import uasyncio as asyncio
+from micropython import const
+import json
+import time
+from http_client import HttpError
+
+_DEFAULT_TTL_MS = const(30000)
+_MAX_ENTRIES = const(8)
+
+# Položky záznamu v cache
+_FETCHED = const(0)  # ticks_ms posledního ověření u serveru
+_ETAG = const(1)
+_LAST_MODIFIED = const(2)
+_VALUE = const(3)
+
+class ResponseCache:
+    """
+    Malá cache odpovědí GET v RAM, klíčem je cesta endpointu. Čerstvá data
+    (mladší než TTL endpointu) vrací bez dotazu na server. Prošlá data vrátí
+    hned a na pozadí je ověří podmíněným požadavkem (If-None-Match /
+    If-Modified-Since); když se nic nezměnilo, server pošle jen 304 bez těla.
+    Volitelně se ukládá do souboru, aby přežila restart.
+    """
+
+    def __init__(self, client, ttls=None, max_entries=_MAX_ENTRIES, path=None):
+        self.client = client
+        self.ttls = ttls or {}  # Prefix cesty -> TTL v ms
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = {}  # Cesta -> [fetched, etag, last_modified, value]
+        self.lru = []  # Cesty od nejdéle nepoužité
+        self.refreshing = {}  # Cesta -> běžící úloha ověření
+
+        # Statistiky
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.not_modified = 0
+
+        if path:
+            self.load()
+
+    def ttl(self, path):
+        for prefix in self.ttls:
+            if path.startswith(prefix):
+                return self.ttls[prefix]
+        return _DEFAULT_TTL_MS
+
+    async def get(self, path, stream=None):
+        """
+        Vrátí data endpointu. stream (viz HttpClient.request) převede tělo
+        odpovědi na uloženou hodnotu, bez něj se uloží response.json().
+        Při chybě serveru vyhodí HttpError, při chybě spojení OSError.
+        """
+        entry = self.entries.get(path)
+        if entry is None:
+            self.misses += 1
+            return await self.refresh(path, stream)
+
+        self.touch(path)
+        if entry[_FETCHED] is not None and time.ticks_diff(time.ticks_ms(), entry[_FETCHED]) < self.ttl(path):
+            self.hits += 1
+        else:
+            # Prošlá data hned vrátíme, ověří se na pozadí
+            self.stale += 1
+            if path not in self.refreshing:
+                self.refreshing[path] = asyncio.create_task(self.revalidate(path, stream))
+        return entry[_VALUE]
+
+    async def revalidate(self, path, stream):
+        try:
+            await self.refresh(path, stream)
+        except Exception as e:
+            print("Ověření cache selhalo:", path, e)
+        finally:
+            del self.refreshing[path]
+
+    async def refresh(self, path, stream=None):
+        """Stáhne nebo podmíněně ověří endpoint a uloží výsledek."""
+        entry = self.entries.get(path)
+        headers = {}
+        if entry is not None:
+            if entry[_ETAG]:
+                headers["If-None-Match"] = entry[_ETAG]
+            if entry[_LAST_MODIFIED]:
+                headers["If-Modified-Since"] = entry[_LAST_MODIFIED]
+
+        response = await self.client.get(path, headers=headers, stream=stream)
+        if response.status_code == 304 and entry is not None:
+            self.not_modified += 1
+            entry[_FETCHED] = time.ticks_ms()
+            return entry[_VALUE]
+        if response.status_code != 200:
+            raise HttpError(response.status_code)
+
+        value = response.data if stream else response.json()
+        self.store(path, [time.ticks_ms(), response.headers.get("etag"),
+                          response.headers.get("last-modified"), value])
+        return value
+
+    def store(self, path, entry):
+        if path not in self.entries and len(self.entries) >= self.max_entries:
+            del self.entries[self.lru.pop(0)]
+        self.entries[path] = entry
+        self.touch(path)
+        if self.path:
+            self.save()
+
+    def touch(self, path):
+        if path in self.lru:
+            self.lru.remove(path)
+        self.lru.append(path)
+
+    def invalidate(self, path):
+        """Zapomene endpoint, další get() půjde na server."""
+        if path in self.entries:
+            del self.entries[path]
+            self.lru.remove(path)
+
+    def save(self):
+        """Uloží cache do souboru. Časy se neukládají, po načtení je vše prošlé."""
+        data = {}
+        for path in self.lru:
+            entry = self.entries[path]
+            data[path] = [entry[_ETAG], entry[_LAST_MODIFIED], entry[_VALUE]]
+        try:
+            with open(self.path, "w") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print("Cache nelze uložit:", e)
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for path in data:
+            etag, last_modified, value = data[path]
+            if len(self.entries) < self.max_entries:
+                self.entries[path] = [None, etag, last_modified, value]
+                self.lru.append(path)
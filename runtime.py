@@ -0,0 +1,103 @@
+import uasyncio as asyncio
+from micropython import const
+from keypad import KEY_PRESS
+
+_INPUT_POLL_MS = const(10)  # Jak často se vybírá fronta klávesnice
+_FRAME_MS = const(33)  # Nejkratší doba mezi obnovami displeje (~30 fps)
+_KEY_BUFFER = const(8)  # Kolik nepřečtených stisků se drží
+
+class Runtime:
+    """
+    Kooperativní běhové prostředí. Vstup a obnova displeje běží jako
+    samostatné úlohy, zvuk přehrává sekvencer bzučáku řízený časovačem,
+    hra je posloupnost korutin, které na ně jen čekají. Síťové požadavky
+    se spouštějí jako další úlohy přes spawn().
+    """
+
+    def __init__(self, display, keypad, buzzer):
+        self.display = display
+        self.keypad = keypad
+        self.buzzer = buzzer
+        self.keys = []  # Stisknuté klávesy, které ještě nikdo nepřečetl
+        self.key_ready = asyncio.Event()
+        self.tasks = []
+        # Displej místo okamžitého show() jen požádá display_task
+        display.flush_request = asyncio.Event()
+
+    def start(self):
+        """Spustí úlohy běhového prostředí."""
+        self.tasks = [
+            asyncio.create_task(self.input_task()),
+            asyncio.create_task(self.display_task()),
+        ]
+
+    def run(self, coro):
+        """Spustí úlohy a korutinu coro, dokud neskončí."""
+        async def main():
+            self.start()
+            await coro
+
+        asyncio.run(main())
+
+    def spawn(self, coro):
+        """Spustí korutinu (typicky síťový požadavek) jako samostatnou úlohu."""
+        return asyncio.create_task(coro)
+
+    async def input_task(self):
+        """Přesouvá stisky z fronty klávesnice k čekajícím korutinám."""
+        while True:
+            event = self.keypad.get_event()
+            if event is None:
+                await asyncio.sleep_ms(_INPUT_POLL_MS)
+            elif event[0] == KEY_PRESS:
+                if len(self.keys) >= _KEY_BUFFER:
+                    self.keys.pop(0)
+                self.keys.append(event[1])
+                self.key_ready.set()
+
+    async def display_task(self):
+        """Obnovuje displej, když o to někdo požádal, nejvýše jednou za snímek."""
+        display = self.display
+        while True:
+            await display.flush_request.wait()
+            display.flush_request.clear()
+            if display.frame_depth == 0:
+                display.oled.show()
+            await asyncio.sleep_ms(_FRAME_MS)
+
+    async def play(self, sequence, skip_key="S4"):
+        """
+        Přehraje sekvenci na pozadí a počká na její konec. Stisk klávesy
+        přehrávání ukončí: skip_key se zahodí, ostatní klávesy zůstanou ve
+        frontě jako začátek vstupu. Vrátí True, pokud sekvence dohrála celá.
+        """
+        buzzer = self.buzzer
+        buzzer.play_sequence(sequence)
+        while buzzer.playing and not self.keys:
+            await asyncio.sleep_ms(_INPUT_POLL_MS)
+        completed = not buzzer.playing
+        buzzer.cancel()
+        if self.keys and self.keys[0] == skip_key:
+            self.keys.pop(0)
+        return completed
+
+    async def get_key(self, timeout_ms=None):
+        """
+        Počká na stisk klávesy a vrátí ji. Pokud je zadán timeout_ms a nic
+        nepřijde, vrátí None.
+        """
+        while not self.keys:
+            self.key_ready.clear()
+            try:
+                if timeout_ms is None:
+                    await self.key_ready.wait()
+                else:
+                    await asyncio.wait_for_ms(self.key_ready.wait(), timeout_ms)
+            except asyncio.TimeoutError:
+                return None
+        return self.keys.pop(0)
+
+    def clear_keys(self):
+        """Zahodí stisky, které zatím nikdo nepřečetl."""
+        self.keypad.clear()
+        self.keys.clear()
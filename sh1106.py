@@ -72,6 +72,7 @@
 # display.show()
 
 from micropython import const
+import micropython
 import utime as time
 import framebuf
 
@@ -85,11 +86,39 @@ _SET_SEG_REMAP       = const(0xa0)
 _LOW_COLUMN_ADDRESS  = const(0x00)
 _HIGH_COLUMN_ADDRESS = const(0x10)
 _SET_PAGE_ADDRESS    = const(0xB0)
+_SET_START_LINE      = const(0x40)
+
+# The SH1106 RAM is 132 columns wide, 128 column panels start at column 2.
+_COLUMN_OFFSET       = const(2)
+# In diff mode, runs of changed columns separated by at most this many
+# unchanged bytes are sent as one run: re-addressing the column costs
+# three command transfers, which is more than resending a few bytes.
+_DIFF_MERGE_GAP      = const(8)
+# Cached memoryviews of partial windows. The same runs (a counter, a
+# cursor) come back frame after frame; the cache is dropped when full.
+_WINDOW_VIEWS        = const(32)
+
+
+@micropython.native
+def _transpose_rows(db, rb, w, p, r0, r1):
+    # Copy the HMSB render buffer rows r0 up to (excluding) r1 into the
+    # VLSB display buffer. Row r becomes column r, byte b of the row goes
+    # to page b. Returns a bit mask of the pages that actually changed.
+    changed = 0
+    for r in range(r0, r1):
+        i = p * r
+        for b in range(p):
+            v = rb[i + b]
+            j = w * b + r
+            if db[j] != v:
+                db[j] = v
+                changed |= 1 << b
+    return changed
 
 
 class SH1106(framebuf.FrameBuffer):
 
-    def __init__(self, width, height, external_vcc, rotate=0):
+    def __init__(self, width, height, external_vcc, rotate=0, diff=False):
         self.width = width
         self.height = height
         self.external_vcc = external_vcc
@@ -99,6 +128,20 @@ class SH1106(framebuf.FrameBuffer):
         self.bufsize = self.pages * self.width
         self.renderbuf = bytearray(self.bufsize)
         self.pages_to_update = 0
+        # rotate90: render buffer rows (= display columns) changed since
+        # the last show(), empty if rows_y0 > rows_y1
+        self.rows_y0 = 0
+        self.rows_y1 = -1
+        # diff mode: keep a copy of what was last sent to the panel and
+        # only transfer the column runs that differ from it.
+        self.diff = diff
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+        # bus transfers in total and during the last show()
+        self.transactions = 0
+        self.frame_transactions = 0
+        # hardware vertical scroll, the panel row shown at the top
+        self.start_line = 0
 
         if self.rotate90:
             self.displaybuf = bytearray(self.bufsize)
@@ -111,6 +154,18 @@ class SH1106(framebuf.FrameBuffer):
             self.displaybuf = self.renderbuf
             super().__init__(self.renderbuf, self.width, self.height,
                              framebuf.MONO_VLSB)
+        self.shadowbuf = bytearray(self.bufsize) if diff else None
+        # memoryviews let the bus drivers send parts of the display
+        # buffer without copying them
+        self.dbview = memoryview(self.displaybuf)
+        self.pageviews = [self.dbview[self.width * page:self.width * (page + 1)]
+                          for page in range(self.pages)]
+        self.windowviews = {}
+
+        # blit() palette mapping 0 -> 1 and 1 -> 0, used by invert_rect()
+        self.invert_palette = framebuf.FrameBuffer(bytearray(2), 2, 1,
+                                                   framebuf.MONO_VLSB)
+        self.invert_palette.pixel(0, 0, 1)
 
         # flip() was called rotate() once, provide backwards compatibility.
         self.rotate = self.flip
@@ -118,8 +173,11 @@ class SH1106(framebuf.FrameBuffer):
 
     def init_display(self):
         self.reset()
+        self.write_cmd(_SET_START_LINE | self.start_line)
+        self.start_line_sent = self.start_line
         self.fill(0)
-        self.show()
+        # the panel RAM content is unknown after reset, bypass the diff
+        self.show(True)
         self.poweron()
         # rotate90 requires a call to flip() for setting up.
         self.flip(self.flip_en)
@@ -153,33 +211,114 @@ class SH1106(framebuf.FrameBuffer):
     def invert(self, invert):
         self.write_cmd(_SET_NORM_INV | (invert & 1))
 
+    def set_start_line(self, line):
+        # Hardware vertical scroll: the top row of the screen shows buffer
+        # row 'line', the rows below it follow and wrap around. It takes
+        # effect at the next show(), after the pages drawn meanwhile are
+        # sent, so no frame shows new content at the old position.
+        # The panel scrolls along its own rows, i.e. horizontally when
+        # rotated by 90 degrees.
+        self.start_line = line % self.height
+
     def show(self, full_update = False):
         # self.* lookups in loops take significant time (~4fps).
         (w, p, db, rb) = (self.width, self.pages,
                           self.displaybuf, self.renderbuf)
         if self.rotate90:
-            for i in range(self.bufsize):
-                db[w * (i % p) + (i // p)] = rb[i]
-        if full_update:
-            pages_to_update = (1 << self.pages) - 1
+            # only transpose the rows drawn to, the pages to send are
+            # the ones whose bytes changed in the process
+            if full_update:
+                (r0, r1) = (0, w - 1)
+            else:
+                (r0, r1) = (self.rows_y0, self.rows_y1)
+            pages_to_update = 0
+            if r0 <= r1:
+                pages_to_update = _transpose_rows(db, rb, w, p, r0, r1 + 1)
+            (self.rows_y0, self.rows_y1) = (0, -1)
         else:
             pages_to_update = self.pages_to_update
+        if full_update:
+            pages_to_update = (1 << self.pages) - 1
         #print("Updating pages: {:08b}".format(pages_to_update))
+        sb = self.shadowbuf
+        transactions = self.transactions
         for page in range(self.pages):
             if (pages_to_update & (1 << page)):
-                self.write_cmd(_SET_PAGE_ADDRESS | page)
-                self.write_cmd(_LOW_COLUMN_ADDRESS | 2)
-                self.write_cmd(_HIGH_COLUMN_ADDRESS | 0)
-                self.write_data(db[(w*page):(w*page+w)])
+                if sb is None or full_update:
+                    self.write_page(page, 0, w)
+                    if sb is not None:
+                        # assigning from the page memoryview copies
+                        # without a temporary bytearray
+                        sb[w * page:w * (page + 1)] = self.pageviews[page]
+                else:
+                    self.write_page_diff(page)
         self.pages_to_update = 0
+        if self.start_line != self.start_line_sent:
+            self.write_cmd(_SET_START_LINE | self.start_line)
+            self.start_line_sent = self.start_line
+        self.frame_transactions = self.transactions - transactions
+
+    def write_page(self, page, x0, x1):
+        # send columns x0 up to (excluding) x1 of a page to the panel
+        start = self.width * page
+        self.write_window(page, x0 + _COLUMN_OFFSET, start + x0, start + x1)
+        self.bytes_sent += x1 - x0
+
+    def write_window(self, page, col, start, end):
+        # address page and column, then send displaybuf[start:end].
+        # Bus drivers may override this with a single transfer.
+        self.write_cmd(_SET_PAGE_ADDRESS | page)
+        self.write_cmd(_LOW_COLUMN_ADDRESS | (col & 0x0f))
+        self.write_cmd(_HIGH_COLUMN_ADDRESS | (col >> 4))
+        self.write_data(self.displaybuf[start:end])
+
+    def window_view(self, start, end):
+        # memoryview of displaybuf[start:end] for the bus drivers; full
+        # pages use pageviews, partial windows are cached, so a steady
+        # diff update does not allocate a new view per run and frame
+        if end - start == self.width:
+            return self.pageviews[start // self.width]
+        key = start << 16 | end
+        view = self.windowviews.get(key)
+        if view is None:
+            if len(self.windowviews) >= _WINDOW_VIEWS:
+                self.windowviews.clear()
+            view = self.windowviews[key] = self.dbview[start:end]
+        return view
+
+    def write_page_diff(self, page):
+        # compare a page with the shadow buffer and send the changed runs.
+        # Changed bytes are copied to the shadow buffer as they are found,
+        # the others are equal already, so a frame allocates nothing.
+        (w, db, sb) = (self.width, self.displaybuf, self.shadowbuf)
+        start = w * page
+        sent = 0
+        x = 0
+        while x < w:
+            if db[start + x] == sb[start + x]:
+                x += 1
+                continue
+            sb[start + x] = db[start + x]
+            x0 = last = x
+            x += 1
+            while x < w and x - last <= _DIFF_MERGE_GAP:
+                if db[start + x] != sb[start + x]:
+                    sb[start + x] = db[start + x]
+                    last = x
+                x += 1
+            self.write_page(page, x0, last + 1)
+            sent += last + 1 - x0
+        self.bytes_saved += w - sent
 
     def pixel(self, x, y, color=None):
         if color is None:
             return super().pixel(x, y)
         else:
             super().pixel(x, y , color)
-            page = y // 8
-            self.pages_to_update |= 1 << page
+            if self.rotate90:
+                self.register_updates(y)
+            else:
+                self.pages_to_update |= 1 << (y // 8)
 
     def text(self, text, x, y, color=1):
         super().text(text, x, y, color)
@@ -199,16 +338,22 @@ class SH1106(framebuf.FrameBuffer):
 
     def fill(self, color):
         super().fill(color)
-        self.pages_to_update = (1 << self.pages) - 1
+        self.register_all()
 
     def blit(self, fbuf, x, y, key=-1, palette=None):
         super().blit(fbuf, x, y, key, palette)
-        self.register_updates(y, y+self.height)
+        # the (buffer, width, height, format) tuple form tells the sprite
+        # height, a FrameBuffer does not, so assume it reaches the last
+        # row of the render buffer (which has width rows when rotated)
+        if isinstance(fbuf, tuple):
+            self.register_updates(y, y+fbuf[2]-1)
+        else:
+            self.register_updates(y, (self.width if self.rotate90 else self.height) - 1)
 
     def scroll(self, x, y):
         # my understanding is that scroll() does a full screen change
         super().scroll(x, y)
-        self.pages_to_update =  (1 << self.pages) - 1
+        self.register_all()
 
     def fill_rect(self, x, y, w, h, color):
         super().fill_rect(x, y, w, h, color)
@@ -218,10 +363,57 @@ class SH1106(framebuf.FrameBuffer):
         super().rect(x, y, w, h, color)
         self.register_updates(y, y+h-1)
 
+    def region(self, x, y, w, h):
+        # return a copy of a region as a frame buffer in the same format
+        if self.rotate90:
+            fbuf = framebuf.FrameBuffer(bytearray(((w + 7) // 8) * h), w, h,
+                                        framebuf.MONO_HMSB)
+        else:
+            fbuf = framebuf.FrameBuffer(bytearray(w * ((h + 7) // 8)), w, h,
+                                        framebuf.MONO_VLSB)
+        fbuf.blit(self, -x, -y)
+        return fbuf
+
+    def invert_rect(self, x, y, w, h):
+        super().blit(self.region(x, y, w, h), x, y, -1, self.invert_palette)
+        self.register_updates(y, y+h-1)
+
+    def copy_rect(self, x, y, w, h, dst_x, dst_y):
+        super().blit(self.region(x, y, w, h), dst_x, dst_y)
+        self.register_updates(dst_y, dst_y+h-1)
+
+    def scroll_rect(self, x, y, w, h, dx, dy, color=0):
+        # like scroll(), but limited to a region; the area uncovered
+        # by the move is filled with color
+        (sw, sh) = (w - abs(dx), h - abs(dy))
+        if sw > 0 and sh > 0:
+            (sx, sy) = (x - min(dx, 0), y - min(dy, 0))
+            fbuf = self.region(sx, sy, sw, sh)
+            super().fill_rect(x, y, w, h, color)
+            super().blit(fbuf, sx + dx, sy + dy)
+        else:
+            super().fill_rect(x, y, w, h, color)
+        self.register_updates(y, y+h-1)
+
     def register_updates(self, y0, y1=None):
         # this function takes the top and optional bottom address of the changes made
         # and updates the pages_to_change list with any changed pages
         # that are not yet on the list
+        if self.rotate90:
+            # y addresses render buffer rows here, which map to display
+            # columns; show() finds the changed pages while transposing
+            if y1 is None:
+                y1 = y0
+            if y0 > y1:
+                y0, y1 = y1, y0
+            y0 = max(0, y0)
+            y1 = min(self.width - 1, y1)
+            if self.rows_y0 > self.rows_y1:
+                (self.rows_y0, self.rows_y1) = (y0, y1)
+            else:
+                self.rows_y0 = min(self.rows_y0, y0)
+                self.rows_y1 = max(self.rows_y1, y1)
+            return
         start_page = max(0, y0 // 8)
         end_page = max(0, y1 // 8) if y1 is not None else start_page
         # rearrange start_page and end_page if coordinates were given from bottom to top
@@ -230,6 +422,10 @@ class SH1106(framebuf.FrameBuffer):
         for page in range(start_page, end_page+1):
             self.pages_to_update |= 1 << page
 
+    def register_all(self):
+        self.pages_to_update = (1 << self.pages) - 1
+        (self.rows_y0, self.rows_y1) = (0, self.width - 1)
+
     def reset(self, res):
         if res is not None:
             res(1)
@@ -242,23 +438,41 @@ class SH1106(framebuf.FrameBuffer):
 
 class SH1106_I2C(SH1106):
     def __init__(self, width, height, i2c, res=None, addr=0x3c,
-                 rotate=0, external_vcc=False, delay=0):
+                 rotate=0, external_vcc=False, delay=0, diff=False):
         self.i2c = i2c
         self.addr = addr
         self.res = res
         self.temp = bytearray(2)
+        # Co=1 control bytes for page and column address followed by the
+        # Co=0 data control byte; write_window() fills in the commands and
+        # sends it together with the page data in one transaction.
+        self.window = bytearray(b'\x80\xb0\x80\x00\x80\x10\x40')
+        self.windowvec = [self.window, None]
+        self.datavec = [b'\x40', None]
         self.delay = delay
         if res is not None:
             res.init(res.OUT, value=1)
-        super().__init__(width, height, external_vcc, rotate)
+        super().__init__(width, height, external_vcc, rotate, diff)
 
     def write_cmd(self, cmd):
         self.temp[0] = 0x80  # Co=1, D/C#=0
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
+        self.transactions += 1
 
     def write_data(self, buf):
-        self.i2c.writeto(self.addr, b'\x40'+buf)
+        self.datavec[1] = buf
+        self.i2c.writevto(self.addr, self.datavec)
+        self.transactions += 1
+
+    def write_window(self, page, col, start, end):
+        w = self.window
+        w[1] = _SET_PAGE_ADDRESS | page
+        w[3] = _LOW_COLUMN_ADDRESS | (col & 0x0f)
+        w[5] = _HIGH_COLUMN_ADDRESS | (col >> 4)
+        self.windowvec[1] = self.window_view(start, end)
+        self.i2c.writevto(self.addr, self.windowvec)
+        self.transactions += 1
 
     def reset(self):
         super().reset(self.res)
@@ -266,7 +480,8 @@ class SH1106_I2C(SH1106):
 
 class SH1106_SPI(SH1106):
     def __init__(self, width, height, spi, dc, res=None, cs=None,
-                 rotate=0, external_vcc=False, delay=0):
+                 rotate=0, external_vcc=False, delay=0, diff=False,
+                 baudrate=None, full_baudrate=None):
         dc.init(dc.OUT, value=0)
         if res is not None:
             res.init(res.OUT, value=0)
@@ -277,18 +492,42 @@ class SH1106_SPI(SH1106):
         self.res = res
         self.cs = cs
         self.delay = delay
-        super().__init__(width, height, external_vcc, rotate)
+        # preallocated command buffers, show() must not allocate:
+        # one command, and the page/column address burst that
+        # write_window() fills in
+        self.cmdbuf = bytearray(1)
+        self.window = bytearray(3)
+        # optional: full updates at full_baudrate, e.g. above the 4 MHz of
+        # the datasheet, which most modules handle; commands and partial
+        # updates stay at baudrate, the rate the spi object was set up with
+        if full_baudrate is not None and baudrate is None:
+            raise ValueError("full_baudrate needs baudrate to switch back")
+        self.baudrate = baudrate
+        self.full_baudrate = full_baudrate
+        super().__init__(width, height, external_vcc, rotate, diff)
+
+    def show(self, full_update=False):
+        fast = full_update and self.full_baudrate is not None
+        if fast:
+            self.spi.init(baudrate=self.full_baudrate)
+        try:
+            super().show(full_update)
+        finally:
+            if fast:
+                self.spi.init(baudrate=self.baudrate)
 
     def write_cmd(self, cmd):
+        self.cmdbuf[0] = cmd
         if self.cs is not None:
             self.cs(1)
             self.dc(0)
             self.cs(0)
-            self.spi.write(bytearray([cmd]))
+            self.spi.write(self.cmdbuf)
             self.cs(1)
         else:
             self.dc(0)
-            self.spi.write(bytearray([cmd]))
+            self.spi.write(self.cmdbuf)
+        self.transactions += 1
 
     def write_data(self, buf):
         if self.cs is not None:
@@ -300,6 +539,29 @@ class SH1106_SPI(SH1106):
         else:
             self.dc(1)
             self.spi.write(buf)
+        self.transactions += 1
+
+    def write_window(self, page, col, start, end):
+        # the three address commands as one burst, then the data,
+        # all within a single CS cycle
+        w = self.window
+        w[0] = _SET_PAGE_ADDRESS | page
+        w[1] = _LOW_COLUMN_ADDRESS | (col & 0x0f)
+        w[2] = _HIGH_COLUMN_ADDRESS | (col >> 4)
+        data = self.window_view(start, end)
+        cs = self.cs
+        if cs is not None:
+            cs(1)
+            self.dc(0)
+            cs(0)
+        else:
+            self.dc(0)
+        self.spi.write(w)
+        self.dc(1)
+        self.spi.write(data)
+        if cs is not None:
+            cs(1)
+        self.transactions += 1
 
     def reset(self):
         super().reset(self.res)
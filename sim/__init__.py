@@ -0,0 +1,25 @@
+"""
+Simulátor zařízení pro CPython: hra běží na počítači beze změn kódu,
+ve virtuálním čase, takže celá hra trvá milisekundy.
+
+Náhradní moduly machine, framebuf, network, micropython, uasyncio
+a utime nainstaluje Board. Displej je panel SH1106 v paměti, který
+dekóduje bajty z I2C do obrazu, klávesnice matice kláves mačkaná podle
+scénáře, bzučák záznam PWM, Wi-Fi virtuální přístupové body a server
+tools/stub_server.py běží v paměti za uasyncio.open_connection.
+
+    from sim import Board
+
+    with Board() as board:
+        board.run_main(1000)            # Start a první snímek menu
+        board.press("S3")               # New Game
+        board.advance(5000)
+        print(board.screen())
+        print(board.tones(), board.stats())
+
+Z příkazové řádky: python -m sim --keys "1000:S3" --until 20000
+"""
+from sim.board import Board
+from sim.clock import Clock, Deadlock, TimeUp
+
+__all__ = ["Board", "Clock", "Deadlock", "TimeUp"]
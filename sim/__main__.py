@@ -0,0 +1,47 @@
+"""
+Spuštění main.py v simulátoru.
+
+    python -m sim [--until 30000] [--keys "1000:S3 2500:S5 2800:S6"] [--screen]
+
+--keys naplánuje stisky jako "čas_ms:klávesa", --screen na konci vypíše
+displej, --pbm ho uloží jako obrázek. Vypíše statistiky běhu.
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from sim.board import Board
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--until", type=int, default=10000, help="virtuální ms běhu")
+    parser.add_argument("--keys", default="", help='stisky "ms:klávesa ms:klávesa"')
+    parser.add_argument("--workdir", help="adresář s flash (uploads.log, wifi.json)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--screen", action="store_true", help="vypsat displej na konci")
+    parser.add_argument("--pbm", help="uložit displej na konci jako PBM")
+    parser.add_argument("-q", "--quiet", action="store_true", help="nevypisovat výstup aplikace")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    output = io.StringIO()
+    with Board(workdir=args.workdir, seed=args.seed) as board:
+        for item in args.keys.split():
+            ms, _, key = item.partition(":")
+            board.keypad.press(key, at_ms=int(ms))
+        with contextlib.redirect_stdout(output) if args.quiet else contextlib.nullcontext():
+            board.run_main(args.until)
+        if args.screen:
+            print(board.screen())
+        if args.pbm:
+            board.panel.save_pbm(args.pbm)
+        stats = board.stats()
+    stats["real_ms"] = round((time.perf_counter() - start) * 1000)
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
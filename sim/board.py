@@ -0,0 +1,178 @@
+"""
+Deska simulátoru: nainstaluje náhradní moduly (machine, framebuf,
+network, micropython, uasyncio, utime), propojí panel displeje,
+matici kláves, Wi-Fi a herní server a spouští aplikaci ve virtuálním
+čase po úsecích, mezi kterými jde mačkat klávesy a kontrolovat displej.
+"""
+import os
+import random
+import runpy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sim import clock as _clock
+from sim import framebuf, http, machine, micropython, network, uasyncio
+from sim.keypad import KeypadMatrix
+from sim.panel import Panel
+from sim.server import GameServer
+
+APP_DIR = Path(__file__).resolve().parent.parent
+_OLED_ADDR = 0x3c
+_BUZZER_PIN = 13
+_STEP_MS = 10  # Krok run_until()
+
+
+class Board:
+    """
+    Simulované zařízení. workdir je "flash" (uploads.log, wifi.json,
+    cache.json), stejný workdir pro další Board simuluje restart.
+    Bez workdir se použije dočasný adresář. bus_timing=False vypne
+    modelování doby přenosu po I2C/SPI.
+    """
+
+    def __init__(self, app_dir=APP_DIR, workdir=None, seed=0, server=None,
+                 ticks_offset_ms=0, bus_timing=True):
+        self.app_dir = Path(app_dir).resolve()
+        self.clock = _clock.Clock(ticks_offset_ms)
+        self.patch = _clock.install(self.clock)
+        self.saved_modules = {}
+        for name, module in (("machine", machine), ("framebuf", framebuf), ("network", network),
+                             ("micropython", micropython), ("uasyncio", uasyncio), ("utime", time)):
+            self.saved_modules[name] = sys.modules.get(name)
+            sys.modules[name] = module
+        machine.reset()
+        machine.bus_timing = bus_timing
+        network.reset()
+        http.reset()
+        random.seed(seed)
+
+        self.panel = Panel()
+        machine.i2c_bus(0).devices[_OLED_ADDR] = self.panel
+        self.keypad = KeypadMatrix(self.clock)
+        self.air = network.air
+        self.loop = uasyncio.get_loop()
+        self.server = server or GameServer()
+        http.servers["*"] = self.server
+        self.task = None
+
+        self.tempdir = None
+        if workdir is None:
+            self.tempdir = tempfile.TemporaryDirectory(prefix="sim-")
+            workdir = self.tempdir.name
+        self.workdir = Path(workdir)
+        self.cwd = os.getcwd()
+        os.chdir(self.workdir)
+        if str(self.app_dir) not in sys.path:
+            sys.path.insert(0, str(self.app_dir))
+        self.forget_app()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Ukončí simulaci a vrátí moduly, hodiny a pracovní adresář."""
+        uasyncio.close_loop()
+        self.forget_app()
+        for name, module in self.saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        self.patch.restore()
+        os.chdir(self.cwd)
+        if self.tempdir is not None:
+            self.tempdir.cleanup()
+
+    def forget_app(self):
+        """Zapomene importované moduly aplikace, další import je načte znovu."""
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if path and Path(path).resolve().parent == self.app_dir:
+                del sys.modules[name]
+
+    # Běh
+
+    def run_main(self, ms=0):
+        """
+        Spustí main.py jako po zapnutí zařízení a nechá ho běžet ms
+        virtuálního času, dál pokračuje advance().
+        """
+        self.clock.limit_us = self.clock.now_us + round(ms * 1000)
+        try:
+            runpy.run_path(str(self.app_dir / "main.py"), run_name="__main__")
+        except _clock.TimeUp:
+            pass
+        self.task = uasyncio.main_task
+
+    def start(self, coro, ms=0):
+        """Spustí korutinu coro (např. Game(...).run()) jako hlavní úlohu."""
+        self.task = self.loop.create_task(coro)
+        return self.advance(ms)
+
+    def advance(self, ms):
+        """
+        Nechá simulaci běžet ms virtuálního času. Vrátí výsledek hlavní
+        úlohy, pokud mezitím skončila, výjimku z ní vyhodí.
+        """
+        clock = self.clock
+        clock.limit_us = clock.now_us + round(ms * 1000)
+        if self.task is None or self.task.done():
+            clock.run_until(clock.limit_us)
+        else:
+            try:
+                self.loop.run_until_complete(self.task)
+            except _clock.TimeUp:
+                pass
+        if self.task is not None and self.task.done():
+            return self.task.result()
+        return None
+
+    def run_until(self, predicate, timeout_ms=10000, step_ms=_STEP_MS):
+        """
+        Běží po krocích step_ms, dokud predicate() nevrátí pravdu, nejdéle
+        timeout_ms. Vrátí, zda podmínka nastala.
+        """
+        end_us = self.clock.now_us + timeout_ms * 1000
+        while not predicate():
+            if self.clock.now_us >= end_us or (self.task is not None and self.task.done()):
+                return bool(predicate())
+            self.advance(step_ms)
+        return True
+
+    def wait_text(self, text, timeout_ms=10000):
+        """Počká, až se text objeví na displeji."""
+        return self.run_until(lambda: self.panel.find_text(text) is not None, timeout_ms)
+
+    def press(self, key, hold_ms=80, settle_ms=100):
+        """Stiskne klávesu a nechá běžet, dokud ji aplikace nezpracuje."""
+        self.keypad.press(key, hold_ms=hold_ms)
+        self.advance(hold_ms + settle_ms)
+
+    # Výsledky
+
+    def tones(self):
+        """Tóny zahrané bzučákem: seznam (začátek ms, frekvence, délka ms)."""
+        channel = machine.pwm_channels.get(_BUZZER_PIN)
+        return channel.tones() if channel else []
+
+    def screen(self):
+        return self.panel.ascii()
+
+    def stats(self):
+        i2c = machine.i2c_bus(0)
+        return {
+            "ms": self.clock.ms(),
+            "i2c_transactions": i2c.transactions,
+            "i2c_bytes": i2c.bytes,
+            "panel_commands": self.panel.commands,
+            "panel_data_bytes": self.panel.data_bytes,
+            "http_connections": self.server.connections,
+            "http_requests": self.server.requests(),
+            "tones": len(self.tones()),
+            "key_presses": self.keypad.presses,
+        }
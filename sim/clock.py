@@ -0,0 +1,186 @@
+"""
+Virtuální hodiny simulátoru. Čas běží jen tehdy, když na něco čeká
+aplikace (time.sleep, uasyncio, přenos po sběrnici), a skočí rovnou na
+další událost, takže minuta hry trvá na počítači milisekundy. Stejné
+hodiny pohánějí časovače machine.Timer, připojování Wi-Fi i zpoždění
+HTTP serveru.
+"""
+import gc
+import heapq
+import math
+import sys
+import time
+
+_TICKS_PERIOD = 1 << 30  # Jako MicroPython: ticks_ms/ticks_us přetékají po 2**30
+_TICKS_MAX = _TICKS_PERIOD - 1
+_TICKS_HALF = _TICKS_PERIOD // 2
+
+_current = None
+
+
+def current():
+    """Vrátí hodiny právě běžící simulace."""
+    if _current is None:
+        raise RuntimeError("Simulátor neběží, vytvořte sim.Board()")
+    return _current
+
+
+class TimeUp(BaseException):
+    """
+    Virtuální čas došel k limitu Clock.limit_us. Dědí z BaseException,
+    aby ho nezachytilo `except Exception` v aplikaci.
+    """
+
+
+class Deadlock(RuntimeError):
+    """Všechny úlohy čekají a žádná událost je nemůže probudit."""
+
+
+class Clock:
+    """
+    Čas v mikrosekundách od startu simulace a fronta naplánovaných
+    událostí (časovače, stisky kláves, dokončení připojení).
+    ticks_offset_ms posune ticks_ms, např. těsně před přetečení.
+    """
+
+    def __init__(self, ticks_offset_ms=0):
+        self.now_us = 0
+        self.limit_us = None  # Nad tento čas simulace nepokračuje (TimeUp)
+        self.ticks_offset_ms = ticks_offset_ms
+        self.queue = []  # Halda (čas, pořadí, událost)
+        self.seq = 0
+        self.fired = 0  # Počet vykonaných událostí
+
+    def ms(self):
+        """Virtuální čas v ms (float) pro výpisy a záznamy."""
+        return self.now_us / 1000
+
+    # Náhrady funkcí modulu utime
+
+    def ticks_ms(self):
+        return (self.now_us // 1000 + self.ticks_offset_ms) & _TICKS_MAX
+
+    def ticks_us(self):
+        return (self.now_us + self.ticks_offset_ms * 1000) & _TICKS_MAX
+
+    def ticks_cpu(self):
+        return self.ticks_us()
+
+    @staticmethod
+    def ticks_add(ticks, delta):
+        return (ticks + delta) & _TICKS_MAX
+
+    @staticmethod
+    def ticks_diff(end, start):
+        return ((end - start + _TICKS_HALF) & _TICKS_MAX) - _TICKS_HALF
+
+    def sleep(self, seconds):
+        self.sleep_us(math.ceil(seconds * 1000000))
+
+    def sleep_ms(self, ms):
+        self.sleep_us(ms * 1000)
+
+    def sleep_us(self, us):
+        """
+        Blokující čekání: posune čas a cestou vykoná události, stejně
+        jako na zařízení během time.sleep běží přerušení časovačů.
+        """
+        if us > 0:
+            self.run_until(self.now_us + us)
+
+    # Plánování událostí
+
+    def schedule(self, at_us, callback, period_us=0):
+        """
+        Naplánuje callback() na čas at_us, s period_us > 0 opakovaně.
+        Vrátí událost, kterou jde zrušit přes cancel().
+        """
+        event = [at_us, callback, period_us, True]
+        self.seq += 1
+        heapq.heappush(self.queue, (at_us, self.seq, event))
+        return event
+
+    def call_later(self, ms, callback):
+        return self.schedule(self.now_us + round(ms * 1000), callback)
+
+    @staticmethod
+    def cancel(event):
+        if event is not None:
+            event[3] = False
+
+    def next_deadline(self):
+        queue = self.queue
+        while queue and not queue[0][2][3]:
+            heapq.heappop(queue)  # Zrušené události
+        return queue[0][0] if queue else None
+
+    def run_until(self, target_us, stop=None):
+        """
+        Posouvá čas k target_us a vykonává události v pořadí. Skončí dřív,
+        pokud stop() po některé události vrátí True. target_us=math.inf
+        čeká na první takovou událost.
+        """
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > target_us:
+                if target_us == math.inf:
+                    raise Deadlock("Všechny úlohy čekají a nic je neprobudí")
+                self.now_us = max(self.now_us, target_us)
+                return
+            self.now_us = max(self.now_us, deadline)
+            _, _, event = heapq.heappop(self.queue)
+            if event[2]:
+                # Periodická událost se plánuje od původního termínu, bez driftu
+                event[0] += event[2]
+                self.seq += 1
+                heapq.heappush(self.queue, (event[0], self.seq, event))
+            else:
+                event[3] = False
+            self.fired += 1
+            event[1]()
+            if stop is not None and stop():
+                return
+
+
+_TIME_NAMES = ("ticks_ms", "ticks_us", "ticks_cpu", "ticks_add", "ticks_diff",
+               "sleep", "sleep_ms", "sleep_us")
+
+
+class _Patch:
+    """Nahrazené atributy modulů, restore() vrátí původní stav."""
+
+    def __init__(self):
+        self.saved = []
+
+    def set(self, obj, name, value):
+        self.saved.append((obj, name, getattr(obj, name, _MISSING)))
+        setattr(obj, name, value)
+
+    def restore(self):
+        for obj, name, value in reversed(self.saved):
+            if value is _MISSING:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, value)
+        self.saved = []
+
+
+_MISSING = object()
+
+
+def install(clock, heap_bytes=110000):
+    """
+    Nastaví clock jako hodiny simulace: modul time dostane funkce utime
+    nad virtuálním časem (sleep nečeká doopravdy), utime je alias time
+    a gc dostane mem_free/mem_alloc s haldou velikosti heap_bytes.
+    Vrátí objekt, jehož restore() vše vrátí.
+    """
+    patch = _Patch()
+    for name in _TIME_NAMES:
+        patch.set(time, name, getattr(clock, name))
+    patch.set(sys.modules[__name__], "_current", clock)
+    patch.set(gc, "mem_alloc", lambda: 0)
+    patch.set(gc, "mem_free", lambda: heap_bytes)
+    if not hasattr(gc, "threshold"):
+        patch.set(gc, "threshold", lambda amount=None: -1)
+    return patch
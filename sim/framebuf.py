@@ -0,0 +1,170 @@
+"""
+Náhrada modulu framebuf v čistém Pythonu. Podporuje jednobitové
+formáty (MONO_VLSB, MONO_HLSB, MONO_HMSB), které používá hra a driver
+SH1106, včetně blit() s n-ticí (buffer, šířka, výška, formát) a paletou.
+Text se kreslí fontem 5x7 v buňce 8x8, stejně širokým jako vestavěný
+font MicroPythonu; tvary písmen se od něj mírně liší.
+"""
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+MVLSB = MONO_VLSB
+RGB565 = 1
+GS2_HMSB = 5
+GS4_HMSB = 2
+GS8 = 6
+
+# Znaky 32..126 po pěti sloupcích, bit 0 nahoře
+_FONT = bytes.fromhex(
+    "0000000000" "00005f0000" "0007000700" "147f147f14" "242a7f2a12" "2313086462"
+    "3649552250" "0005030000" "001c224100" "0041221c00" "082a1c2a08" "08083e0808"
+    "0050300000" "0808080808" "0060600000" "2010080402" "3e5149453e" "00427f4000"
+    "4261514946" "2141454b31" "1814127f10" "2745454539" "3c4a494930" "0171090503"
+    "3649494936" "064949291e" "0036360000" "0056360000" "0008142241" "1414141414"
+    "4122140800" "0201510906" "3249794132" "7e1111117e" "7f49494936" "3e41414122"
+    "7f4141221c" "7f49494941" "7f09090101" "3e41415132" "7f0808087f" "00417f4100"
+    "2040413f01" "7f08142241" "7f40404040" "7f0204027f" "7f0408107f" "3e4141413e"
+    "7f09090906" "3e4151215e" "7f09192946" "4649494931" "01017f0101" "3f4040403f"
+    "1f2040201f" "7f2018207f" "6314081463" "0304780403" "6151494543" "00007f4141"
+    "0204081020" "41417f0000" "0402010204" "4040404040" "0001020400" "2054545478"
+    "7f48444438" "3844444420" "384444487f" "3854545418" "087e090102" "081454543c"
+    "7f08040478" "00447d4000" "2040443d00" "007f102844" "00417f4000" "7c04180478"
+    "7c08040478" "3844444438" "7c14141408" "081414187c" "7c08040408" "4854545420"
+    "043f444020" "3c4040207c" "1c2040201c" "3c4030403c" "4428102844" "0c5050503c"
+    "4464544c44" "0008364100" "00007f0000" "0041360800" "0201020402")
+_BLOCK = b"\x7f" * 5  # Znaky mimo rozsah
+
+
+class FrameBuffer:
+    # Atributy s podtržítkem, podtřídy (SH1106) mají vlastní width a height
+    def __init__(self, buffer, width, height, format, stride=None):
+        if format not in (MONO_VLSB, MONO_HLSB, MONO_HMSB):
+            raise ValueError("simulátor umí jen jednobitové formáty")
+        self._buffer = buffer
+        self._width = width
+        self._height = height
+        self._format = format
+        self._stride = width if stride is None else stride
+
+    def _locate(self, x, y):
+        """Vrátí (index bajtu, bitová maska) pixelu."""
+        if self._format == MONO_VLSB:
+            return (y >> 3) * self._stride + x, 1 << (y & 7)
+        index = (y * ((self._stride + 7) & ~7) + x) >> 3
+        if self._format == MONO_HMSB:
+            return index, 1 << (x & 7)
+        return index, 0x80 >> (x & 7)
+
+    def _get(self, x, y):
+        index, mask = self._locate(x, y)
+        return 1 if self._buffer[index] & mask else 0
+
+    def _set(self, x, y, c):
+        # Metody kreslí přes _set, ne přes pixel(), který podtřída překrývá
+        if 0 <= x < self._width and 0 <= y < self._height:
+            index, mask = self._locate(x, y)
+            if c:
+                self._buffer[index] |= mask
+            else:
+                self._buffer[index] &= ~mask & 0xff
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    def fill(self, c):
+        self._buffer[:] = (b"\xff" if c else b"\x00") * len(self._buffer)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self._width), min(y + h, self._height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        buffer = self._buffer
+        if self._format == MONO_VLSB:
+            # Po stránkách: jeden bajt = 8 řádků sloupce
+            for page in range(y0 >> 3, ((y1 - 1) >> 3) + 1):
+                top = max(y0 - page * 8, 0)
+                bottom = min(y1 - page * 8, 8)
+                mask = ((1 << bottom) - 1) & ~((1 << top) - 1)
+                base = page * self._stride
+                for i in range(base + x0, base + x1):
+                    buffer[i] = buffer[i] | mask if c else buffer[i] & ~mask & 0xff
+            return
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x0, y0, x1, y1, c):
+        # Bresenham
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self._set(x0, y0, c)
+            if x0 == x1 and y0 == y1:
+                return
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def text(self, s, x, y, c=1):
+        for char in s:
+            code = ord(char)
+            glyph = _FONT[(code - 32) * 5:(code - 31) * 5] if 32 <= code < 127 else _BLOCK
+            for col, bits in enumerate(glyph):
+                for row in range(8):
+                    if bits >> row & 1:
+                        self._set(x + 1 + col, y + row, c)
+            x += 8
+
+    def scroll(self, xstep, ystep):
+        # Jako MicroPython: uvolněný okraj zůstane, jak byl
+        width, height = self._width, self._height
+        xs = range(width - 1, -1, -1) if xstep > 0 else range(width)
+        ys = range(height - 1, -1, -1) if ystep > 0 else range(height)
+        for y in ys:
+            for x in xs:
+                sx, sy = x - xstep, y - ystep
+                if 0 <= sx < width and 0 <= sy < height:
+                    self._set(x, y, self._get(sx, sy))
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if isinstance(fbuf, tuple):
+            fbuf = FrameBuffer(*fbuf)
+        for sy in range(fbuf._height):
+            for sx in range(fbuf._width):
+                if not (0 <= x + sx < self._width and 0 <= y + sy < self._height):
+                    continue
+                c = fbuf._get(sx, sy)
+                if palette is not None:
+                    c = palette._get(c, 0)
+                if c != key:
+                    self._set(x + sx, y + sy, c)
+
+
+def FrameBuffer1(buffer, width, height, stride=None):
+    return FrameBuffer(buffer, width, height, MONO_VLSB, stride)
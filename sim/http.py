@@ -0,0 +1,139 @@
+"""
+HTTP server v paměti pro uasyncio.open_connection simulátoru. Spojení
+je dvojice asyncio.StreamReader, požadavky zpracovává obyčejný
+BaseHTTPRequestHandler (např. ten z tools/stub_server.py) nad
+BytesIO, takže simulace i ruční testy používají stejné endpointy.
+Zpoždění sítě běží ve virtuálním čase.
+"""
+import asyncio
+import errno
+import io
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+from sim import clock as _clock
+from sim import network
+
+servers = {}  # Jméno hostitele -> Server, "*" platí pro všechny
+
+
+def reset():
+    servers.clear()
+
+
+async def open_connection(host, port, ssl=False):
+    """Náhrada uasyncio.open_connection, vrátí (reader, writer) spojení se serverem."""
+    if not network.air.online():
+        raise OSError(errno.EHOSTUNREACH)
+    server = servers.get(host) or servers.get("*")
+    if server is None:
+        raise OSError(-202)  # Jako getaddrinfo na ESP32: neznámé jméno
+    return await server.connect()
+
+
+class _Writer:
+    """Strana klienta pro zápis, data jdou rovnou do readeru serveru."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def write(self, data):
+        if self.connection.closed:
+            raise OSError(errno.EBADF)
+        self.connection.requests.feed_data(bytes(data))
+
+    async def drain(self):
+        await asyncio.sleep(0)
+
+    def close(self):
+        if not self.connection.closed:
+            self.connection.closed = True
+            self.connection.requests.feed_eof()
+
+    async def wait_closed(self):
+        pass
+
+
+class _Connection:
+    def __init__(self):
+        self.requests = asyncio.StreamReader()  # Klient -> server
+        self.responses = asyncio.StreamReader()  # Server -> klient
+        self.closed = False
+
+
+class Server:
+    """
+    Server přijímající spojení v paměti. handler_class je podtřída
+    BaseHTTPRequestHandler, latency_ms zpoždění každé odpovědi,
+    connect_ms navázání spojení (TCP a TLS). Kvůli testům výpadků jde
+    server vypnout (down) a zaznamenává požadavky do log.
+    """
+
+    def __init__(self, handler_class, latency_ms=50, connect_ms=150):
+        class Handler(handler_class):
+            # Požadavek i odpověď v paměti místo socketu
+            def setup(self):
+                self.rfile = io.BytesIO(self.request)
+                self.wfile = io.BytesIO()
+
+            def finish(self):
+                pass
+
+        self.handler_class = Handler
+        self.latency_ms = latency_ms
+        self.connect_ms = connect_ms
+        self.down = False
+        self.connections = 0
+        self.log = []  # (ms, metoda, cesta, status)
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def requests(self, path=None):
+        """Počet požadavků, případně jen na cestu path (bez query)."""
+        return sum(1 for entry in self.log if path is None or urlparse(entry[2]).path == path)
+
+    async def connect(self):
+        await asyncio.sleep(self.connect_ms / 1000)
+        if self.down:
+            raise OSError(errno.ECONNREFUSED)
+        self.connections += 1
+        connection = _Connection()
+        asyncio.get_running_loop().create_task(self.serve(connection))
+        return connection.responses, _Writer(connection)
+
+    async def serve(self, connection):
+        reader = connection.requests
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break  # Klient spojení zavřel
+            lines = head.decode().split("\r\n")
+            method, path = lines[0].split(" ")[:2]
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            self.bytes_in += len(head) + len(body)
+            await self.prepare(method, path, headers)
+            await asyncio.sleep(self.latency_ms / 1000)
+            response = self.handle(head + body)
+            status = int(response.split(b" ", 2)[1])
+            self.log.append((_clock.current().ms(), method, path, status))
+            if connection.closed or self.down:
+                break  # Klient mezitím spojení zavřel nebo server spadl
+            self.bytes_out += len(response)
+            connection.responses.feed_data(response)
+            if headers.get("connection") == "close":
+                break
+        connection.responses.feed_eof()
+
+    async def prepare(self, method, path, headers):
+        """Před zpracováním požadavku, podtřídy tu čekají (long-poll)."""
+
+    def handle(self, request):
+        """Zpracuje jeden požadavek handlerem a vrátí bajty odpovědi."""
+        handler = self.handler_class(request, ("sim", 0), SimpleNamespace(verbose=False))
+        return handler.wfile.getvalue()
@@ -0,0 +1,71 @@
+"""
+Matice kláves 4x4 zapojená jako na desce: řádky jsou výstupy, které
+Keypad budí jeden po druhém, sloupce vstupy s pull-down. Stisky se
+plánují na virtuální čas, volitelně se zákmity kontaktu.
+"""
+from sim import machine
+
+ROWS = (26, 27, 14, 12)
+COLS = (25, 33, 32, 15)
+KEY_MAP = (
+    ("S1", "S2", "S3", "S4"),
+    ("S5", "S6", "S7", "S8"),
+    ("S9", "S10", "S11", "S12"),
+    ("S13", "S14", "S15", "S16"),
+)
+
+_HOLD_MS = 80  # Typická délka stisku
+_INTERVAL_MS = 300  # Mezi stisky v press_keys()
+
+
+class KeypadMatrix:
+    def __init__(self, clock, rows=ROWS, cols=COLS, key_map=KEY_MAP):
+        self.clock = clock
+        self.rows = rows
+        self.cols = cols
+        self.position = {key: (r, c) for r, row in enumerate(key_map) for c, key in enumerate(row)}
+        self.down = set()  # Pozice (řádek, sloupec) sepnutých kontaktů
+        self.presses = 0
+        for c, pin_id in enumerate(cols):
+            machine.inputs[pin_id] = lambda c=c: self.read(c)
+
+    def read(self, col):
+        """Úroveň sloupce: 1, pokud je sepnutá klávesa na buzeném řádku."""
+        for r, pin_id in enumerate(self.rows):
+            if (r, col) in self.down and machine.level(pin_id):
+                return 1
+        return 0
+
+    def set(self, key, down):
+        """Hned sepne nebo rozepne kontakt klávesy."""
+        if down:
+            self.down.add(self.position[key])
+        else:
+            self.down.discard(self.position[key])
+
+    def press(self, key, at_ms=None, hold_ms=_HOLD_MS, bounce_ms=0):
+        """
+        Naplánuje stisk klávesy key v čase at_ms (None = hned) na hold_ms.
+        bounce_ms > 0 přidá na začátek a konec stisku zákmity po 1 ms.
+        Vrátí čas uvolnění v ms.
+        """
+        clock = self.clock
+        start_us = clock.now_us if at_ms is None else round(at_ms * 1000)
+        end_us = start_us + hold_ms * 1000
+        for edge_us, down in ((start_us, True), (end_us, False)):
+            for i in range(bounce_ms):
+                clock.schedule(edge_us + i * 1000, lambda key=key, state=down ^ (i & 1): self.set(key, state))
+            clock.schedule(edge_us + bounce_ms * 1000, lambda key=key, down=down: self.set(key, down))
+        clock.schedule(start_us, self.count)
+        return end_us / 1000
+
+    def count(self):
+        self.presses += 1
+
+    def press_keys(self, keys, at_ms=None, interval_ms=_INTERVAL_MS, hold_ms=_HOLD_MS):
+        """Naplánuje stisky kláves keys po sobě, vrátí čas posledního uvolnění v ms."""
+        start = self.clock.ms() if at_ms is None else at_ms
+        end = start
+        for i, key in enumerate(keys):
+            end = self.press(key, start + i * interval_ms, hold_ms)
+        return end
@@ -0,0 +1,311 @@
+"""
+Náhrada modulu machine: Pin, Timer, PWM, I2C a SPI nad virtuálními
+hodinami. Zařízení (panel displeje, matice klávesnice) se připojují
+k sběrnicím a pinům přes registry tohoto modulu, které Board při
+vytvoření vyprázdní.
+"""
+import errno
+
+from sim import clock as _clock
+
+pins = {}  # Číslo pinu -> Pin, poslední vytvořený
+inputs = {}  # Číslo pinu -> funkce vracející úroveň vstupu (matice kláves)
+pwm_channels = {}  # Číslo pinu -> PwmChannel se záznamem výstupu
+i2c_buses = {}  # Id -> I2CBus
+spi_buses = {}  # Id -> SPIBus
+bus_timing = True  # Přenos po sběrnici posune virtuální čas podle rychlosti
+
+
+def reset():
+    """Zapomene všechny piny, sběrnice a záznamy."""
+    for registry in (pins, inputs, pwm_channels, i2c_buses, spi_buses):
+        registry.clear()
+
+
+def level(pin_id):
+    """Úroveň výstupu pinu pin_id, 0 pokud pin nikdo nevytvořil."""
+    pin = pins.get(pin_id)
+    return pin._value if pin is not None else 0
+
+
+def _transfer(bits, freq):
+    if bus_timing and freq:
+        _clock.current().sleep_us(bits * 1000000 // freq)
+
+
+class Pin:
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 2
+    PULL_DOWN = 1
+    IRQ_FALLING = 2
+    IRQ_RISING = 1
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        old = pins.get(id)
+        self._value = old._value if old is not None else 0
+        self.mode = None
+        self.pull = None
+        pins[id] = self
+        self.init(mode, pull, value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.mode = mode
+        if pull != -1:
+            self.pull = pull
+        if value is not None:
+            self.value(value)
+
+    def value(self, value=None):
+        if value is None:
+            read = inputs.get(self.id)
+            if read is not None and self.mode != Pin.OUT:
+                return read()
+            if self.mode == Pin.IN:
+                return 1 if self.pull == Pin.PULL_UP else 0
+            return self._value
+        self._value = 1 if value else 0
+
+    __call__ = value
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=3):
+        return None
+
+    def __repr__(self):
+        return f"Pin({self.id})"
+
+
+class Timer:
+    """Hardwarový časovač, callback se volá z virtuálních hodin."""
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        self.id = id
+        self.event = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, period=-1, callback=None, freq=-1):
+        self.deinit()
+        if freq > 0:
+            period_us = 1000000 // freq
+        else:
+            period_us = period * 1000
+        clock = _clock.current()
+        self.event = clock.schedule(
+            clock.now_us + period_us, lambda: callback(self) if callback else None,
+            period_us if mode == Timer.PERIODIC else 0)
+
+    def deinit(self):
+        _clock.Clock.cancel(self.event)
+        self.event = None
+
+
+class PwmChannel:
+    """
+    Záznam PWM výstupu jednoho pinu: změny (ms, frekvence, střída)
+    a z nich odvozené tóny.
+    """
+
+    def __init__(self, pin_id):
+        self.pin_id = pin_id
+        self.freq = 0
+        self.duty = 0
+        self.changes = []
+
+    def set(self, freq, duty):
+        if (freq, duty) != (self.freq, self.duty):
+            self.freq, self.duty = freq, duty
+            self.changes.append((_clock.current().ms(), freq, duty))
+
+    def tones(self):
+        """Vrátí seznam (začátek ms, frekvence, délka ms) znějících úseků."""
+        tones = []
+        start = None
+        for ms, freq, duty in self.changes:
+            if start is not None:
+                tones.append((start[0], start[1], ms - start[0]))
+                start = None
+            if duty and freq:
+                start = (ms, freq)
+        if start is not None:
+            tones.append((start[0], start[1], _clock.current().ms() - start[0]))
+        return tones
+
+
+class PWM:
+    def __init__(self, pin, freq=None, duty=None, duty_u16=None):
+        self.channel = pwm_channels.get(pin.id)
+        if self.channel is None:
+            self.channel = pwm_channels[pin.id] = PwmChannel(pin.id)
+        self.init(freq, duty, duty_u16)
+
+    def init(self, freq=None, duty=None, duty_u16=None):
+        if freq is not None:
+            self.freq(freq)
+        if duty is not None:
+            self.duty(duty)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+
+    def freq(self, value=None):
+        if value is None:
+            return self.channel.freq
+        self.channel.set(value, self.channel.duty)
+
+    def duty(self, value=None):
+        """Střída 0..1023 jako na ESP32."""
+        if value is None:
+            return self.channel.duty
+        self.channel.set(self.channel.freq, value)
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self.channel.duty * 64
+        self.duty(value >> 6)
+
+    def deinit(self):
+        self.channel.set(0, 0)
+
+
+class I2CBus:
+    """Sběrnice I2C se zařízeními podle adresy a počítadly provozu."""
+
+    def __init__(self):
+        self.devices = {}  # Adresa -> zařízení s metodou i2c_write(data)
+        self.freq = 400000
+        self.transactions = 0
+        self.bytes = 0
+
+    def write(self, addr, data):
+        device = self.devices.get(addr)
+        if device is None:
+            raise OSError(errno.ENODEV)
+        self.transactions += 1
+        self.bytes += len(data)
+        # Start, adresa, data po 9 bitech (včetně ACK) a stop
+        _transfer((len(data) + 1) * 9 + 2, self.freq)
+        device.i2c_write(data)
+
+
+def i2c_bus(id):
+    bus = i2c_buses.get(id)
+    if bus is None:
+        bus = i2c_buses[id] = I2CBus()
+    return bus
+
+
+class I2C:
+    def __init__(self, id=0, scl=None, sda=None, freq=400000, timeout=50000):
+        self.bus = i2c_bus(id)
+        self.bus.freq = freq
+
+    def scan(self):
+        return sorted(self.bus.devices)
+
+    def writeto(self, addr, buf, stop=True):
+        self.bus.write(addr, bytes(buf))
+        return len(buf)
+
+    def writevto(self, addr, vector, stop=True):
+        data = b"".join(bytes(buf) for buf in vector)
+        self.bus.write(addr, data)
+        return len(data)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        if addr not in self.bus.devices:
+            raise OSError(errno.ENODEV)
+        return bytes(nbytes)
+
+
+class SPIBus:
+    """
+    Sběrnice SPI. Zařízení dostane data, jen když je jeho CS v nule
+    (nebo CS nemá), spolu s úrovní pinu D/C.
+    """
+
+    def __init__(self):
+        self.devices = []  # (zařízení s metodou spi_write(data, dc), pin D/C, pin CS)
+        self.baudrate = 1000000
+        self.transactions = 0
+        self.bytes = 0
+
+    def attach(self, device, dc, cs=None):
+        self.devices.append((device, dc, cs))
+
+    def write(self, data):
+        self.transactions += 1
+        self.bytes += len(data)
+        _transfer(len(data) * 8, self.baudrate)
+        for device, dc, cs in self.devices:
+            if cs is None or not level(cs):
+                device.spi_write(data, level(dc))
+
+
+def spi_bus(id):
+    bus = spi_buses.get(id)
+    if bus is None:
+        bus = spi_buses[id] = SPIBus()
+    return bus
+
+
+class SPI:
+    MSB = 0
+    LSB = 1
+
+    def __init__(self, id=1, baudrate=1000000, **kwargs):
+        self.bus = spi_bus(id)
+        self.init(baudrate)
+
+    def init(self, baudrate=1000000, **kwargs):
+        self.bus.baudrate = baudrate
+
+    def write(self, buf):
+        self.bus.write(bytes(buf))
+
+    def read(self, nbytes, write=0):
+        self.bus.write(bytes([write]) * nbytes)
+        return bytes(nbytes)
+
+    def readinto(self, buf, write=0):
+        self.bus.write(bytes([write]) * len(buf))
+
+    def write_readinto(self, write_buf, read_buf):
+        self.bus.write(bytes(write_buf))
+
+    def deinit(self):
+        pass
+
+
+def freq(hz=None):
+    return 240000000 if hz is None else None
+
+
+def unique_id():
+    return b"\x24\x0a\xc4\x00\x51\x06"
+
+
+def reset_cause():
+    return 1  # PWRON_RESET
+
+
+def idle():
+    pass
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
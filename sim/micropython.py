@@ -0,0 +1,38 @@
+"""Náhrada modulu micropython: dekorátory emitorů nic nedělají, const vrací hodnotu."""
+
+
+def const(value):
+    return value
+
+
+def native(function):
+    return function
+
+
+viper = native
+asm_xtensa = native
+
+
+def schedule(function, arg):
+    """Na zařízení se funkce zavolá po skončení přerušení, tady hned."""
+    function(arg)
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def heap_lock():
+    return 0
+
+
+def heap_unlock():
+    return 0
+
+
+def mem_info(verbose=False):
+    print("mem: simulátor, halda se neměří")
+
+
+def opt_level(level=None):
+    return 0 if level is None else None
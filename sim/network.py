@@ -0,0 +1,191 @@
+"""
+Náhrada modulu network: WLAN s přístupovými body ve virtuálním
+"éteru" (air). Připojení trvá connect_ms virtuálního času, se známým
+BSSID fast_connect_ms, hledání sítě blokuje scan_ms. Výpadek se
+simuluje přes air.outage().
+"""
+from sim import clock as _clock
+
+STA_IF = 0
+AP_IF = 1
+
+# Stavy jako na ESP32
+STAT_IDLE = 1000
+STAT_CONNECTING = 1001
+STAT_GOT_IP = 1010
+STAT_NO_AP_FOUND = 201
+STAT_WRONG_PASSWORD = 202
+STAT_CONNECT_FAIL = 203
+
+AUTH_WPA2_PSK = 3
+
+
+class AccessPoint:
+    def __init__(self, ssid, password, bssid=None, channel=6, rssi=-60):
+        self.ssid = ssid
+        self.password = password
+        self.bssid = bssid or bytes([0x02, 0, 0, 0, 0, len(ssid) & 0xff])
+        self.channel = channel
+        self.rssi = rssi
+        self.up = True
+
+
+class _Station:
+    """Stav rozhraní STA, sdílený všemi objekty WLAN(STA_IF)."""
+
+    def __init__(self):
+        self.active = False
+        self.started = False  # Aplikace Wi-Fi někdy zapnula
+        self.status = STAT_IDLE
+        self.ap = None
+        self.pending = None  # Naplánované dokončení připojení
+        self.config = {"mac": b"\x24\x0a\xc4\x00\x51\x06", "channel": 1, "dhcp_hostname": "espressif"}
+        self.ifconfig = ("0.0.0.0", "0.0.0.0", "0.0.0.0", "0.0.0.0")
+        self.static = None
+        self.connects = 0
+
+
+class Air:
+    """
+    Přístupové body v dosahu a časy připojování. Bez přístupových bodů
+    se přijme jakákoli síť a heslo (síť se při prvním připojení přidá).
+    """
+
+    def __init__(self):
+        self.access_points = []
+        self.connect_ms = 1500
+        self.fast_connect_ms = 300
+        self.scan_ms = 2000
+        self.sta = _Station()
+        self.open = True
+
+    def add(self, ssid, password, **kwargs):
+        ap = AccessPoint(ssid, password, **kwargs)
+        self.access_points.append(ap)
+        self.open = False
+        return ap
+
+    def find(self, ssid, bssid=None):
+        for ap in self.access_points:
+            if ap.up and ap.ssid == ssid and (bssid is None or bytes(bssid) == ap.bssid):
+                return ap
+        return None
+
+    def outage(self, duration_ms=None):
+        """Vypne všechny přístupové body, po duration_ms je zase zapne."""
+        for ap in self.access_points:
+            ap.up = False
+        if duration_ms is not None:
+            _clock.current().call_later(duration_ms, self.restore)
+
+    def restore(self):
+        for ap in self.access_points:
+            ap.up = True
+
+    def online(self):
+        """
+        Je síť k dispozici? Pokud aplikace Wi-Fi vůbec nezapnula (např. test
+        jen jedné obrazovky), bere se síť počítače jako připojená.
+        """
+        return not self.sta.started or WLAN().isconnected()
+
+
+air = Air()
+
+
+def reset():
+    global air
+    air = Air()
+
+
+class WLAN:
+    def __init__(self, interface=STA_IF):
+        if interface != STA_IF:
+            raise OSError("simulátor umí jen STA_IF")
+        self.interface = interface
+
+    @property
+    def sta(self):
+        return air.sta
+
+    def active(self, value=None):
+        sta = self.sta
+        if value is None:
+            return sta.active
+        sta.active = bool(value)
+        if value:
+            sta.started = True
+        else:
+            self.disconnect()
+
+    def connect(self, ssid=None, key=None, *, bssid=None):
+        sta = self.sta
+        if not sta.active:
+            raise OSError("Wifi Not Started")
+        self.disconnect()
+        if air.open and not air.find(ssid):
+            air.access_points.append(AccessPoint(ssid, key))  # Otevřený éter přijme síť aplikace
+        clock = _clock.current()
+        sta.status = STAT_CONNECTING
+        delay = air.fast_connect_ms if bssid else air.connect_ms
+        sta.pending = clock.call_later(delay, lambda: self.finish(ssid, key, bssid))
+
+    def finish(self, ssid, key, bssid):
+        sta = self.sta
+        sta.pending = None
+        ap = air.find(ssid, bssid)
+        if ap is None:
+            sta.status = STAT_NO_AP_FOUND
+        elif ap.password != key:
+            sta.status = STAT_WRONG_PASSWORD
+        else:
+            sta.ap = ap
+            sta.status = STAT_GOT_IP
+            sta.connects += 1
+            sta.config["channel"] = ap.channel
+            sta.ifconfig = sta.static or ("192.168.1.50", "255.255.255.0", "192.168.1.1", "192.168.1.1")
+
+    def disconnect(self):
+        sta = self.sta
+        _clock.Clock.cancel(sta.pending)
+        sta.pending = None
+        sta.ap = None
+        sta.status = STAT_IDLE
+        sta.ifconfig = ("0.0.0.0",) * 4
+
+    def isconnected(self):
+        sta = self.sta
+        return sta.status == STAT_GOT_IP and sta.ap is not None and sta.ap.up
+
+    def status(self, param=None):
+        sta = self.sta
+        if param == "rssi":
+            if not self.isconnected():
+                raise OSError("not connected")
+            return sta.ap.rssi
+        if param is not None:
+            raise ValueError(param)
+        if sta.status == STAT_GOT_IP and not self.isconnected():
+            return STAT_IDLE  # Spojení spadlo
+        return sta.status
+
+    def scan(self):
+        sta = self.sta
+        if not sta.active:
+            raise OSError("Wifi Not Started")
+        _clock.current().sleep_ms(air.scan_ms)
+        return [(ap.ssid.encode(), ap.bssid, ap.channel, ap.rssi, AUTH_WPA2_PSK, False)
+                for ap in air.access_points if ap.up]
+
+    def ifconfig(self, config=None):
+        sta = self.sta
+        if config is None:
+            return sta.ifconfig
+        sta.static = tuple(config)
+        sta.ifconfig = sta.static
+
+    def config(self, *args, **kwargs):
+        sta = self.sta
+        if args:
+            return sta.config[args[0]]
+        sta.config.update(kwargs)
@@ -0,0 +1,172 @@
+"""
+Panel SH1106 v paměti. Dekóduje příkazy a data, které driver posílá po
+I2C (řídicí bajty Co a D/C) nebo SPI (pin D/C), do RAM řadiče 132x64
+a z ní skládá obraz 128x64 tak, jak ho ukazuje sklo displeje: se
+začátkem zobrazení (start line), posunem, zrcadlením a inverzí.
+"""
+from sim import framebuf
+
+_RAM_WIDTH = 132
+_COLUMN_OFFSET = 2  # Panely 128 px začínají sloupcem 2
+_ARG_COMMANDS = (0x81, 0xa8, 0xad, 0xd3, 0xd5, 0xd9, 0xda, 0xdb)  # Příkazy s jedním argumentem
+
+
+class Panel:
+    def __init__(self, width=128, height=64):
+        self.width = width
+        self.height = height
+        self.ram = bytearray(_RAM_WIDTH * 8)
+        self.page = 0
+        self.column = 0
+        self.start_line = 0
+        self.offset = 0
+        self.on = False
+        self.seg_remap = False
+        self.com_reverse = False
+        self.invert = False
+        self.all_on = False
+        self.contrast = 0x80
+        self.arg_command = None  # Příkaz čekající na argument
+        self.commands = 0
+        self.data_bytes = 0
+        self.unknown = []  # Příkazy, kterým simulátor nerozumí
+        self.version = 0  # Mění se s každým bajtem, podle něj se obnovuje obraz
+        self.cache = (None, None)  # (verze, řádky obrazu)
+        self.found = {}  # (verze, text) -> výsledek find_text()
+
+    # Vstup ze sběrnice
+
+    def i2c_write(self, data):
+        """Přenos I2C: řídicí bajt (Co, D/C) a za ním bajt nebo zbytek přenosu."""
+        i = 0
+        n = len(data)
+        while i < n:
+            control = data[i]
+            is_data = control & 0x40
+            i += 1
+            if control & 0x80:  # Co=1: následuje jeden bajt a další řídicí bajt
+                if i < n:
+                    self.byte(data[i], is_data)
+                i += 1
+            else:
+                for value in data[i:]:
+                    self.byte(value, is_data)
+                return
+
+    def spi_write(self, data, dc):
+        for value in data:
+            self.byte(value, dc)
+
+    def byte(self, value, is_data):
+        self.version += 1
+        if is_data:
+            self.data_bytes += 1
+            if self.column < _RAM_WIDTH:
+                self.ram[self.page * _RAM_WIDTH + self.column] = value
+                self.column += 1
+        else:
+            self.commands += 1
+            self.command(value)
+
+    def command(self, cmd):
+        if self.arg_command is not None:
+            arg, self.arg_command = self.arg_command, None
+            if arg == 0x81:
+                self.contrast = cmd
+            elif arg == 0xd3:
+                self.offset = cmd & 0x3f
+            return
+        if cmd in _ARG_COMMANDS:
+            self.arg_command = cmd
+        elif cmd < 0x10:
+            self.column = (self.column & 0xf0) | cmd
+        elif cmd < 0x20:
+            self.column = (self.column & 0x0f) | ((cmd & 0x0f) << 4)
+        elif 0x30 <= cmd < 0x34:
+            pass  # Napětí nábojové pumpy
+        elif 0x40 <= cmd < 0x80:
+            self.start_line = cmd & 0x3f
+        elif cmd in (0xa0, 0xa1):
+            self.seg_remap = cmd == 0xa1
+        elif cmd in (0xa4, 0xa5):
+            self.all_on = cmd == 0xa5
+        elif cmd in (0xa6, 0xa7):
+            self.invert = cmd == 0xa7
+        elif cmd in (0xae, 0xaf):
+            self.on = cmd == 0xaf
+        elif 0xb0 <= cmd < 0xb8:
+            self.page = cmd & 0x07
+        elif cmd in (0xc0, 0xc8):
+            self.com_reverse = cmd == 0xc8
+        elif cmd in (0xe0, 0xe3, 0xee):
+            pass  # Read-modify-write, nop
+        else:
+            self.unknown.append(cmd)
+
+    # Obraz
+
+    def pixel(self, x, y):
+        """Pixel skla na souřadnicích x, y (0 = zhasnuto)."""
+        if not self.on:
+            return 0
+        if self.all_on:
+            return 1
+        com = self.height - 1 - y if self.com_reverse else y
+        row = (com + self.start_line + self.offset) % 64
+        column = _RAM_WIDTH - 1 - _COLUMN_OFFSET - x if self.seg_remap else x + _COLUMN_OFFSET
+        value = self.ram[(row >> 3) * _RAM_WIDTH + column] >> (row & 7) & 1
+        return value ^ self.invert
+
+    def rows(self):
+        """Obraz jako seznam řádků, každý řádek je int s bitem x pro pixel x."""
+        if self.cache[0] == self.version:
+            return self.cache[1]
+        rows = []
+        for y in range(self.height):
+            bits = 0
+            for x in range(self.width):
+                if self.pixel(x, y):
+                    bits |= 1 << x
+            rows.append(bits)
+        self.cache = (self.version, rows)
+        return rows
+
+    def ascii(self, on="#", off="."):
+        """Obraz jako text, řádek znaků na řádek pixelů."""
+        return "\n".join("".join(on if bits >> x & 1 else off for x in range(self.width))
+                         for bits in self.rows())
+
+    def find_text(self, text):
+        """
+        Najde text nakreslený fontem simulátoru (FrameBuffer.text) kdekoli
+        na displeji, vrátí (x, y) levého horního rohu nebo None.
+        """
+        key = (self.version, text)
+        if key in self.found:
+            return self.found[key]
+        width = len(text) * 8
+        buf = bytearray(width)
+        framebuf.FrameBuffer(buf, width, 8, framebuf.MONO_VLSB).text(text, 0, 0)
+        width -= 2  # Prázdné sloupce za posledním znakem, text může končit u okraje
+        pattern = ["".join("#" if buf[x] >> y & 1 else "." for x in range(width)) for y in range(8)]
+        lines = self.ascii().split("\n")
+        result = None
+        for y in range(self.height - 7):
+            x = lines[y].find(pattern[0])
+            while x >= 0 and result is None:
+                if all(lines[y + i][x:x + width] == pattern[i] for i in range(1, 8)):
+                    result = (x, y)
+                x = lines[y].find(pattern[0], x + 1)
+            if result is not None:
+                break
+        if len(self.found) > 100:
+            self.found.clear()
+        self.found[key] = result
+        return result
+
+    def save_pbm(self, path):
+        """Uloží obraz jako PBM (P1), otevře ho většina prohlížečů obrázků."""
+        with open(path, "w") as f:
+            f.write(f"P1\n{self.width} {self.height}\n")
+            for bits in self.rows():
+                f.write(" ".join(str(bits >> x & 1) for x in range(self.width)) + "\n")
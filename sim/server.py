@@ -0,0 +1,57 @@
+"""
+Herní server simulátoru: stav a endpointy z tools/stub_server.py,
+jen long-poll /api/game/wait a start dalšího kola běží ve virtuálním
+čase místo vláken.
+"""
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+from sim.http import Server
+from tools.stub_server import GameState, Handler
+
+
+class SimGameState(GameState):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.event = asyncio.Event()  # Nastaví se při každé změně hry
+
+    def bump(self, game):
+        super().bump(game)
+        self.event.set()
+        self.event = asyncio.Event()
+
+    def later(self, delay, function, *args):
+        asyncio.get_running_loop().call_later(delay, function, *args)
+
+    def wait(self, game_id, etag, timeout):
+        # Na změnu už počkal GameServer.prepare(), handler nesmí blokovat
+        return self.etag(self.games[game_id]) != etag
+
+    async def wait_changed(self, game_id, etag, timeout):
+        """Počká, dokud se ETag hry neliší od etag, nejdéle timeout sekund."""
+        game = self.games.get(game_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while game is not None and self.etag(game) == etag:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self.event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+
+class GameServer(Server):
+    """Server se stavem her (state), parametry jako tools/stub_server.py."""
+
+    def __init__(self, games=3, rounds=3, round_delay=2.0, packed=True, **kwargs):
+        self.state = SimGameState(games=games, rounds=rounds, round_delay=round_delay, packed=packed)
+        super().__init__(type("SimHandler", (Handler,), {"state": self.state}), **kwargs)
+
+    async def prepare(self, method, path, headers):
+        url = urlparse(path)
+        if method == "GET" and url.path == "/api/game/wait":
+            query = parse_qs(url.query)
+            await self.state.wait_changed(query.get("id", [""])[0], headers.get("if-none-match"),
+                                          float(query.get("timeout", ["25"])[0]))
@@ -0,0 +1,122 @@
+"""
+Náhrada modulu uasyncio: asyncio z CPythonu s doplňky MicroPythonu
+(sleep_ms, wait_for_ms, ThreadSafeFlag) nad smyčkou událostí, která
+místo čekání posouvá virtuální hodiny. Čekání na síť i na časovač tak
+trvá nula skutečného času a události (přerušení časovačů, stisky,
+připojení Wi-Fi) se vykonávají v pořadí virtuálního času.
+"""
+import asyncio
+import math
+import selectors
+from asyncio import *  # noqa: F401,F403
+
+from sim import clock as _clock
+from sim import http
+
+TimeoutError = asyncio.TimeoutError
+
+_loop = None
+main_task = None  # Úloha spuštěná přes run(), Board v ní pokračuje
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """
+    Selektor, který nečeká: když nejsou připravená data, posune hodiny
+    k termínu smyčky a cestou vykoná události hodin. Skončí dřív, pokud
+    některá událost naplánovala práci pro smyčku.
+    """
+
+    def __init__(self, loop):
+        super().__init__()
+        self.loop = loop
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if events or (timeout is not None and timeout <= 0):
+            return events
+        clock = _clock.current()
+        target = math.inf if timeout is None else clock.now_us + math.ceil(timeout * 1000000)
+        ready = lambda: bool(self.loop._ready)
+        if clock.limit_us is not None and target > clock.limit_us:
+            clock.run_until(clock.limit_us, ready)
+            if not ready():
+                raise _clock.TimeUp
+        else:
+            clock.run_until(target, ready)
+        return super().select(0)
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self):
+        super().__init__(_VirtualSelector(self))
+
+    def time(self):
+        return _clock.current().now_us / 1000000
+
+
+def get_loop():
+    """Vrátí smyčku simulace, při prvním použití ji vytvoří."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = VirtualEventLoop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def close_loop():
+    global _loop, main_task
+    if _loop is not None and not _loop.is_closed():
+        tasks = asyncio.all_tasks(_loop)
+        for task in tasks:
+            task.cancel()
+        # Zrušení musí úlohy ještě doběhnout, ve finally mohou chvíli čekat
+        clock = _clock.current()
+        clock.limit_us = clock.now_us + 1000000
+        try:
+            _loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        except _clock.TimeUp:
+            pass
+        _loop.close()
+    asyncio.set_event_loop(None)
+    _loop = None
+    main_task = None
+
+
+def run(coro):
+    """
+    Spustí coro jako hlavní úlohu. Pokud simulaci zastaví limit času
+    (TimeUp), úloha zůstane v main_task a Board v ní může pokračovat.
+    """
+    global main_task
+    loop = get_loop()
+    main_task = loop.create_task(coro)
+    return loop.run_until_complete(main_task)
+
+
+def sleep_ms(ms):
+    return asyncio.sleep(ms / 1000)
+
+
+def wait_for_ms(aw, timeout):
+    return asyncio.wait_for(aw, timeout / 1000)
+
+
+class ThreadSafeFlag:
+    """Příznak, který jde nastavit z přerušení (callbacku časovače)."""
+
+    def __init__(self):
+        self.event = asyncio.Event()
+
+    def set(self):
+        self.event.set()
+
+    def clear(self):
+        self.event.clear()
+
+    async def wait(self):
+        await self.event.wait()
+        self.event.clear()
+
+
+def open_connection(host, port, ssl=False):
+    return http.open_connection(host, port, ssl)
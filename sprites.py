@@ -0,0 +1,24 @@
+# Vygenerováno nástrojem tools/make_sprites.py z assets/sprites.txt, neupravovat ručně.
+from framebuf import MONO_VLSB
+
+_ATLAS = b'\x06\t\t\x06``\x7f\x01\x01aa\x7f\x00\x00\xfe|8\x10\x00\x00\x08\x0c\x0e\x7f\x7f\x0e\x0c\x08\x100p\xfe\xfep0\x10~\xff\xff\xb7\xab\xdb\xff\xa3\xab\xdb\xff\xff~~\xff\xff\xb7\xab\xdb\xff\x87\xab\x8b\xff\xff~~\xff\xff\xb7\xab\xdb\xff\xfb\x8b\xf3\xff\xff~~\xff\xff\xb7\xab\xdb\xff\x83\xab\x83\xff\xff~~\xff\xff\xb7\xab\xdb\xff\xa3\xab\xc3\xff\xff~~\xb7\xab\xdb\xff\xb7\x83\xbf\xff\x83\xbb\x83~~\xb7\xab\xdb\xff\xb7\x83\xbf\xff\xb7\x83\xbf~'
+
+
+def _sprite(offset, width, height):
+    size = width * ((height + 7) // 8)
+    return (memoryview(_ATLAS)[offset:offset + size], width, height, MONO_VLSB)
+
+
+HEART = _sprite(0, 4, 4)
+NOTE = _sprite(4, 8, 8)
+ARROW_RIGHT = _sprite(12, 8, 8)
+ARROW_UP = _sprite(20, 8, 8)
+ARROW_DOWN = _sprite(28, 8, 8)
+KEY_S5 = _sprite(36, 13, 8)
+KEY_S6 = _sprite(49, 13, 8)
+KEY_S7 = _sprite(62, 13, 8)
+KEY_S8 = _sprite(75, 13, 8)
+KEY_S9 = _sprite(88, 13, 8)
+KEY_S10 = _sprite(101, 13, 8)
+KEY_S11 = _sprite(114, 13, 8)
+KEYS = (KEY_S5, KEY_S6, KEY_S7, KEY_S8, KEY_S9, KEY_S10, KEY_S11,)
@@ -0,0 +1,19 @@
+"""
+Testy běží na počítači v simulátoru (sim.Board): fixture board nainstaluje
+náhrady modulů zařízení, moduly hry se proto importují až uvnitř testu.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sim import Board  # noqa: E402
+from sim.server import GameServer  # noqa: E402
+
+
+@pytest.fixture
+def board():
+    with Board(server=GameServer(round_delay=5)) as board:
+        yield board
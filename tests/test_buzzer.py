@@ -0,0 +1,17 @@
+import asyncio
+
+
+def test_sequence_callbacks_always_fire(board):
+    from buzzer import Buzzer
+
+    async def scenario():
+        buzzer = Buzzer()
+        done = []
+        buzzer.play_sequence([], lambda: done.append("empty"))
+        buzzer.play_sequence([262, 294], lambda: done.append("first"))
+        await asyncio.sleep(0.1)
+        buzzer.play_sequence([330], lambda: done.append("second"))  # Nahradí rozehranou
+        await asyncio.sleep(2)
+        return done
+
+    assert board.start(scenario(), 5000) == ["empty", "first", "second"]
@@ -0,0 +1,31 @@
+import asyncio
+
+
+def test_failing_page_backs_off_and_shows_error(board):
+    from http_client import HttpClient
+    from game_list import GameList
+
+    async def scenario():
+        games = GameList(HttpClient("http://sim"), page_size=2)
+        await games.load(0)
+        board.server.down = True
+        fetches = 0
+        fetch = games.fetch
+
+        async def counted(page):
+            nonlocal fetches
+            fetches += 1
+            await fetch(page)
+
+        games.fetch = counted
+        for _ in range(150):  # 30 s smyčky výběru po 200 ms
+            games.window(0, 4)
+            await asyncio.sleep(0.2)
+        errors = games[2]
+        games.retry(2)  # S3 na řádku s chybou
+        await asyncio.sleep(0.2)
+        return errors, fetches
+
+    row, fetches = board.start(scenario(), 60000)
+    assert row == "! Load error"
+    assert fetches == 4  # Tři pokusy s odstupem, čtvrtý až na retry()
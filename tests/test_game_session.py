@@ -0,0 +1,29 @@
+def test_polling_without_etags_waits_between_requests(board):
+    from http_client import HttpClient
+    from game_session import GameSession
+
+    server = board.server
+
+    class PlainHandler(server.handler_class):
+        """Server bez long-pollu a bez ETagů, vždy vrátí celý dokument."""
+
+        def do_GET(self):
+            if self.path.startswith("/api/game/wait"):
+                return self.send_status(404)
+            super().do_GET()
+
+        def send_game(self, game):
+            self.send_json(game)
+
+    server.handler_class = PlainHandler
+    state = server.state
+    state.games["game1"]["completed"] = True
+
+    async def scenario():
+        session = GameSession(HttpClient("http://sim"), "game1", [262, 294, 330, 349, 392, 440, 494])
+        state.later(10, state.next_round, "game1")  # Nové kolo za 10 s
+        return await session.next_round()
+
+    document = board.start(scenario(), 30000)
+    assert not document["completed"]
+    assert server.requests("/api/game") <= 5  # Jednou za 3 s, ne v těsné smyčce
@@ -0,0 +1,73 @@
+import asyncio
+
+
+def test_cancelled_long_poll_does_not_leak_into_next_request(board):
+    from http_client import HttpClient
+
+    async def scenario():
+        client = HttpClient("http://sim")
+        etag = (await client.get("/api/game?id=game1")).headers["etag"]
+        poll = asyncio.create_task(client.get(
+            "/api/game/wait?id=game1&timeout=25", headers={"If-None-Match": etag}, timeout_ms=35000))
+        await asyncio.sleep(0.5)
+        poll.cancel()  # Hráč odešel klávesou S2
+        try:
+            await poll
+        except asyncio.CancelledError:
+            pass
+        start = board.clock.ms()
+        response = await client.get("/api/highscores")
+        return response.json(), board.clock.ms() - start, client.connects
+
+    scores, elapsed_ms, connects = board.start(scenario(), 60000)
+    assert scores[0]["name"] == "Player0"
+    assert elapsed_ms < 1000  # Bez čekání na vypršení limitu
+    assert connects == 2  # Zrušené spojení se zavřelo, další požadavek otevřel nové
+
+
+def test_failing_stream_closes_connection(board):
+    from http_client import HttpClient
+
+    async def broken(body):
+        await body.read(10)
+        raise ValueError("malformed body")
+
+    async def scenario():
+        client = HttpClient("http://sim")
+        try:
+            await client.get("/api/highscores", stream=broken)
+        except ValueError:
+            pass
+        response = await client.get("/api/game?id=game1")
+        return response.json(), client.connects
+
+    document, connects = board.start(scenario(), 10000)
+    assert document["_id"] == "game1"
+    assert connects == 2
+
+
+def test_post_is_not_resent_on_a_dropped_connection(board):
+    from http_client import HttpClient
+
+    server = board.server
+    handle = server.handle
+
+    def crash_after_handling(request):
+        # Server požadavek zpracuje a spadne dřív, než pošle odpověď
+        response = handle(request)
+        if request.startswith(b"POST"):
+            server.down = True
+            asyncio.get_running_loop().call_later(0.1, setattr, server, "down", False)
+        return response
+
+    async def scenario():
+        client = HttpClient("http://sim")
+        await client.get("/api/highscores")  # Otevře keep-alive spojení
+        server.handle = crash_after_handling
+        try:
+            await client.post("/api/highscores", json={"name": "Once", "points": 1})
+        except OSError:
+            pass
+
+    board.start(scenario(), 10000)
+    assert server.requests("/api/highscores") == 2  # GET a jediný POST
@@ -0,0 +1,29 @@
+import asyncio
+
+
+def test_chord_toggles_overlay_without_reaching_app(board):
+    from keypad import Keypad
+    from oled_display import OledDisplay
+    from buzzer import Buzzer
+    from runtime import Runtime
+    from metrics import Metrics
+
+    runtime = Runtime(OledDisplay(), Keypad(), Buzzer())
+    metrics = Metrics(runtime).install()
+
+    async def scenario():
+        runtime.start()
+        runtime.spawn(metrics.run())
+        board.keypad.press("S13", hold_ms=400)
+        await asyncio.sleep(0.1)
+        board.keypad.press("S16", hold_ms=200)  # Akord
+        await asyncio.sleep(0.6)
+        chord = (metrics.overlay, list(runtime.keys))
+        board.keypad.press("S13")  # Samotná klávesa akordu jde do hry
+        await asyncio.sleep(0.3)
+        return chord, list(runtime.keys)
+
+    (overlay, keys), after = board.start(scenario(), 5000)
+    assert overlay
+    assert keys == []
+    assert after == ["S13"]
@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.mark.parametrize("status, pending, rejected", [(503, [1], 0), (400, [], 1)])
+def test_failed_result_is_retried_or_rejected(board, status, pending, rejected):
+    from http_client import HttpClient, HttpError
+    from keypad import Keypad
+    from oled_display import OledDisplay
+    from buzzer import Buzzer
+    from runtime import Runtime
+    from upload_queue import UploadQueue
+    from online_game import OnlineGame
+
+    class FailingSession:
+        async def submit(self, indices):
+            raise HttpError(status)
+
+    async def scenario():
+        client = HttpClient("http://sim")
+        uploads = UploadQueue(client)
+        game = OnlineGame(Runtime(OledDisplay(), Keypad(), Buzzer()), client, uploads)
+        game.selected_game_id = "game1"
+        game.session = FailingSession()
+        await game.send_result_to_server([0, 1])
+        return uploads
+
+    uploads = board.start(scenario(), 5000)
+    assert uploads.pending() == pending  # 5xx zůstane ve frontě k opakování
+    assert uploads.stats()["rejected"] == rejected
@@ -0,0 +1,53 @@
+def test_framebuffer_blit_below_64_reaches_rotated_panel(board):
+    import framebuf
+    from machine import I2C, Pin
+    from sh1106 import SH1106_I2C
+
+    oled = SH1106_I2C(128, 64, I2C(0, scl=Pin(22), sda=Pin(21)), rotate=90, diff=True)
+    oled.show(True)
+    sprite = framebuf.FrameBuffer(bytearray(16), 8, 16, framebuf.MONO_HMSB)
+    sprite.fill(1)
+    oled.blit(sprite, 0, 100)
+    oled.show()
+    lit = sum(board.panel.pixel(x, y) for x in range(128) for y in range(64))
+    assert lit == 8 * 16
+
+
+def test_diff_mode_keeps_panel_and_shadow_in_sync(board):
+    from machine import I2C, Pin
+    from sh1106 import SH1106_I2C
+
+    oled = SH1106_I2C(128, 64, I2C(0, scl=Pin(22), sda=Pin(21)), diff=True)
+    for frame in range(3):
+        oled.fill_rect(0, 0, 64, 8, 0)
+        oled.text(str(frame * 7), 0, 0)
+        oled.pixel(100 + frame, 40, 1)
+        oled.show()
+    assert oled.shadowbuf == oled.displaybuf
+    assert all(board.panel.pixel(x, y) == oled.pixel(x, y) for x in range(128) for y in range(64))
+
+
+def test_spi_full_frames_use_full_baudrate(board):
+    import machine
+    from machine import SPI, Pin
+    from sh1106 import SH1106_SPI
+
+    spi = SPI(2, baudrate=4000000)
+    bus = machine.spi_bus(2)
+    rates = []
+    write = bus.write
+
+    def record(data):
+        rates.append(bus.baudrate)
+        write(data)
+
+    bus.write = record
+    oled = SH1106_SPI(128, 64, spi, Pin(4), Pin(16), Pin(5), baudrate=4000000, full_baudrate=10000000)
+    rates.clear()
+    oled.show(True)
+    assert set(rates) == {10000000}
+    rates.clear()
+    oled.text("x", 0, 0)
+    oled.show()
+    assert set(rates) == {4000000}
+    assert bus.baudrate == 4000000
@@ -0,0 +1,48 @@
+import pytest
+
+TONES = [262, 294, 330, 349, 392, 440, 494]
+
+
+def test_round_trip(board):
+    import tone_wire
+
+    indices = bytearray([0, 6, 2, 3, 4, 5, 1, 0, 6])
+    out = bytearray(tone_wire.MAX_TONES)
+    count = tone_wire.unpack(tone_wire.pack(indices, len(indices)), out)
+    assert out[:count] == indices
+
+
+def test_unknown_frequency_is_rejected(board):
+    import tone_wire
+
+    with pytest.raises(tone_wire.ToneError):
+        tone_wire.from_frequencies([262, 300], TONES, bytearray(tone_wire.MAX_TONES))
+
+
+def test_oversized_sequence_is_rejected_not_truncated(board):
+    import tone_wire
+
+    with pytest.raises(tone_wire.ToneError):
+        tone_wire.from_frequencies([262] * (tone_wire.MAX_TONES + 1), TONES, bytearray(tone_wire.MAX_TONES))
+
+
+@pytest.mark.parametrize("sequence", [[262, 300, 330], [262] * 70])
+def test_unencodable_sequence_falls_back_to_json(board, sequence):
+    import tone_wire
+    from http_client import HttpClient
+    from game_session import GameSession
+
+    board.server.state.games["game1"]["sequence"] = sequence
+
+    async def scenario():
+        session = GameSession(HttpClient("http://sim"), "game1", TONES)
+        try:
+            await session.take_sequence()
+        except tone_wire.ToneError:
+            return session.packed, session.document["sequence"], "ToneError"
+        return session.packed, session.document["sequence"], None
+
+    packed, received, error = board.start(scenario(), 5000)
+    assert not packed  # Server poslal JSON
+    assert received == sequence  # Celá sekvence, nic se nezkrátilo
+    assert error == "ToneError"
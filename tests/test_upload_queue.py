@@ -0,0 +1,35 @@
+import asyncio
+
+
+def test_score_upload_carries_player_name(board):
+    from http_client import HttpClient
+    from upload_queue import UploadQueue, SCORE
+
+    async def scenario():
+        uploads = UploadQueue(HttpClient("http://sim"), player="Tester")
+        uploads.append(SCORE, [50])
+        await uploads.flush()
+        return uploads.pending()
+
+    assert board.start(scenario(), 5000) == []
+    assert {"name": "Tester", "points": 50} in board.server.state.high_scores
+
+
+def test_rejected_entry_is_kept_and_counted(board):
+    from http_client import HttpClient
+    from upload_queue import UploadQueue, RESULT
+
+    async def scenario():
+        uploads = UploadQueue(HttpClient("http://sim"))
+        uploads.batch_api = False
+        uploads.append(RESULT, ["nogame", [262]])  # Neznámá hra, server vrátí 404
+        task = asyncio.create_task(uploads.run())
+        await asyncio.sleep(1)
+        task.cancel()
+        return uploads
+
+    uploads = board.start(scenario(), 5000)
+    assert uploads.pending() == []
+    assert uploads.stats()["rejected"] == 1
+    with open(uploads.rejected_path) as f:
+        assert f.read() == 'R1 404 ["nogame", [262]]\n'
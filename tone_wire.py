@@ -0,0 +1,83 @@
+import binascii
+from micropython import const
+
+# Typ obsahu dokumentu hry, ve kterém je sekvence zabalená v poli "tones"
+# místo seznamu frekvencí "sequence". Klient ho posílá v Accept, server,
+# který ho nezná, odpoví obyčejným JSON.
+CONTENT_TYPE = "application/x-tones+json"
+
+VERSION = const(1)
+MAX_TONES = const(64)  # Delší sekvenci hra stejně nezahraje
+_BITS = const(3)  # Index tónu 0-6, hodnota 7 je neplatná
+_MASK = const(7)
+
+# Formát "tones": base64 z [verze][počet][indexy po 3 bitech od nejnižšího bitu]
+
+
+class ToneError(ValueError):
+    """Sekvenci nejde převést na indexy tónů (neznámý tón, délka, formát)."""
+    pass
+
+
+def pack(indices, count):
+    """Zabalí count indexů tónů do řetězce pro pole "tones"."""
+    buf = bytearray(2 + (count * _BITS + 7) // 8)
+    buf[0] = VERSION
+    buf[1] = count
+    acc = bits = 0
+    pos = 2
+    for i in range(count):
+        acc |= indices[i] << bits
+        bits += _BITS
+        if bits >= 8:
+            buf[pos] = acc & 0xff
+            pos += 1
+            acc >>= 8
+            bits -= 8
+    if bits:
+        buf[pos] = acc
+    return binascii.b2a_base64(buf).strip().decode()
+
+
+def unpack(text, out):
+    """
+    Rozbalí pole "tones" do bytearray out (indexy tónů) a vrátí počet
+    tónů. Neznámá verze, délka nebo index vyhodí ToneError.
+    """
+    data = binascii.a2b_base64(text)
+    if len(data) < 2 or data[0] != VERSION:
+        raise ToneError("tones: version")
+    count = data[1]
+    if count > len(out) or len(data) < 2 + (count * _BITS + 7) // 8:
+        raise ToneError("tones: length")
+    acc = bits = 0
+    pos = 2
+    for i in range(count):
+        if bits < _BITS:
+            acc |= data[pos] << bits
+            pos += 1
+            bits += 8
+        index = acc & _MASK
+        if index == _MASK:
+            raise ToneError("tones: index")
+        out[i] = index
+        acc >>= _BITS
+        bits -= _BITS
+    return count
+
+
+def from_frequencies(sequence, tones, out):
+    """
+    Záložní cesta pro JSON: seznam frekvencí převede na indexy do out a
+    vrátí počet. Frekvence mimo tones nebo sekvence delší než out vyhodí
+    ToneError, nic se tiše nezkrátí.
+    """
+    count = len(sequence)
+    if count > len(out):
+        raise ToneError("tones: length")
+    for i in range(count):
+        frequency = sequence[i]
+        if frequency not in tones:
+            raise ToneError("tones: frequency")
+        out[i] = tones.index(frequency)
+    return count
@@ -0,0 +1,72 @@
+"""
+Překlad modulů hry do bajtkódu .mpy, aby se při startu nepřekládaly na zařízení.
+
+Spuštění: python tools/build_mpy.py [--march xtensawin] [--out build] [--deploy]
+
+Potřebuje mpy-cross stejné verze jako firmware (pip install mpy-cross==<verze>).
+Přeloží všechny moduly kromě main.py, který MicroPython spouští jen jako
+zdrojový soubor. --march je nutný kvůli @micropython.native v sh1106.py
+(ESP32: xtensawin). Na zařízení se .py importuje přednostně před .mpy,
+proto --deploy starý .py smaže a nahraje .mpy a main.py přes mpremote.
+--manifest zapíše manifest.py pro zamražení modulů přímo do firmwaru.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SKIP = {"main.py", "boot.py"}
+
+
+def modules():
+    return sorted(p for p in ROOT.glob("*.py") if p.name not in SKIP)
+
+
+def build(mpy_cross, march, out):
+    out.mkdir(exist_ok=True)
+    built = []
+    for source in modules():
+        target = out / (source.stem + ".mpy")
+        cmd = [mpy_cross, "-O2", f"-march={march}", "-o", str(target), str(source)]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode:
+            sys.exit(f"{source.name}: {result.stderr.strip()}")
+        print(f"{source.name:20} {source.stat().st_size:6} B -> {target.stat().st_size:6} B")
+        built.append(target)
+    return built
+
+
+def deploy(built, mpremote):
+    for target in built:
+        # Chybějící .py na zařízení nevadí
+        subprocess.run([mpremote, "rm", f":{target.stem}.py"], capture_output=True)
+        subprocess.run([mpremote, "cp", str(target), ":"], check=True)
+    subprocess.run([mpremote, "cp", str(ROOT / "main.py"), ":"], check=True)
+
+
+def write_manifest(out):
+    lines = ['include("$(PORT_DIR)/boards/manifest.py")']
+    lines += [f'module("{p.name}", base_path="{ROOT}")' for p in modules()]
+    (out / "manifest.py").write_text("\n".join(lines) + "\n")
+    print("Manifest:", out / "manifest.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mpy-cross", default="mpy-cross")
+    parser.add_argument("--march", default="xtensawin")
+    parser.add_argument("--out", type=Path, default=ROOT / "build")
+    parser.add_argument("--deploy", action="store_true", help="nahrát na zařízení přes mpremote")
+    parser.add_argument("--mpremote", default="mpremote")
+    parser.add_argument("--manifest", action="store_true", help="zapsat manifest.py pro zamražení")
+    args = parser.parse_args()
+    built = build(args.mpy_cross, args.march, args.out)
+    if args.manifest:
+        write_manifest(args.out)
+    if args.deploy:
+        deploy(built, args.mpremote)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Převod bitmap z assets/sprites.txt na modul sprites.py s bajty MONO_VLSB.
+
+Spuštění: python tools/make_sprites.py
+
+Sprite v sprites.txt začíná řádkem [JMÉNO] nebo [SKUPINA/JMÉNO], následují
+řádky bitmapy (X = svítí, . = nesvítí). Všechny sprity se uloží do jednoho
+bloku bajtů (atlasu), sprites.JMÉNO je n-tice (buffer, šířka, výška,
+formát), kterou jde rovnou předat FrameBuffer.blit. Sprity se skupinou
+tvoří navíc n-tici sprites.SKUPINA v pořadí, v jakém jsou v souboru.
+"""
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse(text):
+    sprites = []  # (skupina, jméno, řádky)
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("["):
+            group, _, name = line.strip("[]").rpartition("/")
+            sprites.append((group or None, name, []))
+        else:
+            rows = sprites[-1][2]
+            if rows and len(line) != len(rows[0]):
+                raise SystemExit(f"{sprites[-1][1]}: řádky mají různou délku")
+            rows.append(line)
+    return sprites
+
+
+def pack(rows):
+    """Bitmapa do MONO_VLSB: po stránkách 8 řádků, bajt = sloupec, bit 0 nahoře."""
+    width, height = len(rows[0]), len(rows)
+    data = bytearray()
+    for page in range((height + 7) // 8):
+        for x in range(width):
+            byte = 0
+            for bit in range(8):
+                y = page * 8 + bit
+                if y < height and rows[y][x] == "X":
+                    byte |= 1 << bit
+            data.append(byte)
+    return data, width, height
+
+
+def generate(sprites, source):
+    atlas = bytearray()
+    lines = [
+        f"# Vygenerováno nástrojem tools/make_sprites.py z {source}, neupravovat ručně.",
+        "from framebuf import MONO_VLSB",
+        "",
+    ]
+    entries = []
+    groups = {}
+    for group, name, rows in sprites:
+        data, width, height = pack(rows)
+        entries.append(f"{name} = _sprite({len(atlas)}, {width}, {height})")
+        atlas += data
+        if group:
+            groups.setdefault(group, []).append(name)
+
+    lines.append(f"_ATLAS = {bytes(atlas)!r}")
+    lines += [
+        "",
+        "",
+        "def _sprite(offset, width, height):",
+        "    size = width * ((height + 7) // 8)",
+        "    return (memoryview(_ATLAS)[offset:offset + size], width, height, MONO_VLSB)",
+        "",
+        "",
+    ]
+    lines += entries
+    for group, names in groups.items():
+        lines.append(f"{group} = ({', '.join(names)},)")
+    return "\n".join(lines) + "\n", len(atlas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", type=Path, default=ROOT / "assets" / "sprites.txt")
+    parser.add_argument("--out", type=Path, default=ROOT / "sprites.py")
+    args = parser.parse_args()
+    sprites = parse(args.source.read_text(encoding="utf-8"))
+    code, size = generate(sprites, args.source.relative_to(ROOT).as_posix())
+    with open(args.out, "w", encoding="utf-8", newline="\r\n") as f:  # Zdroje v repu mají CRLF
+        f.write(code)
+    print(f"{args.out.name}: {len(sprites)} spritů, atlas {size} B")
+
+
+if __name__ == "__main__":
+    main()
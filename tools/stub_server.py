@@ -0,0 +1,267 @@
+"""
+Lokální náhrada herního serveru pro vývoj a testy (CPython).
+
+Spuštění: python tools/stub_server.py --port 8080
+a v main.py nastavit server_url = "http://<ip počítače>:8080".
+
+Implementuje endpointy, které používá zařízení, včetně long-pollu
+/api/game/wait. Po odeslání výsledku (/api/game/update) se za
+--round-delay sekund spustí nové kolo, po --rounds kolech hra skončí.
+Dávky z fronty zařízení přijímá /api/uploads. Klientovi, který v Accept
+uvede application/x-tones+json, posílá sekvenci zabalenou v poli "tones"
+(formát tone_wire.py), --json-only to vypne.
+"""
+import argparse
+import base64
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TONES = [262, 294, 330, 349, 392, 440, 494]
+TONES_TYPE = "application/x-tones+json"
+MAX_TONES = 64  # Víc zařízení nepřijme (tone_wire.MAX_TONES)
+
+
+def pack_tones(sequence):
+    """Frekvence -> pole "tones": base64 z [verze 1][počet][indexy po 3 bitech]."""
+    data = bytearray([1, len(sequence)])
+    acc = bits = 0
+    for frequency in sequence:
+        acc |= TONES.index(frequency) << bits
+        bits += 3
+        if bits >= 8:
+            data.append(acc & 0xff)
+            acc >>= 8
+            bits -= 8
+    if bits:
+        data.append(acc)
+    return base64.b64encode(data).decode()
+
+
+def unpack_tones(text):
+    """Pole "tones" -> seznam frekvencí, chybný formát vyhodí ValueError."""
+    data = base64.b64decode(text)
+    if len(data) < 2 or data[0] != 1:
+        raise ValueError("tones: version")
+    value = int.from_bytes(data[2:], "little")
+    indices = [(value >> (3 * i)) & 7 for i in range(data[1])]
+    if len(data) < 2 + (data[1] * 3 + 7) // 8 or 7 in indices:
+        raise ValueError("tones: length")
+    return [TONES[i] for i in indices]
+
+
+class GameState:
+    """Stav všech her a žebříčku, sdílený vlákny serveru."""
+
+    def __init__(self, games=3, rounds=3, round_delay=2.0, packed=True):
+        self.rounds = rounds
+        self.round_delay = round_delay
+        self.packed = packed  # Umí zabalené sekvence (TONES_TYPE)
+        self.changed = threading.Condition()
+        self.list_version = 1
+        self.scores_version = 1
+        self.high_scores = [{"name": f"Player{i}", "points": 100 - i * 10} for i in range(10)]
+        self.games = {}
+        for i in range(games):
+            game_id = f"game{i + 1}"
+            self.games[game_id] = {
+                "_id": game_id,
+                "nickname": f"Host{i + 1}",
+                "sequence": [random.choice(TONES) for _ in range(3)],
+                "completed": False,
+                "gameState": "in-progress",
+                "round": 1,
+                "version": 1,
+            }
+
+    def etag(self, game):
+        return f'"{game["_id"]}-{game["version"]}"'
+
+    def bump(self, game):
+        # Volá se se zamčeným self.changed
+        game["version"] += 1
+        self.changed.notify_all()
+
+    def submit(self, game_id, esp_data):
+        with self.changed:
+            game = self.games[game_id]
+            game["completed"] = True
+            game["lastResult"] = esp_data
+            self.bump(game)
+        self.later(self.round_delay, self.next_round, game_id)
+
+    def later(self, delay, function, *args):
+        """Zavolá function(*args) za delay sekund."""
+        threading.Timer(delay, function, args).start()
+
+    def add_score(self, points, name="Device"):
+        with self.changed:
+            self.high_scores.append({"name": name, "points": points})
+            self.high_scores.sort(key=lambda s: -s["points"])
+            self.scores_version += 1
+
+    def next_round(self, game_id):
+        with self.changed:
+            game = self.games[game_id]
+            if game["round"] >= self.rounds:
+                game["gameState"] = "game_over"
+                self.list_version += 1
+            else:
+                game["round"] += 1
+                game["sequence"].append(random.choice(TONES))
+                game["completed"] = False
+            self.bump(game)
+
+    def wait(self, game_id, etag, timeout):
+        """Počká, dokud se ETag hry neliší od etag, nejdéle timeout sekund."""
+        with self.changed:
+            game = self.games[game_id]
+            self.changed.wait_for(lambda: self.etag(game) != etag, timeout)
+            return self.etag(game) != etag
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive jako u skutečného serveru
+    state = None
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, data, etag=None, headers=None, content_type="application/json"):
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_status(self, code):
+        self.send_response(code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def game(self, query):
+        game_id = query.get("id", [""])[0]
+        return self.state.games.get(game_id)
+
+    def send_game(self, game):
+        # Stejný ETag pro obě podoby, klient se mezi nimi nepřepíná
+        etag = self.state.etag(game)
+        # Sekvenci s tónem mimo TONES nebo příliš dlouhou formát neumí,
+        # pošle se jako JSON
+        sequence = game["sequence"]
+        packable = len(sequence) <= MAX_TONES and all(f in TONES for f in sequence)
+        if self.state.packed and packable and TONES_TYPE in self.headers.get("Accept", ""):
+            document = dict(game)
+            document["tones"] = pack_tones(document.pop("sequence"))
+            self.send_json(document, etag, {"Vary": "Accept"}, TONES_TYPE)
+        else:
+            self.send_json(game, etag, {"Vary": "Accept"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        state = self.state
+        if url.path == "/api/highscores":
+            self.send_json(state.high_scores, f'"scores-{state.scores_version}"')
+        elif url.path == "/api/games/in-progress":
+            games = [{"_id": g["_id"], "nickname": g["nickname"]}
+                     for g in state.games.values() if g["gameState"] != "game_over"]
+            # Stránkování offset/limit, bez nich celý seznam
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(len(games))])[0])
+            self.send_json(games[offset:offset + limit], f'"list-{state.list_version}-{offset}-{limit}"',
+                           {"X-Total-Count": str(len(games))})
+        elif url.path == "/api/game":
+            game = self.game(query)
+            if game is None:
+                return self.send_status(404)
+            self.send_game(game)
+        elif url.path == "/api/game/wait":
+            game = self.game(query)
+            if game is None:
+                return self.send_status(404)
+            timeout = float(query.get("timeout", ["25"])[0])
+            state.wait(game["_id"], self.headers.get("If-None-Match"), timeout)
+            self.send_game(game)
+        elif url.path == "/api/game/status":
+            game = self.game(query)
+            if game is None:
+                return self.send_status(404)
+            finished = game["gameState"] == "game_over"
+            self.send_json({"status": "finished" if finished else "in-progress"})
+        else:
+            self.send_status(404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        data = json.loads(self.rfile.read(length) or b"{}")
+        if url.path == "/api/game/update":
+            if data.get("id") not in self.state.games:
+                return self.send_status(404)
+            esp_data = data.get("espData")
+            if self.state.packed and "tones" in data:
+                try:
+                    esp_data = unpack_tones(data["tones"])
+                except ValueError:
+                    return self.send_status(400)
+            self.state.submit(data["id"], esp_data)
+            # ETag nové verze, klient pak na vlastní změnu nečeká long-pollem
+            self.send_json({"ok": True}, self.state.etag(self.state.games[data["id"]]))
+        elif url.path == "/api/highscores":
+            self.state.add_score(data.get("points", 0), data.get("name", "Device"))
+            self.send_json({"ok": True})
+        elif url.path == "/api/uploads":
+            # Dávka záznamů z fronty zařízení, přijme se celá
+            items = data.get("items", [])
+            for item in items:
+                if item.get("type") == "result" and item.get("id") in self.state.games:
+                    self.state.submit(item["id"], item.get("espData"))
+                elif item.get("type") == "score":
+                    self.state.add_score(item.get("points", 0), item.get("name", "Device"))
+            self.send_json({"accepted": len(items)})
+        else:
+            self.send_status(404)
+
+
+def make_server(port=8080, host="0.0.0.0", verbose=False, **kwargs):
+    """Vytvoří server s čerstvým stavem, port 0 = libovolný volný."""
+    handler = type("StubHandler", (Handler,), {"state": GameState(**kwargs)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--games", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--round-delay", type=float, default=2.0)
+    parser.add_argument("--json-only", action="store_true", help="sekvence jen jako JSON seznam frekvencí")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    server = make_server(args.port, args.host, args.verbose, games=args.games,
+                         rounds=args.rounds, round_delay=args.round_delay, packed=not args.json_only)
+    print(f"Stub server běží na http://{args.host}:{server.server_port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import uasyncio as asyncio
+from micropython import const
+import json
+import os
+import time
+from http_client import HttpError
+
+_MAX_BYTES = const(4096)  # Největší velikost souboru fronty
+_BATCH = const(8)  # Kolik záznamů se pošle jedním požadavkem
+_RETRY_MS = const(2000)  # První pauza po neúspěšném odeslání
+_MAX_RETRY_MS = const(60000)
+
+# Druhy záznamů
+RESULT = "R"  # Výsledek kola online hry: [id hry, frekvence]
+SCORE = "S"  # Skóre offline hry: [body]
+_ACK = "A"  # Záznam s daným pořadovým číslem byl doručen
+
+class UploadQueue:
+    """
+    Trvalá fronta odesílaných dat v souboru na flash. Soubor se jen
+    připisuje, každý řádek je jeden záznam: druh, pořadové číslo a JSON
+    data (např. R12 ["game1",[262,294]]), doručení zapisuje řádek A12.
+    Po restartu se soubor přehraje a nedoručené záznamy se odešlou.
+    Na pozadí se posílají po dávkách, jedna dávka = jeden POST
+    /api/uploads. Když server dávky nezná (404), posílá se po jednom na
+    původní endpointy. Soubor se občas přepíše jen s nedoručenými
+    záznamy, při překročení max_bytes se zahodí nejstarší. Záznam, který
+    server odmítne (4xx), se přesune do souboru rejected_path a dál se
+    neposílá.
+    """
+
+    def __init__(self, client, path="uploads.log", max_bytes=_MAX_BYTES, player="ESP32",
+                 rejected_path="uploads.rejected"):
+        self.client = client
+        self.path = path
+        self.rejected_path = rejected_path
+        self.player = player  # Jméno hráče u odesílaného skóre
+        self.max_bytes = max_bytes
+        self.records = {}  # Pořadové číslo -> [druh, data], jen nedoručené
+        self.held = set()  # Záznamy, které právě posílá někdo jiný
+        self.next_seq = 1
+        self.size = 0  # Velikost souboru v bajtech
+        self.batch_api = True
+        self.added = asyncio.Event()
+
+        # Statistiky
+        self.sent = 0  # Doručené záznamy
+        self.sent_bytes = 0  # Bajty těl požadavků
+        self.sent_ms = 0  # Čas strávený odesíláním
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0  # Zahozené kvůli velikosti
+        self.rejected = 0  # Odmítnuté serverem, přesunuté do rejected_path
+
+        self.load()
+
+    def load(self):
+        """Přehraje soubor fronty, poškozený konec (výpadek při zápisu) se zahodí."""
+        torn = False
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    self.size += len(line)
+                    if not line.endswith("\n"):
+                        torn = True
+                        break
+                    try:
+                        self.replay(line)
+                    except ValueError:
+                        pass
+        except OSError:
+            return
+        if torn:
+            self.compact()  # Další záznam by se jinak připojil k useknutému
+        if self.records:
+            print("Ve frontě k odeslání:", len(self.records))
+
+    def replay(self, line):
+        kind = line[0]
+        if kind == _ACK:
+            seq = int(line[1:])
+            self.records.pop(seq, None)
+        else:
+            space = line.index(" ")
+            seq = int(line[1:space])
+            self.records[seq] = [kind, json.loads(line[space + 1:])]
+        if seq >= self.next_seq:
+            self.next_seq = seq + 1
+
+    def write(self, text, mode="a"):
+        with open(self.path, mode) as f:
+            f.write(text)
+
+    def append(self, kind, data, hold=False):
+        """
+        Zapíše záznam do fronty a vrátí jeho pořadové číslo. S hold=True
+        ho fronta neposílá, dokud ho volající nepotvrdí (ack) nebo neuvolní
+        (release), typicky když se ho sám pokouší odeslat hned.
+        """
+        seq = self.next_seq
+        self.next_seq += 1
+        line = f"{kind}{seq} {json.dumps(data)}\n"
+        if self.size + len(line) > self.max_bytes:
+            self.compact(len(line))
+        self.write(line)
+        self.size += len(line)
+        self.records[seq] = [kind, data]
+        if hold:
+            self.held.add(seq)
+        else:
+            self.added.set()
+        return seq
+
+    def ack(self, seqs):
+        """Označí záznamy jako doručené."""
+        if isinstance(seqs, int):
+            seqs = (seqs,)
+        text = ""
+        for seq in seqs:
+            self.held.discard(seq)
+            if self.records.pop(seq, None) is not None:
+                text += f"{_ACK}{seq}\n"
+        if text:
+            self.write(text)
+            self.size += len(text)
+        if not self.records and self.size > self.max_bytes // 2:
+            self.compact()
+
+    def release(self, seq):
+        """Vrátí držený záznam frontě, pošle se na pozadí."""
+        self.held.discard(seq)
+        self.added.set()
+
+    def compact(self, reserve=0):
+        """
+        Přepíše soubor jen s nedoručenými záznamy. Pokud se ani tak
+        nevejdou s rezervou reserve bajtů, zahodí nejstarší.
+        """
+        lines = []
+        size = reserve
+        for seq in sorted(self.records):
+            kind, data = self.records[seq]
+            line = f"{kind}{seq} {json.dumps(data)}\n"
+            lines.append((seq, line))
+            size += len(line)
+        while lines and size > self.max_bytes:
+            seq, line = lines.pop(0)
+            size -= len(line)
+            del self.records[seq]
+            self.held.discard(seq)
+            self.dropped += 1
+        # Přepsání přes dočasný soubor, aby výpadek nezničil frontu
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            for seq, line in lines:
+                f.write(line)
+        os.rename(tmp, self.path)
+        self.size = size - reserve
+
+    def pending(self):
+        """Nedoručené záznamy, které fronta smí poslat, od nejstaršího."""
+        return [seq for seq in sorted(self.records) if seq not in self.held]
+
+    def item(self, seq):
+        kind, data = self.records[seq]
+        if kind == RESULT:
+            return {"type": "result", "id": data[0], "espData": data[1]}
+        return {"type": "score", "name": self.player, "points": data[0]}
+
+    async def flush(self):
+        """Pošle jednu dávku nedoručených záznamů a vrátí jejich počet."""
+        batch = self.pending()[:_BATCH]
+        if not batch:
+            return 0
+        start = time.ticks_ms()
+        if self.batch_api:
+            body = {"items": [self.item(seq) for seq in batch]}
+            response = await self.client.post("/api/uploads", json=body)
+            response.close()
+            single = False
+            if response.status_code == 404:
+                print("Server nezná dávky, posílám po jednom")
+                self.batch_api = False
+            elif 400 <= response.status_code < 500:
+                # Dávku server odmítl, po jednom se najde záznam, který vadí
+                single = True
+            elif response.status_code != 200:
+                raise HttpError(response.status_code)
+            else:
+                self.sent_bytes += len(json.dumps(body))
+                self.batches += 1
+        if not self.batch_api or single:
+            batch = batch[:1]
+            try:
+                await self.post_one(batch[0])
+            except HttpError as e:
+                if e.status_code >= 500:
+                    raise
+                self.reject(batch[0], e.status_code)
+                return 1
+        self.sent_ms += time.ticks_diff(time.ticks_ms(), start)
+        self.sent += len(batch)
+        self.ack(batch)
+        return len(batch)
+
+    async def post_one(self, seq):
+        kind, data = self.records[seq]
+        if kind == RESULT:
+            path, body = "/api/game/update", {"id": data[0], "espData": data[1]}
+        else:
+            path, body = "/api/highscores", {"name": self.player, "points": data[0]}
+        response = await self.client.post(path, json=body)
+        response.close()
+        if response.status_code != 200:
+            raise HttpError(response.status_code)
+        self.sent_bytes += len(json.dumps(body))
+        self.batches += 1
+
+    def reject(self, seq, status_code):
+        """
+        Server záznam odmítl a opakování nepomůže: zapíše ho se stavem
+        odpovědi do rejected_path, aby se neztratil, a z fronty ho odebere.
+        """
+        kind, data = self.records[seq]
+        print("Server odmítl záznam", seq, "stav", status_code)
+        with open(self.rejected_path, "a") as f:
+            f.write(f"{kind}{seq} {status_code} {json.dumps(data)}\n")
+        self.rejected += 1
+        self.ack(seq)
+
+    async def run(self):
+        """Úloha na pozadí: posílá frontu, po chybě čeká čím dál déle."""
+        delay = _RETRY_MS
+        while True:
+            if not self.pending():
+                self.added.clear()
+                await self.added.wait()
+                continue
+            try:
+                await self.flush()
+                delay = _RETRY_MS
+            except Exception as e:
+                print("Odeslání fronty selhalo:", e)
+                self.failures += 1
+                await asyncio.sleep_ms(delay)
+                delay = min(delay * 2, _MAX_RETRY_MS)
+
+    def stats(self):
+        """Počítadla odesílání, throughput v bajtech a záznamech za sekundu."""
+        seconds = self.sent_ms / 1000 or 1
+        return {
+            "pending": len(self.records),
+            "sent": self.sent,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "bytes": self.sent_bytes,
+            "bytes_per_s": self.sent_bytes / seconds,
+            "records_per_s": self.sent / seconds,
+            "file_bytes": self.size,
+        }
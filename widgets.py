@@ -0,0 +1,229 @@
+from micropython import const
+import sprites
+
+_ROW_HEIGHT = const(10)  # Výška řádku textu včetně mezery
+_CHAR_WIDTH = const(8)
+
+class Widget:
+    """
+    Základ widgetů: obdélník na displeji, který si pamatuje, co naposledy
+    nakreslil, a kreslí jen změny. Když někdo vymaže celý displej
+    (OledDisplay.clear_screen), zapomene to a příště nakreslí vše.
+    """
+
+    def __init__(self, display, x, y, width, height):
+        self.display = display
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.clears = display.clears
+
+    def check(self):
+        """Zapomene nakreslený obsah, pokud byl displej mezitím vymazán."""
+        if self.clears != self.display.clears:
+            self.clears = self.display.clears
+            self.invalidate()
+
+    def invalidate(self):
+        """Příští nastavení nakreslí widget celý, např. po cizím kreslení přes něj."""
+
+
+class Label(Widget):
+    """Jeden řádek textu."""
+
+    def __init__(self, display, x=0, y=0, width=None):
+        super().__init__(display, x, y, width or 128 - x, _ROW_HEIGHT)
+        self.value = None
+
+    def invalidate(self):
+        self.value = None
+
+    def set(self, text):
+        self.check()
+        if text == self.value:
+            return
+        with self.display.frame():
+            self.display.clear_area(self.x, self.y, self.width, self.height)
+            self.display.text(text, self.x, self.y)
+        self.value = text
+
+
+class ListView(Widget):
+    """
+    Řádky textu pod sebou s volitelně vybranou a nedostupnými položkami.
+    Překreslí jen řádky, jejichž text nebo stav se změnil.
+    """
+
+    def __init__(self, display, y=0, rows=6, x=0, width=None):
+        super().__init__(display, x, y, width or 128 - x, rows * _ROW_HEIGHT)
+        self.rows = rows
+        self.drawn = [None] * rows  # Stav nakreslený v řádku, None = neznámý
+
+    def invalidate(self):
+        self.drawn = [None] * self.rows
+
+    def set(self, items, selected=None, disabled=()):
+        """Zobrazí items (nejvýše rows položek), selected je index vybrané."""
+        self.check()
+        changed = []
+        for row in range(self.rows):
+            if row < len(items):
+                state = (items[row], row == selected, items[row] in disabled)
+            else:
+                state = ()  # Prázdný řádek
+            if state != self.drawn[row]:
+                changed.append(row)
+                self.drawn[row] = state
+        if not changed:
+            return  # Beze změny se nic nekreslí ani neposílá
+        with self.display.frame():
+            for row in changed:
+                y = self.y + row * _ROW_HEIGHT
+                self.display.clear_area(self.x, y, self.width, _ROW_HEIGHT)
+                if self.drawn[row]:
+                    self.draw_row(y, *self.drawn[row])
+
+    def draw_row(self, y, text, selected, disabled):
+        self.display.text(text, self.x, y)
+
+
+class Menu(ListView):
+    """Menu: vybraná položka má značku >, nedostupné jsou přeškrtnuté."""
+
+    def draw_row(self, y, text, selected, disabled):
+        if selected:
+            self.display.sprite(sprites.ARROW_RIGHT, self.x, y)
+            x = self.x + 2 * _CHAR_WIDTH
+        else:
+            x = self.x + 10
+        self.display.text(text, x, y)
+        if disabled:
+            self.display.hline(x, y + 3, len(text) * _CHAR_WIDTH)
+
+
+class Header(Widget):
+    """Hlavička hry: srdíčka životů vlevo, skóre vpravo."""
+
+    def __init__(self, display):
+        super().__init__(display, 0, 0, 128, _ROW_HEIGHT)
+        self.lives = None
+        self.score = Label(display, 64, 0)
+
+    def invalidate(self):
+        self.lives = None
+        self.score.invalidate()
+
+    def set(self, lives, score):
+        self.check()
+        self.score.check()
+        text = f"Score: {score}"
+        if lives == self.lives and text == self.score.value:
+            return
+        with self.display.frame():
+            if lives != self.lives:
+                self.display.clear_area(0, 0, 64, _ROW_HEIGHT)
+                for i in range(lives):
+                    self.display.draw_heart(2 + (i * 8), 2)  # Posun mezi srdíčky
+                self.lives = lives
+            self.score.set(text)
+
+
+class ScrollList(Widget):
+    """
+    Seznam přes celou obrazovku, delší než displej, volitelně s vybranou
+    položkou (select) nebo jen k prohlížení (move). Posouvá se
+    hardwarově (SH1106.set_start_line): posun o řádek je jeden příkaz
+    a nakreslí se jen nově odkrytý řádek, celý buffer se neposílá.
+    Řádek má výšku jedné stránky (8 px). Posun točí celý displej, proto
+    seznam zabírá celou obrazovku; clear_screen() posun zruší. Na displeji
+    otočeném o 90° se místo posunu překreslí všechny řádky.
+    """
+
+    def __init__(self, display):
+        super().__init__(display, 0, 0, 128, 64)
+        self.rows = 64 // 8
+        self.hardware = not display.oled.rotate90
+        self.items = ()
+        self.selected = None
+        self.top = 0  # Index položky v horním řádku
+
+    def line(self, row):
+        """Řádek bufferu, ve kterém se zobrazuje řádek obrazovky row."""
+        oled = self.display.oled
+        return (oled.start_line + row * 8) % oled.height if self.hardware else row * 8
+
+    def set(self, items, selected=None, top=0):
+        """
+        Zobrazí items (posloupnost textů) od položky top, případně
+        s vybranou položkou selected.
+        """
+        self.items = items
+        self.selected = selected
+        if selected is not None:
+            top = selected
+        self.top = max(0, min(top, len(items) - self.rows))
+        with self.display.frame():
+            self.display.clear_screen()
+            self.clears = self.display.clears
+            for row in range(self.rows):
+                self.draw(self.top + row)
+
+    def draw(self, index):
+        """Překreslí položku index, pokud je vidět."""
+        row = index - self.top
+        if not 0 <= row < self.rows:
+            return
+        y = self.line(row)
+        self.display.clear_area(0, y, 128, 8)
+        if index < len(self.items):
+            if index == self.selected:
+                self.display.sprite(sprites.ARROW_RIGHT, 0, y)
+            self.display.text(self.items[index], 10, y)
+
+    def select(self, index):
+        """Vybere položku index a podle potřeby posune seznam."""
+        index = max(0, min(index, len(self.items) - 1))
+        if index == self.selected:
+            return
+        self.check()
+        old, self.selected = self.selected, index
+        with self.display.frame():
+            if index < self.top:
+                self.scroll(index - self.top)
+            elif index >= self.top + self.rows:
+                self.scroll(index - self.top - self.rows + 1)
+            if old is not None:
+                self.draw(old)
+            self.draw(index)
+
+    def move(self, rows):
+        """Posune seznam o rows řádků (záporné nahoru), bez změny výběru."""
+        rows = max(-self.top, min(rows, len(self.items) - self.rows - self.top))
+        if rows:
+            self.check()
+            with self.display.frame():
+                self.scroll(rows)
+
+    def scroll(self, rows):
+        """Posune seznam o rows řádků a nakreslí jen nově odkryté."""
+        self.top += rows
+        if not self.hardware or abs(rows) >= self.rows:
+            for row in range(self.rows):
+                self.draw(self.top + row)
+            return
+        oled = self.display.oled
+        oled.set_start_line(oled.start_line + rows * 8)
+        revealed = range(self.rows - rows, self.rows) if rows > 0 else range(-rows)
+        for row in revealed:
+            self.draw(self.top + row)
+
+    def refresh(self):
+        """Překreslí viditelné řádky, např. když se změnila data položek."""
+        self.check()
+        with self.display.frame():
+            for row in range(self.rows):
+                self.draw(self.top + row)
+
+    def invalidate(self):
+        self.set(self.items, self.selected, self.top)
@@ -0,0 +1,168 @@
+import uasyncio as asyncio
+from micropython import const
+import json
+import os
+import time
+import network
+
+# Stavy spojení
+DISCONNECTED = const(0)
+CONNECTING = const(1)
+CONNECTED = const(2)
+
+_FAST_TIMEOUT_MS = const(4000)  # Limit připojení přes uložený BSSID
+_TIMEOUT_MS = const(15000)  # Limit běžného připojení
+_CHECK_MS = const(1000)  # Jak často se kontroluje připojené spojení
+_POLL_MS = const(100)  # Jak často se kontroluje probíhající připojení
+_BACKOFF_MS = const(1000)  # První pauza po neúspěchu, pak dvojnásobná
+_MAX_BACKOFF_MS = const(30000)
+
+class WifiManager:
+    """
+    Správce Wi-Fi běžící jako úloha na pozadí, menu se tak zobrazí hned.
+    Po úspěšném připojení uloží BSSID a kanál přístupového bodu do
+    souboru, při dalším startu se připojí přímo k němu bez hledání.
+    Volitelná statická IP (ip, maska, brána, DNS) přeskočí DHCP. Při
+    výpadku se znovu připojuje s rostoucí pauzou. Modul network jde
+    nahradit (parametr net), např. náhradou pro testy na počítači.
+    """
+
+    def __init__(self, ssid, password, static_ip=None, path="wifi.json", net=network):
+        self.ssid = ssid
+        self.password = password
+        self.static_ip = static_ip
+        self.path = path
+        self.wlan = net.WLAN(net.STA_IF)
+        self.state = DISCONNECTED
+        self.cached = self.load()  # {"bssid": hex, "channel": n} nebo None
+
+        # Statistiky
+        self.connects = 0
+        self.fast_connects = 0  # Připojení přes uložený BSSID
+        self.failures = 0
+        self.drops = 0
+        self.connect_ms = None  # Doba posledního připojení
+
+    def is_connected(self):
+        return self.state == CONNECTED
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, bssid, channel):
+        self.cached = {"bssid": bssid.hex(), "channel": channel}
+        try:
+            with open(self.path, "w") as f:
+                json.dump(self.cached, f)
+        except OSError as e:
+            print("Údaje Wi-Fi nelze uložit:", e)
+
+    def forget(self):
+        """Zahodí uložený přístupový bod, příště se bude hledat znovu."""
+        self.cached = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def find_ap(self):
+        """Najde nejsilnější přístupový bod sítě, vrátí (bssid, kanál) nebo None."""
+        best = None
+        for ap in self.wlan.scan():
+            ssid, bssid, channel, rssi = ap[:4]
+            if ssid.decode() == self.ssid and (best is None or rssi > best[2]):
+                best = (bssid, channel, rssi)
+        return best and best[:2]
+
+    async def connect(self, bssid=None, channel=None, timeout_ms=_TIMEOUT_MS):
+        """Jeden pokus o připojení, vrátí True při úspěchu."""
+        wlan = self.wlan
+        wlan.active(True)
+        if self.static_ip:
+            wlan.ifconfig(self.static_ip)
+        if channel:
+            try:
+                wlan.config(channel=channel)
+            except (OSError, ValueError):
+                pass  # Port neumí kanál nastavit, najde ho sám
+        try:
+            if bssid:
+                wlan.connect(self.ssid, self.password, bssid=bssid)
+            else:
+                wlan.connect(self.ssid, self.password)
+        except OSError as e:
+            print("Wi-Fi připojení selhalo:", e)
+            return False
+
+        start = time.ticks_ms()
+        while not wlan.isconnected():
+            if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+                wlan.disconnect()
+                return False
+            await asyncio.sleep_ms(_POLL_MS)
+        return True
+
+    async def establish(self):
+        """Připojí se, nejdřív rychle přes uložený BSSID, jinak s hledáním sítě."""
+        start = time.ticks_ms()
+        self.state = CONNECTING
+        cached = self.cached
+        if cached:
+            if await self.connect(bytes.fromhex(cached["bssid"]), cached["channel"], _FAST_TIMEOUT_MS):
+                self.fast_connects += 1
+                return self.connected(start)
+            print("Uložený přístupový bod nefunguje, hledám síť")
+            self.forget()
+
+        ap = None
+        try:
+            # Hledání blokuje asi 2 s, ale jen když uložený bod chybí
+            self.wlan.active(True)
+            ap = self.find_ap()
+        except OSError as e:
+            print("Hledání sítě selhalo:", e)
+        if await self.connect(*(ap or ())):
+            if ap:
+                self.save(*ap)
+            return self.connected(start)
+        self.failures += 1
+        self.state = DISCONNECTED
+        return False
+
+    def connected(self, start):
+        self.connects += 1
+        self.connect_ms = time.ticks_diff(time.ticks_ms(), start)
+        print("Připojeno za", self.connect_ms, "ms, IP:", self.wlan.ifconfig()[0])
+        self.state = CONNECTED
+        return True
+
+    async def run(self):
+        """Úloha na pozadí: udržuje spojení, po výpadku se připojí znovu."""
+        backoff = _BACKOFF_MS
+        while True:
+            if self.state == CONNECTED:
+                if not self.wlan.isconnected():
+                    print("Wi-Fi spojení ztraceno")
+                    self.drops += 1
+                    self.state = DISCONNECTED
+                    continue
+                await asyncio.sleep_ms(_CHECK_MS)
+            elif await self.establish():
+                backoff = _BACKOFF_MS
+            else:
+                await asyncio.sleep_ms(backoff)
+                backoff = min(backoff * 2, _MAX_BACKOFF_MS)
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "connects": self.connects,
+            "fast_connects": self.fast_connects,
+            "failures": self.failures,
+            "drops": self.drops,
+            "connect_ms": self.connect_ms,
+        }